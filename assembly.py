@@ -2,7 +2,8 @@ import os
 import sys
 from dotenv import load_dotenv
 from elevenlabs.client import ElevenLabs
-from elevenlabs import play, VoiceSettings
+from elevenlabs import play
+from voice.tts_cache import CachedSynthesizer, elevenlabs_convert, COMMON_PHRASES
 
 # Load environment variables from .env file
 load_dotenv()
@@ -44,18 +45,18 @@ def eleven_labs_text_to_speech(text_to_convert, voice_id=DEFAULT_VOICE_ID, model
     print(f"[ElevenLabs TTS]: Text: \"{text_to_convert}\"")
 
     try:
-        audio = elevenlabs_client.text_to_speech.convert(
-            text=text_to_convert,
-            voice_id=voice_id,
+        # Repeated phrases come straight from the local TTS cache, with no API call
+        synthesizer = CachedSynthesizer(
+            elevenlabs_convert(elevenlabs_client),
+            voice_id,
             model_id=model_id,
-            voice_settings=VoiceSettings(
-                stability=stability,
-                similarity_boost=similarity_boost,
-                style=0.0,
-                use_speaker_boost=True
-            ),
+            stability=stability,
+            similarity_boost=similarity_boost,
             output_format="mp3_44100_128" # High quality MP3 format
         )
+        if synthesizer.key(text_to_convert) in synthesizer.cache:
+            print("[ElevenLabs TTS]: Using cached audio.")
+        audio = b"".join(synthesizer(text_to_convert))
 
         print("[ElevenLabs TTS]: Playing audio...")
         play(audio) # Requires FFmpeg's ffplay in your system PATH
@@ -75,8 +76,25 @@ def eleven_labs_text_to_speech(text_to_convert, voice_id=DEFAULT_VOICE_ID, model
             print("Ensure your internet connection is stable and the ElevenLabs service is available.")
 
 
+def prewarm_tts_cache(phrase_file=None, voice_id=DEFAULT_VOICE_ID):
+    """Synthesizes the phrases in phrase_file (one per line, default: COMMON_PHRASES) into the TTS cache."""
+    phrases = COMMON_PHRASES
+    if phrase_file:
+        with open(phrase_file, encoding="utf-8") as f:
+            phrases = [line.strip() for line in f if line.strip()]
+    synthesizer = CachedSynthesizer(elevenlabs_convert(elevenlabs_client), voice_id)
+    synthesized = synthesizer.prewarm(phrases)
+    print(f"[TTS Cache]: {synthesized} spoken chunk(s) of {len(phrases)} phrase(s) synthesized, "
+          "the rest were already cached.")
+
+
 # --- Main Execution ---
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--prewarm":
+        # python assembly.py --prewarm [phrases.txt]
+        prewarm_tts_cache(sys.argv[2] if len(sys.argv) > 2 else None)
+        sys.exit(0)
+
     print("--- Eleven Labs Text-to-Audio Converter ---")
     print("Type your text to convert to audio. Type 'quit' or 'exit' to stop.")
 
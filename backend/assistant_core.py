@@ -1,55 +1,39 @@
 # backend/assistant_core.py
-import json
-import os
-from google import genai
+import time
 from google.genai import types
-from google.generativeai.types import Tool, FunctionDeclaration
 
 # Assuming these imports are correct and available in your environment
-from core.function_router import route_function_call
-from commands.folder.create import create_folder_schema_dict
-from commands.folder.delete import delete_folders_schema_dict
-from commands.folder.move import move_folders_schema_dict
-from commands.folder.rename import rename_folders_schema_dict
-from commands.files.create_python_file import create_python_file_schema_dict
-from commands.website.create_website import create_website_schema_dict
-from commands.website.open_website import open_website_schema_dict
-from commands.webautomation.youtube_Automation import open_youtube_trending_schema_dict
-from commands.webautomation.web_scrapper import scrape_website_content_schema_dict
-from commands.webautomation.gehu_Automation import open_gehu_btech_notice_and_return_content_schema_dict
+from core.function_router import route_function_call, route_function_calls
+from core.speculation import Speculator
+from core.confirmation import split_function_results, render_confirmation
+from commands.command_registry import function_declarations
+from backend.history import function_response_part, function_response_parts, compact_history, COMPACT_PAYLOAD_CHARS
+from backend.memory import get_memory_manager
+from backend.model_provider import get_model_provider, MODEL_NAME
 
 
 class GeminiAssistant:
-    def __init__(self):
-        # Ensure GEMINI_API_KEY is loaded from environment variables
-        # It's good practice to load dotenv at the application's entry point,
-        # but if this class is directly instantiated, you might need it here too.
-        # from dotenv import load_dotenv
-        # load_dotenv()
+    def __init__(self, provider=None):
+        # The Gemini API (GEMINI_API_KEY) unless ALPHA_MODEL_PROVIDER picks another
+        # backend; see backend.model_provider. Shared with the commands that call the model.
+        self.provider = provider or get_model_provider()
+        self.model = self.provider.model
 
-        self.client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-
-        # Initialize the chat session. This will store the conversation history.
-        # It's generally better to use a model that supports multi-turn conversations directly.
-        # For non-streaming, `generate_content` is also an option if you manage history manually.
-        # However, `client.chats.create` and `chat.send_message` are designed for turn-based conversations.
-        self.chat = self.client.chats.create(model="gemini-2.0-flash")
+        # The assistant keeps the conversation itself (instead of client.chats) so tool
+        # results can be stored as function_response parts and compacted once consumed.
+        self.history = []
+        self.compact_threshold = COMPACT_PAYLOAD_CHARS  # float("inf") keeps every payload
+        self.turn_metrics = []  # one dict per send_prompt call: model calls, token counts and latency
+        # Keeps the re-sent history within a token budget (summary + pinned facts + recent turns)
+        self.memory = get_memory_manager(self.provider)
 
         self.route_function_call = route_function_call
+        self.route_function_calls = route_function_calls
+        # Warms browsers/connections as soon as a prompt or streamed function_call hints at them
+        self.speculator = Speculator()
 
         # Define tools for function calling
-        tools = [types.Tool(function_declarations=
-                            [create_folder_schema_dict,
-                             delete_folders_schema_dict,
-                             move_folders_schema_dict,
-                             rename_folders_schema_dict,
-                             create_python_file_schema_dict,
-                             create_website_schema_dict,
-                             open_website_schema_dict,
-                             open_youtube_trending_schema_dict,
-                             scrape_website_content_schema_dict,
-                             open_gehu_btech_notice_and_return_content_schema_dict, ]
-                            )]
+        tools = [types.Tool(function_declarations=function_declarations)]
         self.config = {
             "tools": tools,
             # If you want to force the model to explicitly call functions,
@@ -57,6 +41,12 @@ class GeminiAssistant:
             # If you want the model to call functions automatically, remove this line or set to {"disable": False}.
             "automatic_function_calling": {"disable": True}
         }
+        # Used when the model only has to summarize tool results: tools stay declared (the
+        # history contains function calls) but the model may not call another one.
+        self.summary_config = {
+            **self.config,
+            "tool_config": {"function_calling_config": {"mode": "NONE"}},
+        }
 
     def handle_website_creation_follow_up(self, created_website_path: str) -> types.Part:
         # This function seems to involve user input, which is blocking for a GUI application.
@@ -72,50 +62,197 @@ class GeminiAssistant:
                 args={'index_html_path': created_website_path}
             )
             function_result = self.route_function_call(open_website_call_object)
-            return types.Part.from_function_result(
-                name='open_website',
-                response=json.dumps(function_result)
-            )
+            return function_response_part('open_website', function_result)
         else:
             return None
 
-    def send_prompt(self, prompt: str):
+    # --- History ---
+    def _add_user_parts(self, parts: list):
+        # Function responses that were confirmed locally are still waiting in a user turn;
+        # the next prompt joins that turn so roles keep alternating.
+        if self.history and self.history[-1].role == "user":
+            self.history[-1].parts.extend(parts)
+        else:
+            self.history.append(types.Content(role="user", parts=list(parts)))
+
+    # --- Model calls (shared with backend.async_assistant) ---
+    def _begin_model_call(self, metrics: dict) -> dict:
+        metrics["model_calls"] += 1
+        metrics["estimated_prompt_tokens"] += self.memory.tokens(self.history)
+        return {"text": "", "call_parts": [], "usage": None}
+
+    def _read_chunk(self, chunk, state: dict, tool_calls: list, metrics: dict) -> list:
+        """Returns the text in one streamed chunk; function_call parts go to tool_calls."""
+        texts = []
+        if getattr(chunk, "usage_metadata", None):
+            state["usage"] = chunk.usage_metadata
+        if chunk.candidates and chunk.candidates[0].content and chunk.candidates[0].content.parts:
+            for part in chunk.candidates[0].content.parts:
+                if part.text:
+                    metrics.setdefault("first_token_ms", round((time.perf_counter() - metrics["started"]) * 1000, 1))
+                    state["text"] += part.text
+                    texts.append(part.text)
+                elif part.function_call:
+                    self.speculator.observe_tool_call(part.function_call.name, part.function_call.args)
+                    tool_calls.append(part.function_call)
+                    state["call_parts"].append(part)
+        return texts
+
+    def _end_model_call(self, state: dict, metrics: dict):
+        # Streamed text fragments are stored as a single part
+        parts = ([types.Part(text=state["text"])] if state["text"] else []) + state["call_parts"]
+        if parts:
+            self.history.append(types.Content(role="model", parts=parts))
+        if state["usage"] is not None:
+            metrics["prompt_tokens"] += state["usage"].prompt_token_count or 0
+            metrics["output_tokens"] += state["usage"].candidates_token_count or 0
+
+    def _stream_turn(self, tool_calls: list, metrics: dict, config=None):
+        """
+        Streams one model response over the history. Yields text as it arrives, appends
+        any function_call parts to tool_calls and records the model turn in history.
+        """
+        state = self._begin_model_call(metrics)
+        for chunk in self.provider.stream(self.history, config=config):
+            yield from self._read_chunk(chunk, state, tool_calls, metrics)
+        self._end_model_call(state, metrics)
+
+    # --- Turns ---
+    def _begin_turn(self, prompt: str, metrics: dict):
+        """Trims the history, adds the prompt and returns (config, summary_config, rollback point)."""
+        self.speculator.observe_text(prompt)
+        self.memory.observe_prompt(prompt)
+        # Large tool payloads the model has already answered are replaced by summaries
+        metrics["compacted_parts"] = compact_history(self.history, self.compact_threshold)
+        # Over the token budget: evict tool outputs, then roll old turns into the summary
+        metrics.update(self.memory.prepare(self.history))
+        rollback_point = (len(self.history), len(self.history[-1].parts) if self.history else 0)
+        self._add_user_parts([types.Part(text=prompt)])
+        return self.memory.apply_config(self.config), self.memory.apply_config(self.summary_config), rollback_point
+
+    def _record_tool_results(self, function_results: list):
         """
-        Sends a prompt to the Gemini model and returns the complete text response
-        or handles a function call.
+        Adds every result to history as a function_response part. Commands that report
+        their own outcome are confirmed locally; only results that need summarizing
+        (scraped content) cost a second model call. Returns (local confirmation, model results).
         """
+        self._add_user_parts(function_response_parts(function_results))
+        local_results, model_results = split_function_results(function_results)
+        return (render_confirmation(local_results) if local_results else ""), model_results
+
+    def _rollback(self, rollback_point):
+        # Don't leave a half-finished turn in history: the next request would be malformed
+        if rollback_point is not None:
+            del self.history[rollback_point[0]:]
+            if self.history:
+                del self.history[-1].parts[rollback_point[1]:]
+
+    def _end_turn(self, metrics: dict):
+        metrics["history_contents"] = len(self.history)
+        metrics["latency_ms"] = round((time.perf_counter() - metrics.pop("started")) * 1000, 1)
+        # Reported usage when the API sends it, the estimate otherwise
+        metrics["turn_prompt_tokens"] = metrics["prompt_tokens"] or metrics["estimated_prompt_tokens"]
+        self.turn_metrics.append(self.memory.report_turn(metrics))
+        self.speculator.end_turn()
+
+    @staticmethod
+    def _new_metrics() -> dict:
+        return {"started": time.perf_counter(), "model_calls": 0, "prompt_tokens": 0, "output_tokens": 0,
+                "estimated_prompt_tokens": 0}
+
+    def _turn_steps(self, metrics: dict):
+        """
+        The steps of one turn, shared by send_prompt here and in backend.async_assistant,
+        which differ only in how they carry out the blocking ones. Yields the caller's
+        ("text_chunk" | "final_text" | "error", content) items, and requests the driver
+        carries out and sends the outcome of:
+          ("begin",)                      -> _begin_turn's (config, summary_config, rollback point)
+          ("stream", tool_calls, config)  -> the streamed text (the driver passes the chunks on)
+          ("tools", function_calls)       -> route_function_calls' results
+        An exception raised by a request is thrown back in at its yield.
+        """
+        rollback_point = None
         try:
-            # Use send_message for non-streaming. This sends the prompt
-            # and automatically appends it to the chat history.
-            response = self.chat.send_message(prompt, config=self.config)
-
-            # Check if the response contains a function call
-            if response.candidates and response.candidates[0].content.parts:
-                part = response.candidates[0].content.parts[0]
-                if part.function_call:
-                    tool_call_object = part.function_call
-                    function_result = self.route_function_call(tool_call_object)
-
-                    # Send the function result back to the model as a new message
-                    # This completes the turn for the model to generate a text response
-                    response_from_tool_result = self.chat.send_message(
-                        "Function Result: " + str(function_result) + " So, draft a small confirming message."
-                    )
-
-                    if response_from_tool_result.text:
-                        # Return the model's text response after the function call
-                        yield "final_text", response_from_tool_result.text
-                    else:
-                        yield "final_text", "Operation completed."
-                elif part.text:
-                    # If it's a text response, return it directly
-                    yield "final_text", part.text
-                else:
-                    # Fallback for unexpected part types
-                    yield "error", "No valid content (text or function_call) received from the model."
+            config, summary_config, rollback_point = yield ("begin",)
+
+            tool_call_objects = []
+            full_text = yield ("stream", tool_call_objects, config)
+
+            if tool_call_objects:
+                # Run every requested tool in one batch (independent ones in parallel)
+                self.speculator.resolve(tool_call_objects)
+                function_results = yield ("tools", tool_call_objects)
+                # The tools have run: their calls and results stay in history whatever happens
+                # to the rest of the turn, so the model still knows about their side effects
+                confirmation, model_results = self._record_tool_results(function_results)
+                rollback_point = None
+                if full_text:
+                    full_text += "\n\n"
+                    yield "text_chunk", "\n\n"
+
+                if confirmation:
+                    yield "text_chunk", confirmation
+                if model_results:
+                    if confirmation:
+                        confirmation += "\n\n"
+                        yield "text_chunk", "\n\n"
+                    summary = yield ("stream", [], summary_config)
+                    confirmation += summary
+                if not confirmation:
+                    confirmation = "Operation completed."
+                    yield "text_chunk", confirmation
+                full_text += confirmation
+
+            rollback_point = None  # the turn is complete; closing the generator now keeps it
+            if full_text:
+                yield "final_text", full_text
             else:
-                yield "error", "No candidates or content parts in the model's response."
+                # Fallback for unexpected part types
+                yield "error", "No valid content (text or function_call) received from the model."
 
         except Exception as e:
+            self._rollback(rollback_point)
             # Catch any exceptions during the API call or processing
-            yield "error", f"An error occurred during prompt processing: {e}"
\ No newline at end of file
+            yield "error", f"An error occurred during prompt processing: {e}"
+        except BaseException:
+            # GeneratorExit when the caller stops reading mid-turn (e.g. a server client
+            # disconnected), or the async turn's CancelledError
+            self._rollback(rollback_point)
+            raise
+        finally:
+            self._end_turn(metrics)
+
+    def send_prompt(self, prompt: str):
+        """
+        Sends a prompt to the Gemini model and streams the reply.
+        Yields ("text_chunk", text) as text arrives, then one ("final_text", full_text)
+        with everything that was streamed, or ("error", message).
+        Function calls are executed; their confirmation is rendered locally, or streamed
+        from the model when the result needs summarizing (see core.confirmation).
+        """
+        metrics = self._new_metrics()
+        turn = self._turn_steps(metrics)
+        reply = error = None
+        try:
+            while True:
+                try:
+                    step = turn.throw(error) if error is not None else turn.send(reply)
+                except StopIteration:
+                    return
+                reply = error = None
+                try:
+                    if step[0] == "begin":
+                        reply = self._begin_turn(prompt, metrics)
+                    elif step[0] == "stream":
+                        reply = ""
+                        for text in self._stream_turn(step[1], metrics, config=step[2]):
+                            reply += text
+                            yield "text_chunk", text
+                    elif step[0] == "tools":
+                        reply = self.route_function_calls(step[1])
+                    else:
+                        yield step
+                except Exception as e:
+                    error = e
+        finally:
+            turn.close()  # rolls an unfinished turn back
@@ -0,0 +1,113 @@
+# backend/async_assistant.py
+# GeminiAssistant on the provider's async stream (client.aio for Gemini).
+# A turn is a coroutine, so the caller can cancel it: the model stream is closed
+# (dropping the HTTP request), tools that have not started yet are skipped, and the
+# half-finished turn is rolled out of history - except for tools that already ran, whose
+# calls and results are kept so the model knows about their side effects. Tools still
+# run on threads, through an executor, so a slow command never blocks the event loop (or
+# the Qt loop behind it). The turn's steps are GeminiAssistant._turn_steps; this module
+# only carries them out asynchronously.
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.assistant_core import GeminiAssistant
+
+
+class AsyncGeminiAssistant(GeminiAssistant):
+    """
+    Same history, memory and confirmation handling as GeminiAssistant; send_prompt is an
+    async generator with the same ("text_chunk" | "final_text" | "error", content) items.
+    Turns run one at a time: a new turn waits for a cancelled one to roll back first.
+    """
+
+    def __init__(self, provider=None, executor=None):
+        super().__init__(provider)
+        # route_function_calls fans out to its own pool; this one only keeps blocking work off the loop
+        self._executor = executor or ThreadPoolExecutor(max_workers=2, thread_name_prefix="alpha-assistant")
+        self._turn_lock = None
+
+    async def _begin_turn_async(self, prompt: str, metrics: dict):
+        # Off the loop: the memory manager may call the model to condense its summary
+        future = asyncio.get_running_loop().run_in_executor(self._executor, self._begin_turn, prompt, metrics)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The prompt is added on the worker thread; wait for it so it can be taken out again
+            _, _, rollback_point = await future
+            self._rollback(rollback_point)
+            raise
+
+    async def _stream_turn_async(self, tool_calls: list, metrics: dict, config=None):
+        state = self._begin_model_call(metrics)
+        stream = self.provider.astream(self.history, config=config)
+        try:
+            async for chunk in stream:
+                for text in self._read_chunk(chunk, state, tool_calls, metrics):
+                    yield text
+        finally:
+            # On cancellation this closes the response instead of draining it
+            await stream.aclose()
+        self._end_model_call(state, metrics)
+
+    async def _route_function_calls(self, function_calls: list):
+        """
+        Returns (results, cancellation). When the turn is cancelled while tools run, calls
+        still queued in the batch are skipped, the running ones are waited for (their side
+        effects happen either way), and the CancelledError comes back as cancellation.
+        """
+        cancelled = threading.Event()
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(self.route_function_calls, function_calls, cancelled=cancelled))
+        try:
+            return await asyncio.shield(future), None
+        except asyncio.CancelledError as cancellation:
+            cancelled.set()
+            return await future, cancellation
+
+    async def send_prompt(self, prompt: str):
+        """
+        Async counterpart of GeminiAssistant.send_prompt. Cancelling the task that
+        iterates it stops the turn; of that turn, history keeps only tools that already ran.
+        """
+        if self._turn_lock is None:
+            self._turn_lock = asyncio.Lock()
+        async with self._turn_lock:
+            metrics = self._new_metrics()
+            turn = self._turn_steps(metrics)
+            reply = error = None
+            try:
+                while True:
+                    try:
+                        step = turn.throw(error) if error is not None else turn.send(reply)
+                    except StopIteration:
+                        return
+                    reply = error = None
+                    try:
+                        if step[0] == "begin":
+                            reply = await self._begin_turn_async(prompt, metrics)
+                        elif step[0] == "stream":
+                            reply = ""
+                            async for text in self._stream_turn_async(step[1], metrics, config=step[2]):
+                                reply += text
+                                yield "text_chunk", text
+                        elif step[0] == "tools":
+                            reply, cancellation = await self._route_function_calls(step[1])
+                            if cancellation is not None:
+                                turn.send(reply)  # recorded in history before the turn stops
+                                raise cancellation
+                        else:
+                            yield step
+                    except asyncio.CancelledError as e:
+                        metrics["cancelled"] = True
+                        error = e
+                    except Exception as e:
+                        error = e
+            except GeneratorExit:
+                # The caller stopped iterating
+                metrics["cancelled"] = True
+                raise
+            finally:
+                turn.close()  # rolls an unfinished turn back
@@ -0,0 +1,96 @@
+# backend/history.py
+# Conversation history helpers shared by GeminiAssistant and the CLI loop.
+# Tool results go back to the model as function_response parts (structured, not a
+# Python repr pasted into a user message). Once the model has answered after seeing a
+# large payload, such as a scraped page, the payload is replaced in history by a short
+# summary, so it is not re-sent on every later turn.
+
+import json
+
+from google.genai import types
+
+COMPACT_PAYLOAD_CHARS = 1000  # function responses larger than this are compacted once consumed
+SUMMARY_CHARS = 300
+CHARS_PER_TOKEN = 4  # rough estimate used when the API does not report usage
+
+
+def _payload(result) -> dict:
+    # function_response.response must be a JSON object
+    if isinstance(result, dict):
+        return result
+    return {"result": result}
+
+
+def function_response_part(name: str, result) -> types.Part:
+    return types.Part.from_function_response(name=name, response=_payload(result))
+
+
+def function_response_parts(function_results: list) -> list:
+    """One function_response part per {"name", "result"} entry from route_function_calls."""
+    return [function_response_part(item["name"], item["result"]) for item in function_results]
+
+
+def _payload_chars(response) -> int:
+    return len(json.dumps(response, ensure_ascii=False, default=str))
+
+
+def _shorten(text: str, limit: int = SUMMARY_CHARS) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def summarize_payload(response: dict) -> str:
+    """A few hundred characters standing in for a consumed tool payload."""
+    if "results" in response and isinstance(response["results"], list):
+        per_item = SUMMARY_CHARS // max(1, len(response["results"]))
+        return " | ".join(
+            f"{item.get('url', '')}: {_shorten(item.get('content') or item.get('message', ''), per_item)}"
+            for item in response["results"] if isinstance(item, dict)
+        )
+    for field in ("content", "message", "result"):
+        if field in response:
+            return _shorten(response[field])
+    return _shorten(json.dumps(response, ensure_ascii=False, default=str))
+
+
+def compact_history(contents: list, threshold: int = COMPACT_PAYLOAD_CHARS) -> int:
+    """
+    Replaces large function_response payloads the model has already answered with a
+    summary. Returns how many parts were compacted.
+    """
+    last_model_index = max((i for i, content in enumerate(contents) if content.role == "model"), default=-1)
+    compacted = 0
+    for content in contents[:last_model_index]:
+        if content.role != "user" or not content.parts:
+            continue
+        for index, part in enumerate(content.parts):
+            response = part.function_response
+            if response is None or not response.response or response.response.get("compacted"):
+                continue
+            size = _payload_chars(response.response)
+            if size <= threshold:
+                continue
+            content.parts[index] = types.Part.from_function_response(
+                name=response.name,
+                response={
+                    "compacted": True,
+                    "summary": summarize_payload(response.response),
+                    "original_chars": size,
+                },
+            )
+            compacted += 1
+    return compacted
+
+
+def estimate_tokens(contents: list) -> int:
+    """Approximate prompt tokens for contents (text, function calls and responses)."""
+    chars = 0
+    for content in contents:
+        for part in content.parts or []:
+            if part.text:
+                chars += len(part.text)
+            elif part.function_call:
+                chars += len(part.function_call.name) + _payload_chars(dict(part.function_call.args or {}))
+            elif part.function_response:
+                chars += len(part.function_response.name) + _payload_chars(part.function_response.response or {})
+    return chars // CHARS_PER_TOKEN
@@ -0,0 +1,208 @@
+# backend/memory.py
+# Token-budgeted conversation memory for GeminiAssistant and the CLI loop.
+# The full history is re-sent with every request, so a long session used to get slower
+# and more expensive each turn. Before each request the memory manager brings the
+# history back under a token budget. It works in this order:
+#   1. evict bulky tool outputs: consumed function responses become summaries
+#   2. roll the oldest turns into a running summary (recent turns stay verbatim)
+#   3. as a last resort, roll recent turns too, down to the current one
+# The summary and any pinned facts are sent as the system instruction, so they survive
+# however much history is rolled away.
+
+import os
+import re
+
+from google.genai import types
+
+from backend.history import compact_history, estimate_tokens, summarize_payload, CHARS_PER_TOKEN
+
+MEMORY_TOKEN_BUDGET = int(os.getenv("ALPHA_MEMORY_TOKEN_BUDGET", "6000"))  # estimated history + instruction tokens
+MEMORY_RECENT_TURNS = int(os.getenv("ALPHA_MEMORY_RECENT_TURNS", "4"))  # turns kept verbatim while possible
+MEMORY_SUMMARIZER = os.getenv("ALPHA_MEMORY_SUMMARIZER", "local")  # "local" (extractive) or "model"
+MEMORY_DEBUG = os.getenv("ALPHA_MEMORY_DEBUG", "0") != "0"  # print each turn's memory figures
+EVICT_PAYLOAD_CHARS = 200  # over budget: compact every consumed function response larger than this
+MAX_PINNED_FACTS = 20
+LINE_CHARS = 160  # per-item length in the extractive summary
+
+# "remember that my project folder is D:\work" pins "my project folder is D:\work"
+_REMEMBER = re.compile(r"^\s*(?:please\s+)?remember(?:\s+that)?[\s,:]+(.+?)\s*$", re.IGNORECASE | re.DOTALL)
+
+
+def _shorten(text: str, limit: int = LINE_CHARS) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def _turn_starts(contents: list) -> list:
+    # A turn starts at a user content carrying the prompt text; user contents with only
+    # function responses belong to the turn whose function calls they answer.
+    return [i for i, content in enumerate(contents)
+            if content.role == "user" and any(part.text for part in content.parts or [])]
+
+
+def describe_turn(contents: list) -> str:
+    """One summary line for the contents of a rolled turn."""
+    pieces = []
+    for content in contents:
+        for part in content.parts or []:
+            if part.text:
+                speaker = "User" if content.role == "user" else "Assistant"
+                pieces.append(f"{speaker}: {_shorten(part.text)}")
+            elif part.function_call:
+                args = ", ".join(f"{k}={v!r}" for k, v in dict(part.function_call.args or {}).items())
+                pieces.append(_shorten(f"called {part.function_call.name}({args})"))
+            elif part.function_response:
+                response = part.function_response.response or {}
+                summary = response.get("summary") if response.get("compacted") else summarize_payload(response)
+                pieces.append(f"{part.function_response.name} returned: {_shorten(summary)}")
+    return " | ".join(pieces)
+
+
+def extractive_summarizer(summary: str, lines: list, max_chars: int) -> str:
+    """Appends the new turn lines; the oldest lines are dropped once the summary is too long."""
+    kept = (summary.splitlines() if summary else []) + lines
+    while len(kept) > 1 and sum(len(line) + 1 for line in kept) > max_chars:
+        kept.pop(0)
+    return "\n".join(kept)[-max_chars:]
+
+
+def model_summarizer(provider):
+    """
+    Condenses the summary with one extra model call per roll. An empty reply falls back to
+    the extractive summary; a failed call raises, and MemoryManager falls back and counts it.
+    """
+
+    def summarize(summary: str, lines: list, max_chars: int) -> str:
+        prompt = (
+            f"Rewrite this conversation summary in at most {max_chars} characters. Keep names, paths, "
+            "decisions and anything the user may refer back to; drop pleasantries.\n\n"
+            f"Summary so far:\n{summary or '(empty)'}\n\nNew turns:\n" + "\n".join(lines)
+        )
+        response = provider.generate(prompt)
+        if response.text:
+            return response.text.strip()[:max_chars]
+        return extractive_summarizer(summary, lines, max_chars)
+
+    return summarize
+
+
+class MemoryManager:
+    """
+    Keeps a history of types.Content within token_budget (estimated tokens, see
+    backend.history.estimate_tokens). prepare() trims the history in place; the rolled
+    summary and pinned facts come back through system_instruction()/apply_config().
+    """
+
+    def __init__(self, token_budget: int = MEMORY_TOKEN_BUDGET, recent_turns: int = MEMORY_RECENT_TURNS,
+                 summarizer=None):
+        self.token_budget = token_budget
+        self.recent_turns = max(1, recent_turns)
+        self.summary_chars = token_budget * CHARS_PER_TOKEN // 4  # the summary may use a quarter of the budget
+        self.summarizer = summarizer or extractive_summarizer
+        self.summary = ""
+        self.pinned = []
+        self.rolled_turns = 0
+        self._previous_turn = None
+
+    # --- Pinned facts ---
+    def pin(self, fact: str):
+        fact = " ".join(fact.split())
+        if fact and fact not in self.pinned:
+            self.pinned.append(fact)
+            del self.pinned[:-MAX_PINNED_FACTS]
+
+    def unpin(self, fact: str):
+        if fact in self.pinned:
+            self.pinned.remove(fact)
+
+    def observe_prompt(self, prompt: str):
+        """Pins whatever the user explicitly asks to be remembered."""
+        match = _REMEMBER.match(prompt)
+        if match:
+            self.pin(match.group(1))
+
+    # --- Budget ---
+    def system_instruction(self):
+        sections = []
+        if self.pinned:
+            sections.append("Facts the user asked you to remember:\n" + "\n".join(f"- {fact}" for fact in self.pinned))
+        if self.summary:
+            sections.append("Summary of the earlier conversation (older turns are no longer shown):\n" + self.summary)
+        return "\n\n".join(sections) or None
+
+    def apply_config(self, config: dict) -> dict:
+        """config with the summary and pinned facts as its system instruction."""
+        instruction = self.system_instruction()
+        return {**config, "system_instruction": instruction} if instruction else config
+
+    def tokens(self, history: list) -> int:
+        return estimate_tokens(history) + len(self.system_instruction() or "") // CHARS_PER_TOKEN
+
+    def _roll_oldest(self, history: list) -> bool:
+        """Rolls the oldest turn into the summary. Returns False if the summarizer failed."""
+        cut = _turn_starts(history)[1]
+        rolled = history[:cut]
+        # Responses to the rolled turn's function calls go with it
+        first = history[cut]
+        responses = [part for part in first.parts if part.function_response]
+        if responses:
+            rolled.append(types.Content(role="user", parts=responses))
+            first.parts = [part for part in first.parts if not part.function_response]
+        del history[:cut]
+        lines = [describe_turn(rolled)]
+        self.rolled_turns += 1
+        try:
+            self.summary = self.summarizer(self.summary, lines, self.summary_chars)
+            return True
+        except Exception as e:
+            if MEMORY_DEBUG:
+                print(f"[Memory] Summarizer failed, using extractive summary: {e}")
+            self.summary = extractive_summarizer(self.summary, lines, self.summary_chars)
+            return False
+
+    def prepare(self, history: list) -> dict:
+        """Trims history (in place) to the token budget. Returns what was done."""
+        report = {"history_tokens_before": self.tokens(history), "evicted_payloads": 0, "rolled_turns": 0,
+                  "summary_failures": 0}
+        if report["history_tokens_before"] <= self.token_budget:
+            report.update(history_tokens_after=report["history_tokens_before"], summary_tokens=self._summary_tokens())
+            return report
+        report["evicted_payloads"] = compact_history(history, EVICT_PAYLOAD_CHARS)
+        # Still over: roll everything older than recent_turns at once, which leaves headroom
+        # for the next few turns instead of rolling (and changing the prefix) on every request.
+        if self.tokens(history) > self.token_budget:
+            while len(_turn_starts(history)) > self.recent_turns:
+                report["summary_failures"] += not self._roll_oldest(history)
+                report["rolled_turns"] += 1
+        # Last resort: recent turns too, down to the current one
+        while self.tokens(history) > self.token_budget and len(_turn_starts(history)) > 1:
+            report["summary_failures"] += not self._roll_oldest(history)
+            report["rolled_turns"] += 1
+        report["history_tokens_after"] = self.tokens(history)
+        report["summary_tokens"] = self._summary_tokens()
+        return report
+
+    def _summary_tokens(self) -> int:
+        return len(self.summary) // CHARS_PER_TOKEN
+
+    # --- Metrics ---
+    def report_turn(self, metrics: dict) -> dict:
+        """
+        Adds the change in prompt tokens and latency since the previous turn to metrics.
+        Prints the turn's figures when ALPHA_MEMORY_DEBUG is set.
+        """
+        previous = self._previous_turn
+        metrics["prompt_tokens_delta"] = metrics["turn_prompt_tokens"] - previous["turn_prompt_tokens"] if previous else 0
+        metrics["latency_ms_delta"] = round(metrics["latency_ms"] - previous["latency_ms"], 1) if previous else 0.0
+        self._previous_turn = metrics
+        if MEMORY_DEBUG:
+            print(f"[Memory] {metrics['turn_prompt_tokens']} prompt tokens ({metrics['prompt_tokens_delta']:+d}), "
+                  f"{metrics['latency_ms']:.0f} ms ({metrics['latency_ms_delta']:+.0f}); "
+                  f"rolled {metrics.get('rolled_turns', 0)} turn(s), evicted {metrics.get('evicted_payloads', 0)} payload(s)")
+        return metrics
+
+
+def get_memory_manager(provider=None) -> MemoryManager:
+    """A MemoryManager configured from the ALPHA_MEMORY_* environment variables."""
+    summarizer = model_summarizer(provider) if MEMORY_SUMMARIZER == "model" and provider is not None else None
+    return MemoryManager(summarizer=summarizer)
@@ -0,0 +1,324 @@
+# backend/model_provider.py
+# Every model call in the app goes through a provider, so the backend can be swapped
+# without touching the assistant, the memory manager or the commands. A provider has:
+#   stream(contents, config)    iterator of GenerateContentResponse chunks
+#   astream(contents, config)   the same as an async iterator; closing it drops the request
+#   generate(contents, config)  one GenerateContentResponse
+#   count_tokens(contents)
+#
+# Providers (ALPHA_MODEL_PROVIDER):
+#   gemini  the Gemini API, with GEMINI_API_KEY
+#   stub    offline and deterministic: replays a recording (ALPHA_STUB_RECORDING) with the
+#           text, function_call parts and chunk boundaries the model produced, at a
+#           configurable latency. Without a recording it streams "Stub reply to: <prompt>".
+#
+# get_model_provider() is the process-wide provider the assistants and commands share, so
+# a Gemini session builds one client and keeps its connections alive between requests
+# (ALPHA_MODEL_MAX_CONNECTIONS, ALPHA_MODEL_KEEPALIVE_SECONDS).
+#
+# ALPHA_MODEL_RECORD=<file.jsonl> appends every exchange with the configured provider to
+# a recording, one JSON object per model call:
+#   {"prompt": "<last user text>", "chunks": [[{"text": "..."}], [{"function_call": {"name": "...", "args": {}}}]],
+#    "usage": {"prompt_token_count": 812, "candidates_token_count": 23}}
+
+import asyncio
+import json
+import os
+import threading
+import time
+
+from google.genai import types
+
+from backend.history import estimate_tokens, CHARS_PER_TOKEN
+
+MODEL_NAME = os.getenv("ALPHA_MODEL", "gemini-2.0-flash")
+MODEL_PROVIDER = os.getenv("ALPHA_MODEL_PROVIDER", "gemini")  # "gemini" or "stub"
+MODEL_RECORD = os.getenv("ALPHA_MODEL_RECORD")  # path of a recording to append to
+MODEL_MAX_CONNECTIONS = int(os.getenv("ALPHA_MODEL_MAX_CONNECTIONS", "10"))  # HTTP connection pool size
+# httpx closes idle connections after 5 s by default; a user creating files one after
+# another would pay the TLS handshake on nearly every request
+MODEL_KEEPALIVE_SECONDS = float(os.getenv("ALPHA_MODEL_KEEPALIVE_SECONDS", "120"))
+STUB_RECORDING = os.getenv("ALPHA_STUB_RECORDING")  # recording the stub replays
+STUB_FIRST_CHUNK_DELAY = float(os.getenv("ALPHA_STUB_FIRST_CHUNK_MS", "0")) / 1000  # time to first chunk (s)
+STUB_CHUNK_DELAY = float(os.getenv("ALPHA_STUB_CHUNK_MS", "20")) / 1000  # between streamed chunks (s)
+
+
+def request_key(contents) -> str:
+    """
+    What a recorded exchange is matched on: the text of the last user content, or the
+    names of the function responses it carries for a follow-up call.
+    """
+    if isinstance(contents, str):
+        return contents
+    for content in reversed(contents):
+        if isinstance(content, str):
+            return content
+        if content.role != "user":
+            continue
+        parts = content.parts or []
+        texts = [part.text for part in parts if part.text]
+        if texts:
+            return " ".join(texts)
+        names = [part.function_response.name for part in parts if part.function_response]
+        return "[function_response] " + ",".join(names)
+    return ""
+
+
+def _part_to_dict(part: types.Part):
+    if part.text:
+        return {"text": part.text}
+    if part.function_call:
+        return {"function_call": {"name": part.function_call.name, "args": dict(part.function_call.args or {})}}
+    return None  # thoughts, inline data: not replayed
+
+
+def _part_from_dict(data: dict) -> types.Part:
+    if "function_call" in data:
+        call = data["function_call"]
+        return types.Part(function_call=types.FunctionCall(name=call["name"], args=call.get("args") or {}))
+    return types.Part(text=data["text"])
+
+
+def _response(parts: list, usage: dict = None) -> types.GenerateContentResponse:
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(role="model", parts=parts))],
+        usage_metadata=types.GenerateContentResponseUsageMetadata(**usage) if usage else None,
+    )
+
+
+class ModelProvider:
+    """Base class; model is the model name requests are made with."""
+    name = "base"
+
+    def __init__(self, model: str = None):
+        self.model = model or MODEL_NAME
+
+    def stream(self, contents, config=None):
+        raise NotImplementedError
+
+    def astream(self, contents, config=None):
+        raise NotImplementedError
+
+    def generate(self, contents, config=None) -> types.GenerateContentResponse:
+        raise NotImplementedError
+
+    def count_tokens(self, contents) -> int:
+        """Estimated (see backend.history.estimate_tokens); contents may mix strings and types.Content."""
+        if isinstance(contents, str):
+            contents = [contents]
+        text_chars = sum(len(item) for item in contents if isinstance(item, str))
+        return text_chars // CHARS_PER_TOKEN + estimate_tokens([item for item in contents if not isinstance(item, str)])
+
+
+class GeminiProvider(ModelProvider):
+    """The Gemini API. The genai client is created on first use."""
+    name = "gemini"
+
+    def __init__(self, model: str = None, client=None):
+        super().__init__(model)
+        self._client = client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import httpx
+                    from google import genai
+                    limits = httpx.Limits(max_connections=MODEL_MAX_CONNECTIONS,
+                                          max_keepalive_connections=MODEL_MAX_CONNECTIONS,
+                                          keepalive_expiry=MODEL_KEEPALIVE_SECONDS)
+                    self._client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"),
+                                                http_options=types.HttpOptions(client_args={"limits": limits}))
+        return self._client
+
+    def stream(self, contents, config=None):
+        return self.client.models.generate_content_stream(model=self.model, contents=contents, config=config)
+
+    async def astream(self, contents, config=None):
+        stream = await self.client.aio.models.generate_content_stream(model=self.model, contents=contents,
+                                                                      config=config)
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            # On cancellation this closes the response instead of draining it
+            await stream.aclose()
+
+    def generate(self, contents, config=None) -> types.GenerateContentResponse:
+        return self.client.models.generate_content(model=self.model, contents=contents, config=config)
+
+    def count_tokens(self, contents) -> int:
+        return self.client.models.count_tokens(model=self.model, contents=contents).total_tokens
+
+
+class StubProvider(ModelProvider):
+    """
+    Replays recorded exchanges. Each request takes the next exchange recorded for the
+    same request_key(), searching forward from the last one replayed; when none matches,
+    the next exchange in order is used, so a recording always replays as a sequence.
+    With no exchanges it streams "Stub reply to: <prompt>" word by word.
+    Nothing here calls a tool or the network.
+    """
+    name = "stub"
+
+    def __init__(self, exchanges: list = None, first_chunk_delay: float = STUB_FIRST_CHUNK_DELAY,
+                 chunk_delay: float = STUB_CHUNK_DELAY, model: str = None):
+        super().__init__(model)
+        self.exchanges = [self._prepare(exchange) for exchange in exchanges or []]
+        self.first_chunk_delay = first_chunk_delay
+        self.chunk_delay = chunk_delay
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "StubProvider":
+        with open(path, encoding="utf-8") as f:
+            exchanges = [json.loads(line) for line in f if line.strip()]
+        return cls(exchanges, **kwargs)
+
+    @staticmethod
+    def _prepare(exchange: dict) -> dict:
+        # Parts are built once; only the response envelopes are created per request
+        return {
+            "prompt": exchange.get("prompt"),
+            "chunks": [[_part_from_dict(part) for part in chunk] for chunk in exchange["chunks"]],
+            "usage": exchange.get("usage"),
+        }
+
+    def _next_exchange(self, key: str):
+        with self._lock:
+            if not self.exchanges:
+                return None
+            count = len(self.exchanges)
+            for offset in range(count):
+                index = (self._cursor + offset) % count
+                if self.exchanges[index]["prompt"] == key:
+                    break
+            else:
+                index = self._cursor % count
+            self._cursor = index + 1
+            return self.exchanges[index]
+
+    def _chunks(self, contents) -> list:
+        """The responses for one request; usage arrives with the last chunk, as from the API."""
+        key = request_key(contents)
+        exchange = self._next_exchange(key)
+        if exchange is None:
+            words = f"Stub reply to: {key}".split(" ")
+            chunks = [[types.Part(text=word if index == len(words) - 1 else word + " ")]
+                      for index, word in enumerate(words)]
+            usage = None
+        else:
+            chunks, usage = exchange["chunks"], exchange["usage"]
+        if usage is None:
+            output_chars = sum(len(part.text or "") for chunk in chunks for part in chunk)
+            usage = {"prompt_token_count": self.count_tokens(contents),
+                     "candidates_token_count": output_chars // CHARS_PER_TOKEN}
+        return [_response(chunk, usage if index == len(chunks) - 1 else None) for index, chunk in enumerate(chunks)]
+
+    def _delays(self, count: int) -> list:
+        return [self.first_chunk_delay if index == 0 else self.chunk_delay for index in range(count)]
+
+    def stream(self, contents, config=None):
+        chunks = self._chunks(contents)
+        for delay, chunk in zip(self._delays(len(chunks)), chunks):
+            if delay:
+                time.sleep(delay)
+            yield chunk
+
+    async def astream(self, contents, config=None):
+        chunks = self._chunks(contents)
+        for delay, chunk in zip(self._delays(len(chunks)), chunks):
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+    def generate(self, contents, config=None) -> types.GenerateContentResponse:
+        chunks = self._chunks(contents)
+        delay = sum(self._delays(len(chunks)))
+        if delay:
+            time.sleep(delay)
+        parts = [part for chunk in chunks for part in chunk.candidates[0].content.parts]
+        return _response(parts, chunks[-1].usage_metadata.model_dump(exclude_none=True) if chunks else None)
+
+
+class RecordingProvider(ModelProvider):
+    """Passes every request to provider and appends the exchange to path (see the header)."""
+
+    def __init__(self, provider: ModelProvider, path: str):
+        super().__init__(provider.model)
+        self.provider = provider
+        self.name = provider.name
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _record(self, contents, responses: list):
+        chunks, usage = [], None
+        for response in responses:
+            if response.usage_metadata:
+                usage = response.usage_metadata.model_dump(include={"prompt_token_count", "candidates_token_count"},
+                                                           exclude_none=True)
+            if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
+                parts = [_part_to_dict(part) for part in response.candidates[0].content.parts]
+                if any(parts):
+                    chunks.append([part for part in parts if part])
+        line = json.dumps({"prompt": request_key(contents), "chunks": chunks, "usage": usage}, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def stream(self, contents, config=None):
+        responses = []
+        for chunk in self.provider.stream(contents, config):
+            responses.append(chunk)
+            yield chunk
+        self._record(contents, responses)
+
+    async def astream(self, contents, config=None):
+        responses = []
+        stream = self.provider.astream(contents, config)
+        try:
+            async for chunk in stream:
+                responses.append(chunk)
+                yield chunk
+        finally:
+            await stream.aclose()
+        self._record(contents, responses)
+
+    def generate(self, contents, config=None) -> types.GenerateContentResponse:
+        response = self.provider.generate(contents, config)
+        self._record(contents, [response])
+        return response
+
+    def count_tokens(self, contents) -> int:
+        return self.provider.count_tokens(contents)
+
+
+def create_model_provider(name: str = None, model: str = None) -> ModelProvider:
+    """A provider configured from the ALPHA_MODEL* / ALPHA_STUB_* environment variables."""
+    name = (name or MODEL_PROVIDER).lower()
+    if name == "gemini":
+        provider = GeminiProvider(model)
+    elif name == "stub":
+        provider = StubProvider.from_file(STUB_RECORDING, model=model) if STUB_RECORDING else StubProvider(model=model)
+    else:
+        raise ValueError(f"Unknown model provider '{name}' (expected 'gemini' or 'stub').")
+    if MODEL_RECORD:
+        provider = RecordingProvider(provider, MODEL_RECORD)
+    return provider
+
+
+_model_provider = None
+_model_provider_lock = threading.Lock()
+
+
+def get_model_provider() -> ModelProvider:
+    """The process-wide provider from create_model_provider(), created on first use."""
+    global _model_provider
+    if _model_provider is None:
+        with _model_provider_lock:
+            if _model_provider is None:
+                _model_provider = create_model_provider()
+    return _model_provider
@@ -0,0 +1,403 @@
+# backend/server.py
+# Multi-session HTTP server around GeminiAssistant, so several users share one process.
+#
+#   python -m backend.server                      # 127.0.0.1:8765, Gemini (GEMINI_API_KEY)
+#   python -m backend.server --port 9000 --stub   # offline stub model (ALPHA_MODEL_PROVIDER=stub)
+#
+# API (JSON in, JSON out; replies stream as NDJSON, one event per line):
+#   POST   /sessions                      -> 201 {"session_id": ...}
+#   POST   /sessions/<id>/messages        {"prompt": "..."} -> 200 application/x-ndjson
+#          {"type": "text_chunk", "text": ...} ... then {"type": "final_text" | "error", ...}
+#   GET    /sessions/<id>                 -> turn count, history size, last turn's metrics
+#   DELETE /sessions/<id>                 -> 204
+#   GET    /health                        -> {"sessions": n, "max_sessions": n}
+#
+# Each session owns an assistant (history, memory, speculation); tools from every
+# session share core.function_router's pool (ALPHA_TOOL_WORKERS). A session runs one
+# turn at a time (409 while busy), is rate limited with a token bucket (429 with
+# Retry-After) and is evicted after ALPHA_SESSION_IDLE_SECONDS without a request. If
+# ALPHA_SERVER_TOKEN is set, requests need "Authorization: Bearer <token>".
+
+import argparse
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SERVER_HOST = os.getenv("ALPHA_SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("ALPHA_SERVER_PORT", "8765"))
+SERVER_TOKEN = os.getenv("ALPHA_SERVER_TOKEN")
+MAX_SESSIONS = int(os.getenv("ALPHA_MAX_SESSIONS", "32"))
+SESSION_IDLE_SECONDS = float(os.getenv("ALPHA_SESSION_IDLE_SECONDS", "900"))
+SESSION_RATE_PER_MINUTE = float(os.getenv("ALPHA_SESSION_RATE_PER_MINUTE", "20"))
+SESSION_BURST = int(os.getenv("ALPHA_SESSION_BURST", "5"))
+MAX_BODY_BYTES = 64 * 1024
+REAPER_INTERVAL = 30  # seconds between idle-session sweeps
+
+
+class TokenBucket:
+    """Allows `burst` requests at once, refilled at rate_per_minute."""
+
+    def __init__(self, rate_per_minute: float = SESSION_RATE_PER_MINUTE, burst: int = SESSION_BURST):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        """Takes one token. Returns 0 on success, otherwise the seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate if self.rate else float("inf")
+
+
+class Session:
+    def __init__(self, session_id: str, assistant):
+        self.id = session_id
+        self.assistant = assistant
+        self.bucket = TokenBucket()
+        self.turn_lock = threading.Lock()
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.turns = 0
+        self.leases = 0  # requests holding the session (SessionManager.lease); guarded by the manager's lock
+        self.retired = False  # removed from the manager; closed when the last lease ends
+
+    def touch(self):
+        self.last_used = time.monotonic()
+
+    @property
+    def busy(self) -> bool:
+        return self.turn_lock.locked()
+
+    @property
+    def in_use(self) -> bool:
+        return self.leases > 0 or self.busy
+
+    def info(self) -> dict:
+        metrics = self.assistant.turn_metrics[-1] if self.assistant.turn_metrics else None
+        return {
+            "session_id": self.id,
+            "turns": self.turns,
+            "busy": self.busy,
+            "history_contents": len(self.assistant.history),
+            "idle_seconds": round(time.monotonic() - self.last_used, 1),
+            "last_turn": metrics,
+        }
+
+    def close(self):
+        self.assistant.speculator.close()
+
+
+class SessionManager:
+    """Creates, looks up and evicts sessions; assistant_factory() builds each session's assistant."""
+
+    def __init__(self, assistant_factory, max_sessions: int = MAX_SESSIONS,
+                 idle_seconds: float = SESSION_IDLE_SECONDS):
+        self.assistant_factory = assistant_factory
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def create(self):
+        """Returns a new Session, or None when the server is full even after evicting idle sessions."""
+        if len(self) >= self.max_sessions:
+            self.evict_idle()
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                # Make room by dropping the least recently used session no request is using
+                idle = [s for s in self._sessions.values() if not s.in_use]
+                if not idle:
+                    return None
+                oldest = min(idle, key=lambda s: s.last_used)
+                del self._sessions[oldest.id]
+                evicted = [oldest]
+            else:
+                evicted = []
+            session = Session(secrets.token_urlsafe(12), self.assistant_factory())
+            self._sessions[session.id] = session
+        for old in evicted:
+            print(f"[Server] Evicted session {old.id} to make room")
+            old.close()
+        return session
+
+    def get(self, session_id: str):
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    @contextmanager
+    def lease(self, session_id: str):
+        """
+        with sessions.lease(id) as session: ... - the session (None if there is no such
+        session), which eviction leaves alone until the block ends. Taken under the same
+        lock eviction uses, so a session can't be closed between lookup and use.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.leases += 1
+        try:
+            yield session
+        finally:
+            if session is not None:
+                with self._lock:
+                    session.leases -= 1
+                    close = session.retired and session.leases == 0
+                if close:
+                    session.close()
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return False
+            # A request still using it closes it when done
+            session.retired = True
+            close = session.leases == 0
+        if close:
+            session.close()
+        return True
+
+    def evict_idle(self) -> int:
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            expired = [s for s in self._sessions.values() if s.last_used < cutoff and not s.in_use]
+            for session in expired:
+                del self._sessions[session.id]
+        for session in expired:
+            print(f"[Server] Evicted idle session {session.id}")
+            session.close()
+        return len(expired)
+
+    def start_reaper(self, interval: float = REAPER_INTERVAL):
+        def reap():
+            while True:
+                time.sleep(interval)
+                self.evict_idle()
+        threading.Thread(target=reap, name="alpha-session-reaper", daemon=True).start()
+
+
+class AssistantRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive and chunked streaming
+    server_version = "ALPHA"
+
+    @property
+    def sessions(self) -> SessionManager:
+        return self.server.sessions
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # --- Responses ---
+    def _send_json(self, status: int, payload=None, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, headers=None):
+        self._send_json(status, {"error": message}, headers)
+
+    def _write_chunk(self, payload: dict):
+        data = (json.dumps(payload) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    # --- Request plumbing ---
+    def _authorized(self) -> bool:
+        if not self.server.token:
+            return True
+        if secrets.compare_digest(self.headers.get("Authorization", ""), f"Bearer {self.server.token}"):
+            return True
+        self._send_error(401, "Missing or invalid bearer token.")
+        return False
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._send_error(413, "Request body too large.")
+            return None
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_error(400, "Body must be JSON.")
+            return None
+
+    def _route(self) -> list:
+        return [part for part in self.path.split("?", 1)[0].split("/") if part]
+
+    def _send_unknown_session(self):
+        self._send_error(404, "Unknown or expired session.")
+
+    # --- Methods ---
+    def do_GET(self):
+        if not self._authorized():
+            return
+        parts = self._route()
+        if parts == ["health"]:
+            self._send_json(200, {"sessions": len(self.sessions), "max_sessions": self.sessions.max_sessions})
+        elif len(parts) == 2 and parts[0] == "sessions":
+            with self.sessions.lease(parts[1]) as session:
+                if session is None:
+                    self._send_unknown_session()
+                else:
+                    self._send_json(200, session.info())
+        else:
+            self._send_error(404, "Not found.")
+
+    def do_DELETE(self):
+        if not self._authorized():
+            return
+        parts = self._route()
+        if len(parts) == 2 and parts[0] == "sessions" and self.sessions.delete(parts[1]):
+            self._send_json(204)
+        else:
+            self._send_unknown_session()
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        parts = self._route()
+        if parts == ["sessions"]:
+            session = self.sessions.create()
+            if session is None:
+                self._send_error(503, "Too many active sessions.", {"Retry-After": "30"})
+            else:
+                self._send_json(201, {"session_id": session.id})
+        elif len(parts) == 3 and parts[0] == "sessions" and parts[2] == "messages":
+            self._post_message(parts[1])
+        else:
+            self._send_error(404, "Not found.")
+
+    def _post_message(self, session_id: str):
+        # The lease keeps the session from being evicted (and closed) before its turn starts
+        with self.sessions.lease(session_id) as session:
+            if session is None:
+                self._send_unknown_session()
+            else:
+                self._run_turn(session)
+
+    def _run_turn(self, session: Session):
+        body = self._read_json()
+        if body is None:
+            return
+        prompt = body.get("prompt") if isinstance(body, dict) else None
+        if not isinstance(prompt, str) or not prompt.strip():
+            self._send_error(400, 'Expected {"prompt": "<text>"}.')
+            return
+        session.touch()
+        # Busy first, so a message turned away with 409 does not use up a token
+        if not session.turn_lock.acquire(blocking=False):
+            self._send_error(409, "This session is still answering the previous message.")
+            return
+        finished = False
+        try:
+            retry_after = session.bucket.take()
+            if retry_after:
+                self._send_error(429, "Rate limit exceeded.", {"Retry-After": str(max(1, round(retry_after)))})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            replies = session.assistant.send_prompt(prompt)
+            try:
+                for response_type, content in replies:
+                    key = "text" if response_type in ("text_chunk", "final_text") else "message"
+                    self._write_chunk({"type": response_type, key: content})
+                session.turns += 1
+                finished = True
+            except (BrokenPipeError, ConnectionResetError):
+                # Client went away mid-reply: closing the generator rolls the turn back
+                replies.close()
+                self.close_connection = True
+        finally:
+            session.touch()
+            session.turn_lock.release()
+        if finished:
+            # The reply ends only once the session is free, so a client may send its next message right away
+            try:
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+
+class AssistantServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, sessions: SessionManager, token: str = SERVER_TOKEN, verbose: bool = False):
+        super().__init__(address, AssistantRequestHandler)
+        self.sessions = sessions
+        self.token = token
+        self.verbose = verbose
+
+    def handle_error(self, request, client_address):
+        # A client dropping a keep-alive connection is routine, not worth a traceback
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+def assistant_factory(provider=None):
+    """
+    Sessions share one model provider (for Gemini, one client and its connection pool);
+    everything else is per session. Defaults to the ALPHA_MODEL_PROVIDER backend.
+    """
+    from backend.assistant_core import GeminiAssistant
+    from backend.model_provider import get_model_provider
+    provider = provider or get_model_provider()
+    return lambda: GeminiAssistant(provider)
+
+
+def create_server(assistant_factory, host: str = SERVER_HOST, port: int = SERVER_PORT, token: str = SERVER_TOKEN,
+                  verbose: bool = False) -> AssistantServer:
+    """Builds the server (port 0 picks a free one) and starts the idle-session reaper."""
+    sessions = SessionManager(assistant_factory)
+    sessions.start_reaper()
+    return AssistantServer((host, port), sessions, token=token, verbose=verbose)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the assistant to several users over HTTP.")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--stub", action="store_true", help="Use the offline stub model instead of Gemini.")
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    args = parser.parse_args()
+
+    from backend.model_provider import create_model_provider, get_model_provider
+    provider = create_model_provider("stub") if args.stub else get_model_provider()
+    server = create_server(assistant_factory(provider), args.host, args.port, verbose=args.verbose)
+    print(f"[Server] Listening on http://{args.host}:{server.server_address[1]} "
+          f"({provider.name} model, up to {server.sessions.max_sessions} sessions)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
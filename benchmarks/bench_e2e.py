@@ -0,0 +1,229 @@
+# benchmarks/bench_e2e.py
+# What our own code costs per turn, end to end, with the model and the tools taken out.
+#
+#   python benchmarks/bench_e2e.py                                  # fixture session, 20 rounds, sync and async
+#   python benchmarks/bench_e2e.py --per-turn                       # overhead of every turn of the session
+#   python benchmarks/bench_e2e.py --recording session.jsonl        # a recording made with ALPHA_MODEL_RECORD
+#   python benchmarks/bench_e2e.py --first-chunk-ms 400 --chunk-ms 15   # replay with model latency
+#
+# The model is the stub provider replaying a recording (text, function_call parts and
+# chunk boundaries as recorded; benchmarks/fixtures/e2e/session.jsonl by default). Tools
+# are instant fakes put in the router's registry, so the real router (pool, batching),
+# confirmations, history compaction, the memory manager and turn metrics all run. Per turn:
+#   total      send_prompt from the call to its last event
+#   model      time inside the provider, including the replay latency
+#   tools      time inside the (fake) tools
+#   overhead   total - model - tools: the part that is ours
+#   first text overhead  the same split, up to the first text chunk the user sees
+# Every round replays the whole session on a fresh assistant; one warm-up round is not counted.
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.assistant_core import GeminiAssistant
+from backend.async_assistant import AsyncGeminiAssistant
+from backend.model_provider import ModelProvider, StubProvider
+from core import function_router
+from core.speculation import Speculator
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "e2e", "session.jsonl")
+
+PAGE = ("This paragraph is the kind of body text a scrape returns. " * 140)[:8000]
+
+# Results the fake tools return, in the shapes the real commands use
+TOOL_RESULTS = {
+    "create_folder": {"created": ["/home/user/Desktop/reports"]},
+    "rename_folders": ["✅ Renamed 'beta' to 'beta-old'"],
+    "create_python_file": "✅ Python file 'primes.py' created at Desktop with generated code.",
+    "scrape_website_content": {"success": True, "url": "https://example.com", "content": PAGE},
+    "open_youtube_trending": {"success": True, "message": "Opened YouTube trending."},
+}
+
+
+class Clock:
+    """Seconds spent somewhere, added up from several threads."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self.seconds += seconds
+
+
+class TimedProvider(ModelProvider):
+    """Passes requests to provider and adds the time spent waiting on it to clock."""
+
+    def __init__(self, provider: ModelProvider, clock: Clock):
+        super().__init__(provider.model)
+        self.provider = provider
+        self.clock = clock
+
+    def stream(self, contents, config=None):
+        start = time.perf_counter()
+        iterator = iter(self.provider.stream(contents, config))
+        while True:
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                self.clock.add(time.perf_counter() - start)
+                return
+            self.clock.add(time.perf_counter() - start)
+            yield chunk
+            start = time.perf_counter()
+
+    async def astream(self, contents, config=None):
+        start = time.perf_counter()
+        iterator = self.provider.astream(contents, config)
+        try:
+            while True:
+                try:
+                    chunk = await iterator.__anext__()
+                except StopAsyncIteration:
+                    self.clock.add(time.perf_counter() - start)
+                    return
+                self.clock.add(time.perf_counter() - start)
+                yield chunk
+                start = time.perf_counter()
+        finally:
+            await iterator.aclose()
+
+    def generate(self, contents, config=None):
+        start = time.perf_counter()
+        try:
+            return self.provider.generate(contents, config)
+        finally:
+            self.clock.add(time.perf_counter() - start)
+
+
+def install_fake_tools(clock: Clock):
+    def fake(name):
+        def run(**kwargs):
+            start = time.perf_counter()
+            result = TOOL_RESULTS.get(name, {"success": True, "message": f"{name} done."})
+            clock.add(time.perf_counter() - start)
+            return result
+        return run
+
+    # route_function_call looks commands up in this module global on every call
+    function_router.executable_functions = {name: fake(name) for name in TOOL_RESULTS}
+
+
+def session_prompts(provider: StubProvider) -> list:
+    return [exchange["prompt"] for exchange in provider.exchanges
+            if exchange["prompt"] and not exchange["prompt"].startswith("[function_response]")]
+
+
+class Turn:
+    def __init__(self, model: Clock, tools: Clock):
+        self.model, self.tools = model, tools
+        self.start = time.perf_counter()
+        self.model_start, self.tools_start = model.seconds, tools.seconds
+        self.first_text = None
+        self.error = None
+
+    def _split(self, elapsed: float) -> tuple:
+        model = self.model.seconds - self.model_start
+        tools = self.tools.seconds - self.tools_start
+        return elapsed, model, tools, elapsed - model - tools
+
+    def on_event(self, response_type: str, content):
+        if response_type == "text_chunk" and self.first_text is None:
+            self.first_text = self._split(time.perf_counter() - self.start)[3]
+        elif response_type == "error":
+            self.error = content
+
+    def finish(self) -> dict:
+        total, model, tools, overhead = self._split(time.perf_counter() - self.start)
+        if self.error:
+            raise RuntimeError(self.error)
+        return {"total": total, "model": model, "tools": tools, "overhead": overhead,
+                "first_text_overhead": self.first_text or 0.0}
+
+
+def _assistant(cls, recording: str, args, model: Clock):
+    stub = StubProvider.from_file(recording, first_chunk_delay=args.first_chunk_ms / 1000,
+                                  chunk_delay=args.chunk_ms / 1000)
+    assistant = cls(TimedProvider(stub, model))
+    assistant.speculator = Speculator(enabled=False)  # no warmups (network) in a benchmark
+    return assistant, session_prompts(stub)
+
+
+def run_sync(recording: str, args, model: Clock, tools: Clock) -> list:
+    assistant, prompts = _assistant(GeminiAssistant, recording, args, model)
+    turns = []
+    for prompt in prompts:
+        turn = Turn(model, tools)
+        for response_type, content in assistant.send_prompt(prompt):
+            turn.on_event(response_type, content)
+        turns.append(turn.finish())
+    return turns
+
+
+def run_async(recording: str, args, model: Clock, tools: Clock) -> list:
+    async def session():
+        assistant, prompts = _assistant(AsyncGeminiAssistant, recording, args, model)
+        turns = []
+        for prompt in prompts:
+            turn = Turn(model, tools)
+            async for response_type, content in assistant.send_prompt(prompt):
+                turn.on_event(response_type, content)
+            turns.append(turn.finish())
+        return turns
+
+    return asyncio.run(session())
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-turn overhead of the assistant against a replayed model.")
+    parser.add_argument("--recording", default=FIXTURE, help="Stub recording to replay (JSONL).")
+    parser.add_argument("--rounds", type=int, default=20, help="Replays of the whole session per mode.")
+    parser.add_argument("--first-chunk-ms", type=float, default=0.0, help="Replay delay before the first chunk.")
+    parser.add_argument("--chunk-ms", type=float, default=0.0, help="Replay delay between chunks.")
+    parser.add_argument("--modes", default="sync,async", help="Comma-separated: sync, async.")
+    parser.add_argument("--per-turn", action="store_true", help="Print the median overhead of every turn.")
+    args = parser.parse_args()
+
+    model, tools = Clock(), Clock()
+    install_fake_tools(tools)
+    runners = {"sync": run_sync, "async": run_async}
+    prompts = session_prompts(StubProvider.from_file(args.recording))
+    print(f"{len(prompts)} turns x {args.rounds} rounds from {os.path.relpath(args.recording)}, "
+          f"replay latency {args.first_chunk_ms:.0f} ms + {args.chunk_ms:.0f} ms/chunk\n")
+
+    print(f"{'mode':<7} {'':<20} {'p50 ms':>8} {'p90 ms':>8} {'max ms':>8}")
+    for mode in args.modes.split(","):
+        run = runners[mode.strip()]
+        rounds = []
+        run(args.recording, args, model, tools)  # warm-up: lazy imports, pools, caches
+        for _ in range(args.rounds):
+            rounds.append(run(args.recording, args, model, tools))
+        turns = [turn for turns in rounds for turn in turns]
+        for key in ("total", "model", "tools", "overhead", "first_text_overhead"):
+            values = [turn[key] * 1000 for turn in turns]
+            label = mode if key == "total" else ""
+            print(f"{label:<7} {key.replace('_', ' '):<20} {percentile(values, 0.5):>8.2f} "
+                  f"{percentile(values, 0.9):>8.2f} {max(values):>8.2f}")
+        if args.per_turn:
+            print(f"\n  {'turn':<5} {'overhead ms':>12}  prompt")
+            for index, prompt in enumerate(prompts):
+                median = statistics.median(turns[index]["overhead"] * 1000 for turns in rounds)
+                print(f"  {index + 1:<5} {median:>12.2f}  {prompt[:60]}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
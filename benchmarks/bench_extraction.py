@@ -0,0 +1,146 @@
+# benchmarks/bench_extraction.py
+# Offline benchmark and regression suite for the shared text extraction engine.
+#
+#   python benchmarks/bench_extraction.py                       # fixture suite (speed + output check)
+#   python benchmarks/bench_extraction.py --update-golden       # rewrite expected outputs after an intended change
+#   python benchmarks/bench_extraction.py saved_pages/          # every *.html in a directory
+#   python benchmarks/bench_extraction.py page1.html page2.html
+#   python benchmarks/bench_extraction.py --synthetic-mb 5      # no saved pages at hand
+#
+# Fixture mode runs every installed backend over benchmarks/fixtures/extraction/*.html,
+# compares the output with the matching .txt file and exits non-zero on any mismatch.
+# Page mode reports wall time, peak Python memory and output length per engine, including
+# the old BeautifulSoup path when bs4 is installed. Engines are fed 16 KiB chunks, as the
+# scraper does with a live response.
+
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from commands.webautomation.text_extraction import extract_text, EXTRACTION_BACKENDS, MAX_CONTENT_CHARS
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+CHUNK_SIZE = 16 * 1024
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "extraction")
+GOLDEN_BACKEND = "html.parser"
+
+
+def legacy_bs4_extract(html: str) -> str:
+    """The extraction web_scrapper.scrape_website_content used before the streaming engine."""
+    soup = BeautifulSoup(html, 'html.parser')
+    for script_or_style in soup(["script", "style", "header", "footer", "nav", "aside", "form"]):
+        script_or_style.extract()
+    text_elements = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'title'])
+    extracted_text = []
+    for element in text_elements:
+        cleaned_text = element.get_text(separator=' ', strip=True)
+        if cleaned_text:
+            extracted_text.append(cleaned_text)
+    full_text = "\n\n".join(extracted_text)
+    if len(full_text) > MAX_CONTENT_CHARS:
+        full_text = full_text[:MAX_CONTENT_CHARS] + "\n\n[... content truncated for length ...]"
+    return full_text
+
+
+def _chunks(html: str):
+    for start in range(0, len(html), CHUNK_SIZE):
+        yield html[start:start + CHUNK_SIZE]
+
+
+def synthetic_page(megabytes: float) -> str:
+    """A news-like page: heavy head scripts, navigation, then many article paragraphs."""
+    head = "<html><head><title>Synthetic page</title>" + "<script>" + "var x = 1;" * 20000 + "</script>"
+    head += "<style>" + "p { color: red; }" * 5000 + "</style></head><body>"
+    nav = "<nav><ul>" + "".join(f"<li><a href='/{i}'>Link {i}</a></li>" for i in range(500)) + "</ul></nav>"
+    paragraph = "<div class='row'><p>Lorem ipsum dolor sit amet, <b>consectetur</b> adipiscing elit, sed do eiusmod tempor.</p></div>\n"
+    body = []
+    size = len(head) + len(nav)
+    while size < megabytes * 1024 * 1024:
+        body.append(paragraph)
+        size += len(paragraph)
+    return head + nav + "".join(body) + "<footer><p>Footer</p></footer></body></html>"
+
+
+def _measure(func, html: str, repeat: int):
+    timings = []
+    output = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func(html)
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, output
+
+
+def run_fixture_suite(repeat: int, update_golden: bool) -> int:
+    fixtures = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+    failures = 0
+    print(f"{'fixture':<24} {'backend':<12} {'best ms':>9}  result")
+    for fixture_path in fixtures:
+        with open(fixture_path, encoding="utf-8") as f:
+            html = f.read()
+        golden_path = fixture_path[:-len(".html")] + ".txt"
+
+        if update_golden:
+            with open(golden_path, "w", encoding="utf-8") as f:
+                f.write(extract_text(_chunks(html), backend=GOLDEN_BACKEND))
+            print(f"{os.path.basename(fixture_path):<24} {GOLDEN_BACKEND:<12} {'':>9}  golden updated")
+            continue
+
+        with open(golden_path, encoding="utf-8") as f:
+            expected = f.read()
+        for backend in EXTRACTION_BACKENDS:
+            best_ms, _, output = _measure(lambda page: extract_text(_chunks(page), backend=backend), html, repeat)
+            ok = output == expected
+            failures += not ok
+            print(f"{os.path.basename(fixture_path):<24} {backend:<12} {best_ms:>9.2f}  {'ok' if ok else 'MISMATCH'}")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraped-page text extraction.")
+    parser.add_argument("paths", nargs="*", help="Saved .html files or directories containing them.")
+    parser.add_argument("--synthetic-mb", type=float, default=0, help="Also benchmark a generated page of this size.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--update-golden", action="store_true", help="Rewrite the fixture .txt files.")
+    args = parser.parse_args()
+
+    if not args.paths and not args.synthetic_mb:
+        sys.exit(run_fixture_suite(args.repeat, args.update_golden))
+
+    pages = []
+    for path in args.paths:
+        files = sorted(glob.glob(os.path.join(path, "*.html"))) if os.path.isdir(path) else [path]
+        for file_path in files:
+            with open(file_path, encoding="utf-8", errors="replace") as f:
+                pages.append((os.path.basename(file_path), f.read()))
+    if args.synthetic_mb:
+        pages.append((f"synthetic-{args.synthetic_mb:g}MB", synthetic_page(args.synthetic_mb)))
+
+    engines = {}
+    if BeautifulSoup is not None:
+        engines["bs4 full tree (before)"] = legacy_bs4_extract
+    for backend in EXTRACTION_BACKENDS:
+        engines[backend] = lambda html, backend=backend: extract_text(_chunks(html), backend=backend)
+
+    print(f"{'page':<28} {'engine':<26} {'best ms':>10} {'peak KiB':>10} {'chars':>8}")
+    for name, html in pages:
+        for engine_name, func in engines.items():
+            best_ms, peak, output = _measure(func, html, args.repeat)
+            print(f"{name[:28]:<28} {engine_name:<26} {best_ms:>10.1f} {peak / 1024:>10.0f} {len(output):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/bench_find.py
+# The find_files index (core.file_index): build and refresh times, and lookup times
+# against searching with os.walk.
+#
+#   python benchmarks/bench_find.py                      # 200,000 generated files and folders
+#   python benchmarks/bench_find.py --entries 1000000    # the 1M-entry target (several minutes to generate)
+#   python benchmarks/bench_find.py --tree /path/to/tree # index an existing tree instead (read only)
+#
+# Times, for a tree of empty files with generated names in a temporary directory:
+#   build      first refresh from an empty index
+#   refresh    a refresh with nothing changed, and after adding and removing a few files
+#   lookups    median and worst of --queries lookups per kind (substring on rare and
+#              common text, exact names, globs, misspelled names), best of three each
+#   walk       os.walk over the whole tree matching names by substring
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.file_index import FileIndex, SUBSTRING, GLOB, FUZZY
+
+WORDS = ("invoice", "report", "budget", "photo", "scan", "notes", "draft", "thesis", "backup", "export",
+         "contract", "receipt", "slides", "summary", "meeting", "travel", "project", "design", "client", "archive")
+EXTENSIONS = (".pdf", ".docx", ".xlsx", ".jpg", ".png", ".txt", ".py", ".mp3", ".zip", ".csv")
+
+
+def make_tree(root: str, entries: int, rng: random.Random, per_folder: int = 25, max_depth: int = 6) -> list:
+    """Creates entries files and folders; returns the file names."""
+    folders = [(root, 0)]
+    names = []
+    created = 0
+    while created < entries:
+        parent, depth = rng.choice(folders)
+        if rng.random() < 1 / per_folder and depth < max_depth:
+            path = os.path.join(parent, f"{rng.choice(WORDS)}_{created}")
+            os.mkdir(path)
+            folders.append((path, depth + 1))
+        else:
+            name = f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{created}{rng.choice(EXTENSIONS)}"
+            open(os.path.join(parent, name), "w").close()
+            names.append(name)
+        created += 1
+    return names
+
+
+def walk_search(root: str, text: str) -> list:
+    text = text.lower()
+    found = []
+    for folder, dir_names, file_names in os.walk(root):
+        found.extend(os.path.join(folder, name) for name in dir_names + file_names if text in name.lower())
+    return found
+
+
+def timed(func, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="find_files index: build, refresh and lookup times.")
+    parser.add_argument("--entries", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--tree", help="index this existing tree instead of generating one")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    scratch = tempfile.mkdtemp(prefix="alpha-find-")
+    try:
+        if args.tree:
+            root = os.path.abspath(args.tree)
+            names = [name for _, _, files in os.walk(root) for name in files][:100000]
+        else:
+            root = os.path.join(scratch, "tree")
+            os.mkdir(root)
+            start = time.perf_counter()
+            names = make_tree(root, args.entries, rng)
+            print(f"generated {args.entries} entries in {time.perf_counter() - start:.1f}s")
+
+        index = FileIndex([root], os.path.join(scratch, "file_index.db"))
+        start = time.perf_counter()
+        index.refresh()
+        build = time.perf_counter() - start
+        refresh = timed(index.refresh, repeat=1)
+        if not args.tree:
+            for i in range(5):
+                open(os.path.join(root, f"added_{i}.txt"), "w").close()
+        refresh_changed = timed(index.refresh, repeat=1)
+        entries = index.stats()["entries"]
+        size_mb = os.path.getsize(os.path.join(scratch, "file_index.db")) / 1e6
+        print(f"{entries} entries indexed, {size_mb:.0f} MB\n")
+        print(f"{'build':<28} {build * 1000:>10.0f} ms")
+        print(f"{'refresh (unchanged)':<28} {refresh:>10.0f} ms")
+        print(f"{'refresh (5 new files)':<28} {refresh_changed:>10.0f} ms\n")
+
+        sample = rng.sample(names, min(args.queries, len(names)))
+        numbers = [name.rsplit("_", 1)[-1].split(".")[0] for name in sample]
+        lookups = {
+            "substring (rare)": [(f"_{number}.", SUBSTRING) for number in numbers],
+            "substring (common)": [(word, SUBSTRING) for word in rng.sample(WORDS, min(args.queries, len(WORDS)))],
+            "exact name": [(name, SUBSTRING) for name in sample],
+            "glob (*.pdf style)": [(f"*{ext}", GLOB) for ext in EXTENSIONS],
+            "glob (rare)": [(f"*_{number}.*", GLOB) for number in numbers],
+            "fuzzy (one typo)": [(name[:3] + name[4] + name[3] + name[5:], FUZZY) for name in sample],
+        }
+        print(f"{'lookup':<28} {'median ms':>10} {'worst ms':>10} {'hits':>6}")
+        for label, queries in lookups.items():
+            times = [timed(index.search, query, mode) for query, mode in queries]
+            hits = sum(bool(index.search(query, mode)[1]) for query, mode in queries)
+            print(f"{label:<28} {statistics.median(times):>10.2f} {max(times):>10.2f} {hits:>3}/{len(queries)}")
+        print(f"{'os.walk substring':<28} {timed(walk_search, root, numbers[0], repeat=1):>10.2f}")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_locations.py
+# Finding "the folder named X somewhere in Documents": walking the disk against the
+# folder lookups of the core.file_index index (what core.locations.locate_folder uses).
+#
+#   python benchmarks/bench_locations.py                     # 20,000 generated folders
+#   python benchmarks/bench_locations.py --folders 100000 --lookups 200
+#
+# Builds a tree of generated folders in a temporary directory and times:
+#   walk           os.walk until a folder with the name turns up (the whole tree on a miss)
+#   scan           building the index from nothing
+#   refresh        an incremental refresh with nothing changed, and after one new folder
+#   exact / fuzzy  index lookups by exact name and by a misspelled name
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.file_index import FileIndex
+
+WORDS = ("project", "report", "invoice", "photos", "backup", "notes", "draft", "archive", "client", "music",
+         "travel", "budget", "thesis", "scans", "exports")
+
+
+def make_tree(root: str, folders: int, rng: random.Random, max_depth: int = 6) -> list:
+    parents = [(root, 0)]
+    names = []
+    while len(names) < folders:
+        parent, depth = rng.choice(parents)
+        name = f"{rng.choice(WORDS)}_{len(names)}"
+        path = os.path.join(parent, name)
+        os.mkdir(path)
+        if depth + 1 < max_depth:
+            parents.append((path, depth + 1))
+        names.append(name)
+    return names
+
+
+def walk_find(root: str, name: str):
+    for current, dir_names, _ in os.walk(root):
+        if name in dir_names:
+            return os.path.join(current, name)
+    return None
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Folder lookups: os.walk vs the core.file_index index.")
+    parser.add_argument("--folders", type=int, default=20000)
+    parser.add_argument("--lookups", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    scratch = tempfile.mkdtemp(prefix="alpha-locations-")
+    root = os.path.join(scratch, "tree")
+    os.mkdir(root)
+    try:
+        names = make_tree(root, args.folders, rng)
+        wanted = rng.sample(names, min(args.lookups, len(names)))
+        misspelled = [name[:2] + name[3:] for name in wanted]  # one letter dropped
+        index = FileIndex([root], os.path.join(scratch, "file_index.db"))
+        print(f"{len(names)} folders, {len(wanted)} lookups\n")
+
+        walk = sum(timed(walk_find, root, name) for name in wanted) / len(wanted)
+        walk_miss = timed(walk_find, root, "no such folder")
+        scan = timed(index.refresh)
+        refresh = timed(index.refresh)
+        os.mkdir(os.path.join(root, "new_folder"))
+        refresh_changed = timed(index.refresh)
+        exact = sum(timed(index.find_folders, name) for name in wanted) / len(wanted)
+        fuzzy = sum(timed(index.find_folders, name) for name in misspelled) / len(misspelled)
+        found = sum(bool(index.find_folders(name)) and index.find_folders(name)[0][1].endswith(name)
+                    for name in wanted)
+
+        print(f"{'walk (hit, mean)':<26} {walk:>10.2f} ms")
+        print(f"{'walk (miss)':<26} {walk_miss:>10.2f} ms")
+        print(f"{'scan (first build)':<26} {scan:>10.2f} ms")
+        print(f"{'refresh (unchanged)':<26} {refresh:>10.2f} ms")
+        print(f"{'refresh (one new folder)':<26} {refresh_changed:>10.2f} ms")
+        print(f"{'exact lookup (mean)':<26} {exact:>10.2f} ms   ({found}/{len(wanted)} found first)")
+        print(f"{'fuzzy lookup (mean)':<26} {fuzzy:>10.2f} ms")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
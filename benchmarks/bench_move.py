@@ -0,0 +1,67 @@
+# benchmarks/bench_move.py
+# Moving a folder across filesystems: shutil.move against commands.folder.transfer.move_tree.
+#
+#   python benchmarks/bench_move.py --target-dir /media/usb         # 200 files x 1 MB
+#   python benchmarks/bench_move.py --files 2000 --size-kb 64 --target-dir /mnt/other
+#
+# --source-dir and --target-dir should be on different filesystems (the default target,
+# /dev/shm, usually is); on the same one both sides are a single rename. The same
+# generated folder is moved there and back with each method. move_tree times include
+# fsync and checksum verification, which reads every file twice more; on a memory-backed
+# target that re-read is most of the difference (ALPHA_COPY_VERIFY=0 to leave it out).
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from commands.folder.transfer import move_tree, same_device, COPY_WORKERS
+
+
+def make_tree(root: str, files: int, size: int):
+    for index in range(files):
+        folder = os.path.join(root, f"dir{index % 10}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"file{index}.bin"), "wb") as f:
+            f.write(os.urandom(size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-filesystem folder move: shutil.move vs move_tree.")
+    parser.add_argument("--source-dir", default=tempfile.gettempdir())
+    parser.add_argument("--target-dir", default="/dev/shm")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--size-kb", type=int, default=1024)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    source = tempfile.mkdtemp(prefix="alpha-move-", dir=args.source_dir)
+    target = os.path.join(tempfile.mkdtemp(prefix="alpha-move-", dir=args.target_dir), "tree")
+    folder = os.path.join(source, "tree")
+    make_tree(folder, args.files, args.size_kb * 1024)
+    total_mb = args.files * args.size_kb / 1024
+    print(f"{args.files} files, {total_mb:.0f} MB, {args.source_dir} -> {args.target_dir} "
+          f"({'same filesystem' if same_device(folder, target) else 'different filesystems'}), "
+          f"{COPY_WORKERS} copy workers\n")
+
+    try:
+        for label, move in (("shutil.move", shutil.move), ("move_tree", move_tree)):
+            times = []
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                move(folder, target)
+                times.append(time.perf_counter() - start)
+                move(target, folder)  # back, untimed
+            best = min(times)
+            print(f"{label:<12} best {best * 1000:>8.0f} ms  {total_mb / best:>8.0f} MB/s")
+    finally:
+        shutil.rmtree(source, ignore_errors=True)
+        shutil.rmtree(os.path.dirname(target), ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# benchmarks/bench_server.py
+# Load and behaviour check for the multi-session server, against the offline stub model.
+#
+#   python benchmarks/bench_server.py                          # 8 users x 5 messages
+#   python benchmarks/bench_server.py --users 32 --messages 10 --chunk-delay 0.01
+#
+# Starts backend.server on a free local port, then every simulated user opens a session
+# and sends its messages back to back. Reported: time to first streamed line and to the
+# end of the reply (p50/p90/max), throughput, and whether every session only ever saw its
+# own conversation. It then checks the guard rails: a second message while one is
+# streaming gets 409, a burst past the rate limit gets 429, and an idle session is evicted.
+
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.model_provider import StubProvider
+from backend.server import create_server, assistant_factory, SESSION_BURST
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Client:
+    def __init__(self, port: int):
+        self.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+
+    def request(self, method: str, path: str, payload=None):
+        body = None if payload is None else json.dumps(payload)
+        self.connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+        return self.connection.getresponse()
+
+    def create_session(self) -> str:
+        response = self.request("POST", "/sessions")
+        return json.loads(response.read())["session_id"]
+
+    def send(self, session_id: str, prompt: str):
+        """Returns (status, events, seconds to first line, seconds to end)."""
+        start = time.perf_counter()
+        response = self.request("POST", f"/sessions/{session_id}/messages", {"prompt": prompt})
+        if response.status != 200:
+            response.read()
+            return response.status, [], 0.0, time.perf_counter() - start
+        events = []
+        first = None
+        for line in response:
+            if first is None:
+                first = time.perf_counter() - start
+            events.append(json.loads(line))
+        return 200, events, first or 0.0, time.perf_counter() - start
+
+
+def run_user(port: int, user: int, messages: int, results: list, lock: threading.Lock):
+    client = Client(port)
+    session_id = client.create_session()
+    own = True
+    for index in range(messages):
+        prompt = f"user {user} message {index}"
+        status, events, first, total = client.send(session_id, prompt)
+        final = events[-1] if events else {}
+        own = own and status == 200 and final.get("type") == "final_text" and prompt in final.get("text", "")
+        with lock:
+            results.append((status, first, total))
+    info = json.loads(client.request("GET", f"/sessions/{session_id}").read())
+    # One user and one model content per message, and nothing from anyone else
+    own = own and info["history_contents"] == 2 * messages and info["turns"] == messages
+    with lock:
+        results.append(("isolated", own))
+
+
+def check_guard_rails(server, port: int) -> list:
+    """Returns one report line per check."""
+    lines = []
+    client = Client(port)
+    session_id = client.create_session()
+
+    # 409: a second message while the first is still streaming
+    slow = threading.Thread(target=Client(port).send, args=(session_id, "a long " * 50))
+    slow.start()
+    time.sleep(0.1)
+    busy_status = Client(port).send(session_id, "interrupt")[0]
+    slow.join()
+    lines.append(f"concurrent message on a busy session: {busy_status} (expected 409)")
+
+    # 429: more messages than the burst allows (every request counts, so use a fresh session)
+    burst_session = client.create_session()
+    statuses = [client.send(burst_session, f"burst {i}")[0] for i in range(SESSION_BURST + 1)]
+    lines.append(f"burst of {len(statuses)} messages: {statuses} (expected a 429 at the end)")
+
+    # Idle eviction
+    server.sessions.idle_seconds = 0
+    time.sleep(0.05)
+    evicted = server.sessions.evict_idle()
+    status = client.request("GET", f"/sessions/{session_id}").status
+    lines.append(f"idle eviction: {evicted} session(s) evicted, then GET -> {status} (expected 404)")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent sessions against the stub-model server.")
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--messages", type=int, default=5, help=f"Per user (rate limit burst is {SESSION_BURST}).")
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="Stub model delay per streamed chunk (s).")
+    args = parser.parse_args()
+
+    server = create_server(assistant_factory(StubProvider(chunk_delay=args.chunk_delay)), port=0, token=None)
+    server.sessions.max_sessions = max(server.sessions.max_sessions, args.users + 1)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results, lock = [], threading.Lock()
+    start = time.perf_counter()
+    users = [threading.Thread(target=run_user, args=(port, user, args.messages, results, lock))
+             for user in range(args.users)]
+    for thread in users:
+        thread.start()
+    for thread in users:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    turns = [r for r in results if r[0] == 200]
+    failed = [r for r in results if r[0] not in (200, "isolated")]
+    isolated = all(r[1] for r in results if r[0] == "isolated")
+    first_ms = [r[1] * 1000 for r in turns]
+    total_ms = [r[2] * 1000 for r in turns]
+    print(f"{args.users} users x {args.messages} messages, stub chunk delay {args.chunk_delay * 1000:.0f} ms\n")
+    if turns:
+        print(f"{'':<14} {'p50 ms':>8} {'p90 ms':>8} {'max ms':>8}")
+        for label, values in (("first line", first_ms), ("full reply", total_ms)):
+            print(f"{label:<14} {percentile(values, 0.5):>8.0f} {percentile(values, 0.9):>8.0f} {max(values):>8.0f}")
+    print(f"\nthroughput: {len(turns) / elapsed:.1f} replies/s over {elapsed:.2f} s; failed requests: {len(failed)}")
+    print(f"sessions isolated: {'yes' if isolated else 'NO'}\n")
+
+    print("guard rails:")
+    with contextlib.redirect_stdout(io.StringIO()):
+        lines = check_guard_rails(server, port)
+    for line in lines:
+        print(f"  {line}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
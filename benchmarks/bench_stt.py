@@ -0,0 +1,129 @@
+# benchmarks/bench_stt.py
+# Replays recorded utterances through each speech-to-text backend.
+#
+#   python benchmarks/bench_stt.py recordings/                    # every installed backend
+#   python benchmarks/bench_stt.py recordings/ --backend vosk --backend google
+#   python benchmarks/bench_stt.py recordings/ --show             # print each transcript
+#
+# recordings/ holds mono 16-bit PCM *.wav files; clip.wav is scored against clip.txt when
+# that reference transcript exists. Audio is fed to the backend in microphone-sized chunks
+# as fast as the backend accepts it, then the session is finished. Reported per backend:
+#   RTF          total processing time / total audio duration (< 1 keeps up with speech)
+#   final p50/p90/max   time from the end of the audio to the final transcript, i.e. the
+#                wait after the user stops talking; streaming backends only decode the tail
+#   WER          word error rate over all clips with a reference (edits / reference words)
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice.speech_capture import WavFileSource
+from voice.stt_backends import STT_BACKENDS, get_stt_backend
+
+
+def normalize_words(text: str) -> list:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_edit_distance(reference: list, hypothesis: list) -> int:
+    """Levenshtein distance over words (substitutions + deletions + insertions)."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1]
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def replay(backend, wav_path: str):
+    """Feeds one file through a session. Returns (audio seconds, processing seconds, finish seconds, text, partials)."""
+    processing = 0.0
+    partials = 0
+    with WavFileSource(wav_path, trailing_silence=0) as source:
+        audio_seconds = source.duration
+        start = time.perf_counter()
+        session = backend.begin(source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+        processing += time.perf_counter() - start
+        while True:
+            data = source.stream.read(source.CHUNK)
+            if not data:
+                break
+            start = time.perf_counter()
+            partials += session.feed(data) is not None
+            processing += time.perf_counter() - start
+    start = time.perf_counter()
+    text = session.finish()
+    finish_seconds = time.perf_counter() - start
+    return audio_seconds, processing + finish_seconds, finish_seconds, text, partials
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speech-to-text backends on a directory of WAV files.")
+    parser.add_argument("directory", help="Directory of mono 16-bit *.wav files (with optional .txt references).")
+    parser.add_argument("--backend", action="append", choices=list(STT_BACKENDS),
+                        help="Backend to run (repeatable). Default: every backend whose engine is installed.")
+    parser.add_argument("--show", action="store_true", help="Print every transcript.")
+    args = parser.parse_args()
+
+    wav_paths = sorted(glob.glob(os.path.join(args.directory, "*.wav")))
+    if not wav_paths:
+        sys.exit(f"No .wav files in {args.directory}")
+    references = {}
+    for wav_path in wav_paths:
+        txt_path = wav_path[:-len(".wav")] + ".txt"
+        if os.path.exists(txt_path):
+            with open(txt_path, encoding="utf-8") as f:
+                references[wav_path] = normalize_words(f.read())
+
+    backends = []
+    for name in args.backend or STT_BACKENDS:
+        try:
+            backends.append(get_stt_backend(name))
+        except Exception as e:
+            print(f"skipping {name}: {e}")
+
+    print(f"{len(wav_paths)} clips, {len(references)} with reference transcripts\n")
+    print(f"{'backend':<10} {'RTF':>6} {'final p50 ms':>13} {'p90 ms':>8} {'max ms':>8} {'WER':>7} {'partials':>9} {'errors':>7}")
+    for backend in backends:
+        total_audio = total_processing = 0.0
+        finish_ms = []
+        edits = reference_words = partials = errors = 0
+        for wav_path in wav_paths:
+            try:
+                audio_seconds, processing, finish_seconds, text, clip_partials = replay(backend, wav_path)
+            except Exception as e:
+                errors += 1
+                print(f"  {backend.name}: {os.path.basename(wav_path)} failed: {e}")
+                continue
+            total_audio += audio_seconds
+            total_processing += processing
+            finish_ms.append(finish_seconds * 1000)
+            partials += clip_partials
+            if wav_path in references:
+                edits += word_edit_distance(references[wav_path], normalize_words(text))
+                reference_words += len(references[wav_path])
+            if args.show:
+                print(f"  {backend.name} {os.path.basename(wav_path)}: {text!r}")
+
+        if not finish_ms:
+            print(f"{backend.name:<10} {'-':>6} {'-':>13} {'-':>8} {'-':>8} {'-':>7} {'-':>9} {errors:>7}")
+            continue
+        rtf = total_processing / total_audio if total_audio else 0.0
+        wer = f"{edits / reference_words:.1%}" if reference_words else "-"
+        print(f"{backend.name:<10} {rtf:>6.2f} {percentile(finish_ms, 0.5):>13.0f} {percentile(finish_ms, 0.9):>8.0f} "
+              f"{max(finish_ms):>8.0f} {wer:>7} {partials:>9} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
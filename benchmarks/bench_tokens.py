@@ -0,0 +1,226 @@
+# benchmarks/bench_tokens.py
+# Prompt tokens per turn over a scripted 20-turn session, before and after function
+# responses and history compaction.
+#
+#   python benchmarks/bench_tokens.py                 # offline: scripted model and tools, estimated tokens
+#   python benchmarks/bench_tokens.py --count-tokens  # exact counts via the API's count_tokens (needs GEMINI_API_KEY)
+#   python benchmarks/bench_tokens.py --per-turn      # print every turn, not just totals
+#   python benchmarks/bench_tokens.py --budget 2000   # memory manager token budget for the "budgeted" mode
+#
+# The model and the tools are scripted, so every mode sees the same calls and the same
+# results (including ~8k-character scrape payloads). Modes:
+#   legacy       results pasted into a user text message as str(function_results), every
+#                tool turn followed by a second model call (the old GeminiAssistant)
+#   parts        GeminiAssistant with function_response parts, compaction disabled
+#   compacted    consumed large payloads replaced by summaries, no token budget
+#   budgeted     GeminiAssistant as shipped: compaction plus the memory manager's token
+#                budget (old turns rolled into a summary sent as the system instruction).
+#                Compaction alone keeps this session's history near 1,300 tokens, well
+#                under the shipped ALPHA_MEMORY_TOKEN_BUDGET, so the benchmark defaults to a
+#                budget (BENCH_BUDGET) the session exceeds; the turns rolled into the summary
+#                and the payloads evicted are reported after the totals.
+# A turn's cost is the sum of the prompt tokens of every model call it makes, since the
+# whole history is re-sent on each call.
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.genai import types
+
+from backend.assistant_core import GeminiAssistant
+from backend.history import estimate_tokens
+from backend.memory import MemoryManager
+from backend.model_provider import GeminiProvider, StubProvider
+from core.speculation import Speculator
+
+
+BENCH_BUDGET = 800  # tokens; the compacted session goes over it at turns 13 and 19
+
+
+def _page(topic: str, chars: int = 8000) -> str:
+    sentence = f"This paragraph of the {topic} page is the kind of body text a scrape returns. "
+    return (sentence * (chars // len(sentence) + 1))[:chars]
+
+
+def _scrape(url: str, topic: str) -> dict:
+    return {"success": True, "url": url, "content": _page(topic)}
+
+
+# (prompt, [(tool name, args, result), ...], reply text). No tools: the reply is plain text.
+SESSION = [
+    ("Hi, what can you do?", [], "I can manage folders, create files and websites, and read web pages for you."),
+    ("Create a folder called reports on my desktop",
+     [("create_folder", {"folder_names": ["reports"], "location": "desktop"},
+       {"created": ["/home/user/Desktop/reports"]})], ""),
+    ("Summarize https://example.com/news",
+     [("scrape_website_content", {"url": "https://example.com/news"}, _scrape("https://example.com/news", "news"))],
+     "The news page covers three stories: a product launch, an outage report and a hiring update."),
+    ("Which of those stories is the most recent?", [], "The outage report is dated most recently."),
+    ("Make folders alpha, beta and gamma in documents",
+     [("create_folder", {"folder_names": ["alpha", "beta", "gamma"], "location": "documents"},
+       {"created": ["/home/user/Documents/alpha", "/home/user/Documents/beta", "/home/user/Documents/gamma"]})], ""),
+    ("Compare https://example.org/pricing and https://example.net/pricing",
+     [("scrape_websites_content", {"urls": ["https://example.org/pricing", "https://example.net/pricing"]},
+       {"results": [_scrape("https://example.org/pricing", "org pricing"),
+                    _scrape("https://example.net/pricing", "net pricing")]})],
+     "example.org is cheaper for small teams; example.net includes support in every plan."),
+    ("Thanks. Rename beta to beta-old",
+     [("rename_folders", {"renames": [{"old_name": "beta", "new_name": "beta-old"}], "location": "documents"},
+       ["✅ Renamed 'beta' to 'beta-old'"])], ""),
+    ("What's trending on YouTube?",
+     [("open_youtube_trending", {}, {"success": True, "message": "Opened YouTube trending."})], ""),
+    ("Check the latest GEHU notice",
+     [("open_gehu_btech_notice_and_return_content", {}, _scrape("https://gehu.ac.in/notice", "notice"))],
+     "The latest notice announces the mid-term examination schedule."),
+    ("When do the exams start?", [], "According to the notice, the exams start next Monday."),
+    ("Write a python script that prints the first ten primes",
+     [("create_python_file", {"file_name": "primes.py", "description": "print the first ten primes"},
+       {"success": True, "message": "Created primes.py on the Desktop."})], ""),
+    ("Summarize https://example.com/blog",
+     [("scrape_website_content", {"url": "https://example.com/blog"}, _scrape("https://example.com/blog", "blog"))],
+     "The blog post explains how the team reduced build times by caching dependencies."),
+    ("Delete the gamma folder",
+     [("delete_folders", {"folder_names": ["gamma"], "location": "documents"}, ["✅ Deleted 'gamma'"])], ""),
+    ("Move alpha to the desktop",
+     [("move_folders", {"folder_names": ["alpha"], "source": "documents", "destination": "desktop"},
+       ["✅ Moved 'alpha' to desktop"])], ""),
+    ("What did the first news story say again?", [], "It was about a product launch planned for next quarter."),
+    ("Build me a simple portfolio website",
+     [("create_website", {"description": "simple portfolio"},
+       {"website_creation": {"success": True, "message": "Website created at /home/user/Desktop/portfolio."}})],
+     ""),
+    ("Open it", [("open_website", {"index_html_path": "/home/user/Desktop/portfolio/index.html"},
+                  {"success": True, "message": "Opened the website."})], ""),
+    ("Read https://example.com/docs and tell me how to install",
+     [("scrape_website_content", {"url": "https://example.com/docs"}, _scrape("https://example.com/docs", "docs"))],
+     "Install it with pip, then run the setup command from the project directory."),
+    ("Great, create a folder named install-notes",
+     [("create_folder", {"folder_names": ["install-notes"], "location": "desktop"},
+       {"created": ["/home/user/Desktop/install-notes"]})], ""),
+    ("That's all, thanks!", [], "You're welcome!"),
+]
+
+
+# --- Scripted model ---
+def _recording() -> list:
+    """SESSION as a stub recording: one chunk per function_call, the reply one word per chunk."""
+    exchanges = []
+    for _, tools, reply in SESSION:
+        if tools:
+            exchanges.append({"chunks": [[{"function_call": {"name": name, "args": args}}] for name, args, _ in tools]})
+        if reply:
+            exchanges.append({"chunks": [[{"text": word + " "}] for word in reply.split()]})
+    return exchanges
+
+
+class ScriptedProvider(StubProvider):
+    """Replays SESSION in order, without latency, and records what each call was sent."""
+
+    def __init__(self, counter):
+        super().__init__(_recording(), first_chunk_delay=0, chunk_delay=0)
+        self._counter = counter
+        self.calls = []  # prompt tokens of every stream() call
+
+    def stream(self, contents, config=None):
+        instruction = (config or {}).get("system_instruction")
+        instruction_tokens = self._counter([types.Content(role="user", parts=[types.Part(text=instruction)])]) if instruction else 0
+        self.calls.append(self._counter(contents) + instruction_tokens)
+        return super().stream(contents, config)
+
+
+def _scripted_router(tools: list):
+    results = {name: result for name, _, result in tools}
+    return lambda function_calls: [{"name": call.name, "result": results[call.name]} for call in function_calls]
+
+
+# --- Modes ---
+def run_assistant(counter, compact: bool, budget: float = float("inf")):
+    """Prompt tokens per turn for GeminiAssistant with the scripted model and tools, and its turn metrics."""
+    provider = ScriptedProvider(counter)
+    assistant = GeminiAssistant(provider)
+    assistant.speculator = Speculator(enabled=False)  # no warmups (network) in a benchmark
+    assistant.memory = MemoryManager(token_budget=budget)
+    if not compact:
+        assistant.compact_threshold = float("inf")
+    per_turn = []
+    for prompt, tools, reply in SESSION:
+        assistant.route_function_calls = _scripted_router(tools)
+        calls_before = len(provider.calls)
+        events = list(assistant.send_prompt(prompt))
+        if events[-1][0] == "error":
+            raise RuntimeError(events[-1][1])
+        per_turn.append(sum(provider.calls[calls_before:]))
+    return per_turn, assistant.turn_metrics
+
+
+def run_legacy(counter) -> list:
+    """The old chat flow: str(results) in a user message and a second model call per tool turn."""
+    history = []
+    per_turn = []
+    for prompt, tools, reply in SESSION:
+        history.append(types.Content(role="user", parts=[types.Part(text=prompt)]))
+        tokens = counter(history)
+        if not tools:
+            history.append(types.Content(role="model", parts=[types.Part(text=reply)]))
+        else:
+            history.append(types.Content(role="model", parts=[
+                types.Part(function_call=types.FunctionCall(name=name, args=args)) for name, args, _ in tools]))
+            function_results = [{"name": name, "result": result} for name, _, result in tools]
+            message = "Function Results: " + str(function_results) + " So, draft a small confirming message."
+            history.append(types.Content(role="user", parts=[types.Part(text=message)]))
+            tokens += counter(history)
+            history.append(types.Content(role="model", parts=[types.Part(text=reply or "Done.")]))
+        per_turn.append(tokens)
+    return per_turn
+
+
+def api_counter():
+    return GeminiProvider().count_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt tokens per turn over a scripted 20-turn session.")
+    parser.add_argument("--count-tokens", action="store_true",
+                        help="Count with the API's count_tokens instead of the ~4 chars/token estimate.")
+    parser.add_argument("--per-turn", action="store_true", help="Print every turn.")
+    parser.add_argument("--budget", type=int, default=BENCH_BUDGET,
+                        help=f"Memory token budget for the budgeted mode (default {BENCH_BUDGET}).")
+    args = parser.parse_args()
+
+    counter = api_counter() if args.count_tokens else estimate_tokens
+    budgeted, turn_metrics = run_assistant(counter, compact=True, budget=args.budget)
+    modes = {
+        "legacy": run_legacy(counter),
+        "parts": run_assistant(counter, compact=False)[0],
+        "compacted": run_assistant(counter, compact=True)[0],
+        "budgeted": budgeted,
+    }
+
+    print(f"{len(SESSION)} turns, prompt tokens {'(count_tokens)' if args.count_tokens else '(estimated)'}\n")
+    if args.per_turn:
+        print(f"{'turn':>4} " + " ".join(f"{name:>10}" for name in modes) + f" {'rolled':>7} {'evicted':>7}  prompt")
+        for index, (prompt, _, _) in enumerate(SESSION):
+            metrics = turn_metrics[index]
+            print(f"{index + 1:>4} " + " ".join(f"{modes[name][index]:>10}" for name in modes) +
+                  f" {metrics['rolled_turns']:>7} {metrics['evicted_payloads']:>7}  {prompt[:40]}")
+        print()
+    baseline = sum(modes["legacy"])
+    print(f"{'mode':<10} {'total':>9} {'mean/turn':>10} {'last turn':>10} {'vs legacy':>10}")
+    for name, per_turn in modes.items():
+        print(f"{name:<10} {sum(per_turn):>9} {sum(per_turn) / len(per_turn):>10.0f} {per_turn[-1]:>10} "
+              f"{sum(per_turn) / baseline:>10.1%}")
+
+    over_budget = [index + 1 for index, metrics in enumerate(turn_metrics)
+                   if metrics["history_tokens_before"] > args.budget]
+    print(f"\nbudgeted, {args.budget} tokens: over budget before {len(over_budget)} of {len(SESSION)} turns"
+          f"{' (from turn %d)' % over_budget[0] if over_budget else ''}; "
+          f"{sum(m['rolled_turns'] for m in turn_metrics)} turns rolled into the summary, "
+          f"{sum(m['evicted_payloads'] for m in turn_metrics)} payloads evicted, "
+          f"summary {turn_metrics[-1]['summary_tokens']} tokens after the last turn")
+
+
+if __name__ == "__main__":
+    main()
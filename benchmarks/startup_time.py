@@ -0,0 +1,122 @@
+# benchmarks/startup_time.py
+# Startup import cost: the eager command registry against the lazy one, and the two
+# entry points (main_script.py, gui/main.py) as of a baseline commit against this tree.
+#
+#   python benchmarks/startup_time.py [--runs 10]
+#   python benchmarks/startup_time.py --baseline <commit>   # default: the repository's first commit
+#
+# Every scenario runs in a fresh interpreter so module caches don't leak between runs.
+# An entry point's scenario is its own top-level imports, read from the file in each tree,
+# so it follows whatever the entry point imports at that commit. The baseline tree is
+# exported with git archive into a temporary directory. Scenarios whose imports are not
+# installed (e.g. PyQt5, or packages only the baseline used) are reported as skipped.
+
+import argparse
+import ast
+import io
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = ("main_script.py", "gui/main.py")
+
+REGISTRY_SCENARIOS = {
+    # What commands/command_registry.py used to do: import every implementation module.
+    "eager registry (before)": (
+        "from commands.manifest import COMMAND_MANIFEST\n"
+        "import importlib\n"
+        "for entry in COMMAND_MANIFEST.values():\n"
+        "    importlib.import_module(entry['module'])\n"
+    ),
+    # What the entry points now do before the first prompt.
+    "lazy registry (after)": (
+        "from commands.command_registry import executable_functions, function_declarations\n"
+    ),
+}
+
+
+def _entry_imports(tree: str, entry_point: str):
+    """The entry point's module-level import statements as code, or None if the file doesn't exist."""
+    path = os.path.join(tree, entry_point)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        module = ast.parse(f.read())
+    return "".join(ast.unparse(node) + "\n" for node in module.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def _export_tree(rev: str, target: str):
+    archive = subprocess.run(["git", "archive", rev], cwd=PROJECT_ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+
+
+def _first_commit() -> str:
+    revs = subprocess.run(["git", "rev-list", "--max-parents=0", "HEAD"], cwd=PROJECT_ROOT,
+                          capture_output=True, text=True, check=True).stdout.split()
+    return revs[-1]
+
+
+def _time_scenario(code: str, runs: int, cwd: str = PROJECT_ROOT) -> list:
+    timings = []
+    timer = (
+        "import time\n"
+        "_start = time.perf_counter()\n"
+        f"{code}"
+        "print((time.perf_counter() - _start) * 1000)\n"
+    )
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", timer],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            last_line = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "unknown error"
+            raise RuntimeError(last_line)
+        timings.append(float(completed.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def _report(name: str, code: str, runs: int, cwd: str = PROJECT_ROOT):
+    try:
+        timings = _time_scenario(code, runs, cwd)
+        print(f"{name:<44} {statistics.median(timings):>10.1f} {min(timings):>10.1f}")
+    except RuntimeError as e:
+        print(f"{name:<44} {'skipped':>10}  ({e})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure startup import time of the command registry and entry points.")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters per scenario.")
+    parser.add_argument("--baseline", help="Commit to compare the entry points against (default: the first commit).")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="alpha-startup-")
+    try:
+        baseline = args.baseline or _first_commit()
+        _export_tree(baseline, scratch)
+
+        print(f"{'scenario':<44} {'median ms':>10} {'min ms':>10}")
+        for name, code in REGISTRY_SCENARIOS.items():
+            _report(name, code, args.runs)
+        for entry_point in ENTRY_POINTS:
+            for label, tree in ((f"baseline {baseline[:7]}", scratch), ("this tree", PROJECT_ROOT)):
+                name = f"{entry_point} imports ({label})"
+                code = _entry_imports(tree, entry_point)
+                if code is None:
+                    print(f"{name:<44} {'skipped':>10}  (no such file)")
+                else:
+                    _report(name, code, args.runs, tree)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
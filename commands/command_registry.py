@@ -1,22 +1,51 @@
-from commands.folder.create import create_folder
-from commands.folder.delete import delete_folders
-from commands.folder.move import move_folders
-from commands.folder.rename import rename_folders
-from commands.files.create_python_file import create_python_file
-from commands.website.create_website import create_website
-from commands.website.open_website import open_website
-from commands.webautomation.youtube_Automation import open_youtube_trending
-from commands.webautomation.web_scrapper import scrape_website_content
-from commands.webautomation.gehu_Automation import open_gehu_btech_notice_and_return_content
-executable_functions = {
-    "create_folder": create_folder,
-    "delete_folders": delete_folders,
-    "move_folders": move_folders,
-    "rename_folders": rename_folders,
-    "create_python_file": create_python_file,
-    "create_website": create_website,
-    "open_website": open_website,
-    "open_youtube_trending": open_youtube_trending,
-    "scrape_website_content": scrape_website_content,
-    "open_gehu_btech_notice_and_return_content": open_gehu_btech_notice_and_return_content
-}
+import importlib
+import threading
+from collections.abc import Mapping
+
+from commands.manifest import COMMAND_MANIFEST
+
+
+class CommandRegistry(Mapping):
+    """
+    Maps command names to their implementations, importing each command's module
+    only the first time it is looked up. Schemas come from the manifest, so listing
+    the available tools never imports selenium, bs4, requests or google.genai.
+    """
+
+    def __init__(self, manifest: dict):
+        self._manifest = manifest
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        func = self._loaded.get(name)
+        if func is not None:
+            return func
+
+        entry = self._manifest[name]  # KeyError for unknown commands, as with a plain dict
+        with self._lock:
+            if name not in self._loaded:
+                module = importlib.import_module(entry["module"])
+                self._loaded[name] = getattr(module, entry["function"])
+        return self._loaded[name]
+
+    def __contains__(self, name):
+        # Overridden so membership checks don't trigger an import
+        return name in self._manifest
+
+    def __iter__(self):
+        return iter(self._manifest)
+
+    def __len__(self):
+        return len(self._manifest)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def function_declarations(self) -> list:
+        """Returns the schema of every registered command, for building the model's tools."""
+        return [entry["schema"] for entry in self._manifest.values()]
+
+
+executable_functions = CommandRegistry(COMMAND_MANIFEST)
+function_declarations = executable_functions.function_declarations()
@@ -1,68 +1,71 @@
 import os
-import re
-from google import genai
-from google.genai import types
+import threading
+from backend.model_provider import get_model_provider
+from commands.manifest import create_python_file_schema_dict
+from core.locations import resolve_location, unknown_location_message
 
-def create_python_file(filename: str, code_prompt: str, location: str) -> str:
-    base_user_path = r"C:\Users\aryav"
-    valid_locations = {"Desktop", "Documents", "Downloads", "Pictures"}
 
-    # if location not in valid_locations:
-    #     return f"❌ Invalid location '{location}'. Choose from: {', '.join(valid_locations)}"
+def _code_lines(text_chunks):
+    """
+    Turns streamed model text into lines of code as they complete: markdown fence lines
+    (```python / ```) are dropped, as are leading and trailing blank lines.
+    """
+    pending_blank = 0  # blank lines held back until more code follows them
+    started = False
+    buffer = ""
+
+    def emit(line):
+        nonlocal pending_blank, started
+        if line.strip().startswith("```"):
+            return
+        if not line.strip():
+            if started:
+                pending_blank += 1
+            return
+        yield from ["\n"] * pending_blank
+        pending_blank = 0
+        started = True
+        yield line + "\n"
+
+    for text in text_chunks:
+        buffer += text
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield from emit(line.rstrip("\r"))
+    yield from emit(buffer.rstrip("\r"))
+
+
+def create_python_file(filename: str, code_prompt: str, location: str) -> str:
+    location_path = resolve_location(location)
+    if location_path is None:
+        return unknown_location_message(location)
 
     if not filename.endswith(".py"):
         filename += ".py"
 
-    file_path = os.path.join(base_user_path, location, filename)
+    file_path = os.path.join(location_path, filename)
     code_prompt += " JUST GIVE PYTHON CODE WITH MAIN FUNCTION AND WRITE EVERYTHING EXTRA IN COMMENTS"
 
+    # Code is written as it streams in, next to the target; the file only appears under
+    # its real name once generation has finished
+    temp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=[code_prompt]
-        )
+        # The shared provider: one client and connection pool for every command
+        chunks = get_model_provider().stream([code_prompt])
+        written = False
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for line in _code_lines(chunk.text for chunk in chunks if chunk.text):
+                f.write(line)
+                written = True
 
-        if response.text:
-            generated_code = response.text
-
-            # Remove ```python and ``` markers using regular expressions
-            cleaned_code = re.sub(r"^\s*```(?:python)?\s*", "", generated_code, flags=re.MULTILINE)
-            cleaned_code = re.sub(r"\s*```\s*$", "", cleaned_code, flags=re.MULTILINE)
-
-            # Remove leading/trailing empty lines
-            cleaned_code = cleaned_code.strip()
-
-            with open(file_path, "w") as f:
-                f.write(cleaned_code)
+        if written:
+            os.replace(temp_path, file_path)
             return f"✅ Python file '{filename}' created at {location} with generated code."
         else:
+            os.remove(temp_path)
             return "❌ Error: No code generated."
 
     except Exception as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
         return f"❌ Failed to generate and create Python file: {e}"
-
-
-create_python_file_schema_dict = {
-    "name": "create_python_file",
-    "description": "Generates Python code based on a prompt and creates a Python file with the generated code.",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "filename": {
-                "type": "string",
-                "description": "Name of the Python file to create (without the .py extension)."
-            },
-            "code_prompt": {
-                "type": "string",
-                "description": "The prompt describing the Python code to generate."
-            },
-            "location": {
-                "type": "string",
-                "description": "Location where the file should be created (e.g., 'Desktop', 'Documents')."
-            }
-        },
-        "required": ["filename", "code_prompt", "location"]
-    }
-}
-
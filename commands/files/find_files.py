@@ -0,0 +1,51 @@
+# commands/files/find_files.py
+import os
+import time
+from commands.manifest import find_files_schema_dict
+from core.file_index import get_file_index, SUBSTRING, GLOB, FUZZY
+from core.locations import resolve_location, location_names, display_path
+
+MAX_RESULTS = 100
+_MATCH_MODES = {"auto": None, "substring": SUBSTRING, "glob": GLOB, "fuzzy": FUZZY}
+
+
+def find_files(query: str, location: str = None, kind: str = "any", match: str = "auto", limit: int = 20) -> dict:
+    """Looks files and folders up by name in the background file index (see core.file_index)."""
+    if not query or not query.strip():
+        return {"success": False, "message": "A name or pattern to search for is required."}
+    if match not in _MATCH_MODES:
+        return {"success": False, "message": f"Unknown match '{match}'. Choose from: {', '.join(_MATCH_MODES)}"}
+    if kind not in ("any", "file", "folder"):
+        return {"success": False, "message": f"Unknown kind '{kind}'. Choose from: any, file, folder"}
+
+    within = None
+    if location:
+        within = resolve_location(location)
+        if within is None:
+            return {"success": False, "message": f"Invalid location '{location}'. Choose from: {', '.join(location_names())}"}
+
+    limit = max(1, min(int(limit), MAX_RESULTS))
+    index = get_file_index()
+    start = time.perf_counter()
+    mode, rows, capped = index.search(query, _MATCH_MODES[match], kind, within, limit)
+    elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+    stats = index.stats()
+    note = "" if stats["complete"] else " The file index is still being built, so results may be incomplete."
+
+    if not rows:
+        where = f" in {location}" if location else ""
+        return {"success": False, "message": f"Nothing named like '{query}' found{where}.{note}", "elapsed_ms": elapsed_ms}
+
+    matches = [{
+        "path": path,
+        "name": name,
+        "type": "folder" if is_dir else "file",
+        "location": display_path(os.path.dirname(path)),  # usable as the location of the folder commands
+        "size": size,
+        "modified": time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime)),
+    } for path, name, is_dir, size, mtime in rows]
+    result = {"success": True, "query": query, "match": mode, "matches": matches,
+              "more": capped or len(matches) == limit, "elapsed_ms": elapsed_ms, "indexed_entries": stats["entries"]}
+    if note:
+        result["note"] = note.strip()
+    return result
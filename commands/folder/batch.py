@@ -0,0 +1,285 @@
+# commands/folder/batch.py
+# One engine behind create_folder, delete_folders, move_folders, rename_folders and
+# restore_folders.
+# A batch is planned before anything touches the disk: conflicts are rejected (two
+# operations producing the same folder, a folder moved into itself, a folder used
+# after an earlier operation already moved or deleted it) and repeated requests are
+# skipped. Operations whose paths overlap are chained and run in the order given;
+# independent chains run in parallel on a thread pool.
+#
+# With atomic=True the batch is all-or-nothing: if anything is rejected, nothing runs,
+# and if an operation fails, the ones that already ran are undone in reverse order.
+# Deletes move folders to the trash (commands.folder.trash), so they are undone like
+# any other rename.
+#
+# run_batch() returns {"success", "rolled_back", "elapsed_ms", "results"}, with one
+# result per operation, in input order: {"op", "name", "source", "target", "status",
+# "message", "elapsed_ms"}. status is "done", "duplicate" (a repeat of an earlier
+# operation), "invalid" (the command could not make sense of the request), "conflict",
+# "failed", "skipped" (not run: an atomic batch failed) or "rolled_back". The batch
+# succeeded when every operation is done or a duplicate.
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from commands.folder import trash
+from commands.folder.transfer import move_tree
+
+FOLDER_WORKERS = int(os.getenv("ALPHA_FOLDER_WORKERS", "8"))  # chains of operations run at once
+
+CREATE, DELETE, MOVE, RENAME, RESTORE = "create", "delete", "move", "rename", "restore"
+_VERBS = {CREATE: ("create", "created"), DELETE: ("delete", "deleted"), MOVE: ("move", "moved"),
+          RENAME: ("rename", "renamed"), RESTORE: ("restore", "restored")}
+
+_folder_executor = ThreadPoolExecutor(max_workers=FOLDER_WORKERS, thread_name_prefix="alpha-folder")
+
+
+class _Refused(OSError):
+    """A precondition that failed before anything changed; the message is shown as is."""
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class FolderOperation:
+    """
+    One step of a batch. create needs target, delete needs source, move and rename
+    need both; restore needs the trash entry_id, with source its path in the trash and
+    target where it goes back to. name and where only appear in messages ("'reports'",
+    "Desktop").
+    done_message overrides the default success message. A request the command could
+    not turn into paths is passed with invalid=<message>, so it keeps its place in the
+    results (and stops an atomic batch).
+    """
+
+    def __init__(self, op: str, name: str, source: str = None, target: str = None, where: str = "",
+                 done_message: str = None, invalid: str = None, entry_id: str = None):
+        if op not in _VERBS:
+            raise ValueError(f"Unknown folder operation '{op}'.")
+        self.op = op
+        self.name = name
+        self.source = source
+        self.target = target
+        self.where = where
+        self.done_message = done_message
+        self.invalid = invalid
+        self.entry_id = entry_id
+        # Set while running: what undo() needs
+        self._created_root = None
+        self._trashed = None
+
+    def paths(self) -> list:
+        return [path for path in (self.source, self.target) if path]
+
+    def result(self, status: str, message: str, elapsed_ms: float = 0.0) -> dict:
+        return {"op": self.op, "name": self.name, "source": self.source, "target": self.target,
+                "status": status, "message": message, "elapsed_ms": elapsed_ms}
+
+    # --- Running ---
+    def run(self) -> str:
+        """Performs the operation; returns its success message or raises OSError."""
+        if self.op == CREATE:
+            if os.path.isdir(self.target):
+                return f"✅ Folder '{self.name}' already exists in {self.where}."
+            self._created_root = self._first_missing(self.target)
+            os.makedirs(self.target)
+        elif self.op == DELETE:
+            if not os.path.isdir(self.source):
+                raise _Refused(f"Folder '{self.name}' does not exist at {self.where}.")
+            self._trashed = trash.trash_folder(self.source)
+        elif self.op == RESTORE:
+            try:
+                trash.restore(self.entry_id, self.target)
+            except OSError as e:
+                raise _Refused(f"Cannot restore '{self.name}': {e}.")
+        else:
+            if not os.path.isdir(self.source):
+                raise _Refused(f"Folder '{self.name}' not found at {self.where}.")
+            if os.path.exists(self.target):
+                # os.rename would replace an empty folder and shutil.move would nest inside it
+                raise _Refused(f"Cannot {self.op} '{self.name}': '{os.path.basename(self.target)}' already exists there.")
+            if self.op == RENAME:
+                os.rename(self.source, self.target)
+            else:
+                # A rename on the same drive; a verified parallel copy with progress events across drives
+                move_tree(self.source, self.target, name=self.name)
+        if self.done_message:
+            return self.done_message
+        return f"✅ Folder '{self.name}' {_VERBS[self.op][1]}" + (f" ({self.where})." if self.where else ".")
+
+    @staticmethod
+    def _first_missing(path: str) -> str:
+        """The outermost folder makedirs(path) is about to create."""
+        missing = path
+        parent = os.path.dirname(path)
+        while parent and parent != missing and not os.path.exists(parent):
+            missing, parent = parent, os.path.dirname(parent)
+        return missing
+
+    def undo(self):
+        if self.op == CREATE:
+            if self._created_root is None:
+                return  # it already existed
+            # rmdir, not rmtree: only ever remove folders that are still empty
+            path = self.target
+            while True:
+                os.rmdir(path)
+                if _key(path) == _key(self._created_root):
+                    break
+                path = os.path.dirname(path)
+        elif self.op == DELETE:
+            trash.restore(self._trashed["id"], self.source)
+        elif self.op == RESTORE:
+            entry = trash.trash_folder(self.target)
+            self.entry_id, self.source = entry["id"], entry["trash_path"]
+        elif self.op == RENAME:
+            os.rename(self.target, self.source)
+        else:
+            move_tree(self.target, self.source, name=self.name)
+
+
+def plan(operations: list):
+    """
+    Returns (chains, rejected): chains are lists of operation indexes that must run
+    in order; rejected maps an index to its "invalid"/"conflict"/"duplicate" result.
+    """
+    rejected = {}
+    seen = set()
+    produced = {}  # path -> index of the operation that creates it
+    consumed = {}  # path -> index of the operation that moved or deleted it
+    for index, operation in enumerate(operations):
+        if operation.invalid:
+            rejected[index] = operation.result("invalid", operation.invalid)
+            continue
+        source = _key(operation.source) if operation.source else None
+        target = _key(operation.target) if operation.target else None
+        identity = (operation.op, source, target)
+        if identity in seen:
+            rejected[index] = operation.result("duplicate", f"⏭️ '{operation.name}' was requested twice; done once.")
+            continue
+        reason = None
+        if source and source in consumed:
+            reason = f"an earlier operation already {_VERBS[operations[consumed[source]].op][1]} it"
+        elif source and target and source == target:
+            reason = "the source and the destination are the same folder"
+        elif source and target and target.startswith(source + os.sep):
+            reason = "a folder cannot be moved into itself"
+        elif target and target in produced:
+            reason = f"'{operations[produced[target]].name}' is already going there"
+        if reason:
+            verb = _VERBS[operation.op][0]
+            rejected[index] = operation.result("conflict", f"❌ Cannot {verb} '{operation.name}': {reason}.")
+            continue
+        seen.add(identity)
+        if source:
+            consumed[source] = index
+            produced.pop(source, None)
+        if target:
+            produced[target] = index
+            consumed.pop(target, None)
+
+    # Chain operations whose paths are equal or nested (union-find over path ancestors)
+    accepted = [index for index in range(len(operations)) if index not in rejected]
+    parent = {index: index for index in accepted}
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    owners = {}  # path -> an operation touching it
+    for index in accepted:
+        for path in operations[index].paths():
+            owners.setdefault(_key(path), index)
+    for index in accepted:
+        for path in operations[index].paths():
+            path = _key(path)
+            while True:
+                owner = owners.get(path)
+                if owner is not None:
+                    parent[find(owner)] = find(index)
+                parent_path = os.path.dirname(path)
+                if parent_path == path:
+                    break
+                path = parent_path
+
+    chains = {}
+    for index in accepted:
+        chains.setdefault(find(index), []).append(index)
+    return list(chains.values()), rejected
+
+
+def run_batch(operations: list, atomic: bool = False) -> dict:
+    """Plans and runs operations (see the header). Safe to call from several threads."""
+    start = time.perf_counter()
+    operations = list(operations)
+    chains, rejected = plan(operations)
+    results = [rejected.get(index) for index in range(len(operations))]
+
+    if atomic and any(result["status"] in ("invalid", "conflict") for result in rejected.values()):
+        for chain in chains:
+            for index in chain:
+                operation = operations[index]
+                results[index] = operation.result(
+                    "skipped", f"⏭️ '{operation.name}' was not {_VERBS[operation.op][1]}: another request in the batch was rejected.")
+        chains = []
+
+    failed = threading.Event()
+    journal = []  # indexes in the order they completed
+    lock = threading.Lock()
+
+    def run_chain(chain):
+        for index in chain:
+            operation = operations[index]
+            if atomic and failed.is_set():
+                result = operation.result(
+                    "skipped", f"⏭️ '{operation.name}' was not {_VERBS[operation.op][1]}: another operation failed.")
+            else:
+                op_start = time.perf_counter()
+                try:
+                    message = operation.run()
+                    status = "done"
+                except _Refused as e:
+                    message, status = f"❌ {e}", "failed"
+                    failed.set()
+                except OSError as e:
+                    message = f"❌ Failed to {_VERBS[operation.op][0]} folder '{operation.name}': {e}"
+                    status = "failed"
+                    failed.set()
+                result = operation.result(status, message, round((time.perf_counter() - op_start) * 1000, 2))
+                if status == "done":
+                    with lock:
+                        journal.append(index)
+            results[index] = result
+
+    if len(chains) == 1:
+        run_chain(chains[0])  # no pool round trip for the common single-chain batch
+    elif chains:
+        for future in [_folder_executor.submit(run_chain, chain) for chain in chains]:
+            future.result()
+
+    rolled_back = False
+    if atomic and failed.is_set():
+        rolled_back = True
+        for index in reversed(journal):
+            operation = operations[index]
+            result = results[index]
+            try:
+                operation.undo()
+                result["status"] = "rolled_back"
+                result["message"] = (f"↩️ '{operation.name}' was not {_VERBS[operation.op][1]}: "
+                                     "another operation failed, so it was undone.")
+            except OSError as e:
+                rolled_back = False
+                result["message"] += f" (could not be undone: {e})"
+
+    return {
+        "success": all(result["status"] in ("done", "duplicate") for result in results),
+        "rolled_back": rolled_back,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+        "results": results,
+    }
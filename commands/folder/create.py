@@ -1,44 +1,27 @@
 import os
+from commands.manifest import create_folder_schema_dict
+from commands.folder.batch import FolderOperation, run_batch, CREATE
+from core.locations import resolve_location, location_names, _within
 
-def create_folder(location: str, folder_names: list):
-    """Creates multiple folders in the specified location."""
+def create_folder(location: str, folder_names: list, all_or_nothing: bool = True):
+    """Creates multiple folders in the specified location (all of them or, by default, none)."""
 
-    user_home = os.path.expanduser("~")
-    target_path = os.path.join(user_home, location)
-    created_folders = []
+    target_path = resolve_location(location)
 
-    if not os.path.isdir(target_path):
-        return f"Error: Location '{location}' not found under user directory."
+    if target_path is None:
+        return f"Error: Location '{location}' not found under user directory. Choose from: {', '.join(location_names())}"
 
+    operations = []
     for folder_name in folder_names:
-        new_folder_path = os.path.join(target_path, folder_name)
-        try:
-            os.makedirs(new_folder_path, exist_ok=True)
-            created_folders.append(new_folder_path)
-        except Exception as e:
-            return f"Error creating folder '{folder_name}': {e}"
-    return {"created": created_folders}
-
-
-create_folder_schema_dict = {
-    "name": "create_folder",
-    "description": "Creates one or more folders inside a known user directory like Desktop or Documents.",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "location": {
-                "type": "string",
-                "description": "Target location under the user directory (e.g., 'Desktop', 'Documents')."
-            },
-            "folder_names": {
-                "type": "array",
-                "items": {
-                    "type": "string",
-                    "description": "Name of a folder to create."
-                },
-                "description": "An array of folder names to create."
-            }
-        },
-        "required": ["location", "folder_names"]
-    }
-}
\ No newline at end of file
+        folder_name = str(folder_name).strip()
+        target = os.path.normpath(os.path.join(target_path, folder_name))
+        # A name, not a path: "../x" or an absolute path would land outside the location
+        if (not folder_name or any(sep in folder_name for sep in "/\\") or folder_name in (".", "..")
+                or os.path.isabs(folder_name) or not _within(target, target_path) or target == target_path):
+            operations.append(FolderOperation(CREATE, folder_name, invalid=f"❌ Invalid folder name '{folder_name}': give a name, not a path."))
+            continue
+        operations.append(FolderOperation(CREATE, folder_name, target=target, where=location,
+                                          done_message=f"✅ Folder '{folder_name}' created in {location}."))
+    batch = run_batch(operations, atomic=all_or_nothing)
+    batch["created"] = [item["target"] for item in batch["results"] if item["status"] == "done"]
+    return batch
@@ -1,65 +1,34 @@
 import os
-import shutil
 from google.genai import types
-
-delete_folders_schema_dict = {
-    "name": "delete_folders",
-    "description": "Deletes one or more existing folders in known user directories.",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "folders_to_delete": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "folder_name": {
-                            "type": "string",
-                            "description": "Name of the folder to delete."
-                        },
-                        "location": {
-                            "type": "string",
-                            "description": "Location where the folder is (e.g., 'Desktop', 'Documents')."
-                        }
-                    },
-                    "required": ["folder_name", "location"]
-                },
-                "description": "An array of folder objects to delete, each with 'folder_name' and 'location'."
-            }
-        },
-        "required": ["folders_to_delete"]
-    }
-}
+from commands.manifest import delete_folders_schema_dict
+from commands.folder.batch import FolderOperation, run_batch, DELETE
+from commands.folder.trash import TRASH_RETENTION_DAYS
+from core.locations import locate_folder, display_path
 
 delete_folders_tool_schema = types.FunctionDeclaration(**delete_folders_schema_dict)
 
-# Actual delete folders logic (accepts array)
-def delete_folders(folders_to_delete: list) -> list:
-    base_user_path = r"C:\Users\aryav"
-    valid_locations = {"Desktop", "Documents", "Downloads", "Pictures"}
-    results = []
+# Actual delete folders logic (accepts array; runs as one batch, see commands.folder.batch).
+# Folders go to the trash and can be brought back with restore_folders (commands.folder.restore).
+def delete_folders(folders_to_delete: list, all_or_nothing: bool = False) -> dict:
+    operations = []
 
     for folder_info in folders_to_delete:
         folder_name = folder_info.get("folder_name")
         location = folder_info.get("location")
 
         if not folder_name or not location:
-            results.append(f"⚠️ Incomplete folder information: {folder_info}")
+            operations.append(FolderOperation(DELETE, str(folder_name), invalid=f"⚠️ Incomplete folder information: {folder_info}"))
             continue
 
-        if location not in valid_locations:
-            results.append(f"❌ Invalid location '{location}' for '{folder_name}'. Choose from: {', '.join(valid_locations)}")
+        # Directly in location, or nested anywhere below it (through core.file_index)
+        folder_path, error = locate_folder(folder_name, location)
+        if error:
+            operations.append(FolderOperation(DELETE, folder_name, invalid=error))
             continue
 
-        folder_path = os.path.join(base_user_path, location, folder_name)
-
-        try:
-            if os.path.exists(folder_path):
-                shutil.rmtree(folder_path)  # Remove folder and its contents
-                results.append(f"✅ Folder '{folder_name}' deleted from {location}.")
-            else:
-                results.append(f"❌ Folder '{folder_name}' does not exist at {location}.")
-        except Exception as e:
-            results.append(f"❌ Failed to delete folder '{folder_name}': {e}")
+        where = display_path(os.path.dirname(folder_path))
+        operations.append(FolderOperation(DELETE, folder_name, source=folder_path, where=where,
+                                          done_message=f"✅ Folder '{folder_name}' deleted from {where} "
+                                                       f"(restorable for {TRASH_RETENTION_DAYS:g} days)."))
 
-    return results
\ No newline at end of file
+    return run_batch(operations, atomic=all_or_nothing)
@@ -1,74 +1,40 @@
 import os
-import shutil
 from google.genai import types
+from commands.manifest import move_folders_schema_dict
+from commands.folder.batch import FolderOperation, run_batch, MOVE
+from core.locations import locate_folder, resolve_location, display_path, location_names, protected_folder
 
-# Function schema for Gemini (accepts array of folders to move)
-move_folders_schema_dict = {
-    "name": "move_folders",
-    "description": "Moves one or more folders from their source locations to a single target location within known user directories.",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "folders_to_move": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "folder_name": {
-                            "type": "string",
-                            "description": "Name of the folder to move."
-                        },
-                        "source_location": {
-                            "type": "string",
-                            "description": "Current location where the folder is (e.g., 'Desktop', 'Documents')."
-                        }
-                    },
-                    "required": ["folder_name", "source_location"]
-                },
-                "description": "An array of folder objects to move, each with 'folder_name' and 'source_location'."
-            },
-            "target_location": {
-                "type": "string",
-                "description": "Destination location for all specified folders (e.g., 'Desktop', 'Documents')."
-            }
-        },
-        "required": ["folders_to_move", "target_location"]
-    }
-}
 
 move_folders_tool_schema = types.FunctionDeclaration(**move_folders_schema_dict)
 
-# Actual move folders logic (accepts array)
-def move_folders(folders_to_move: list, target_location: str) -> list:
-    base_user_path = r"C:\Users\aryav"
-    valid_locations = {"Desktop", "Documents", "Downloads", "Pictures"}
-    results = []
+# Actual move folders logic (accepts array; runs as one batch, see commands.folder.batch)
+def move_folders(folders_to_move: list, target_location: str, all_or_nothing: bool = False) -> dict:
+    operations = []
 
-    if target_location not in valid_locations:
-        return [f"❌ Invalid target location '{target_location}'. Choose from: {', '.join(valid_locations)}"]
+    target_path = resolve_location(target_location)
+    if target_path is None:
+        return {"success": False, "message": f"Invalid target location '{target_location}'. Choose from: {', '.join(location_names())}"}
+    reason = protected_folder(target_path, locations_allowed=True)
+    if reason:
+        return {"success": False, "message": f"Can't move folders into '{display_path(target_path)}': {reason}."}
 
     for folder_info in folders_to_move:
         folder_name = folder_info.get("folder_name")
         source_location = folder_info.get("source_location")
 
         if not folder_name or not source_location:
-            results.append(f"⚠️ Incomplete folder information: {folder_info}")
+            operations.append(FolderOperation(MOVE, str(folder_name), invalid=f"⚠️ Incomplete folder information: {folder_info}"))
             continue
 
-        if source_location not in valid_locations:
-            results.append(f"❌ Invalid source location '{source_location}' for '{folder_name}'. Choose from: {', '.join(valid_locations)}")
+        source_folder_path, error = locate_folder(folder_name, source_location)
+        if error:
+            operations.append(FolderOperation(MOVE, folder_name, invalid=error))
             continue
 
-        source_folder_path = os.path.join(base_user_path, source_location, folder_name)
-        target_folder_path = os.path.join(base_user_path, target_location, folder_name)
+        target_folder_path = os.path.join(target_path, os.path.basename(source_folder_path))
+        where = display_path(os.path.dirname(source_folder_path))
+        operations.append(FolderOperation(
+            MOVE, folder_name, source=source_folder_path, target=target_folder_path, where=where,
+            done_message=f"✅ Folder '{folder_name}' moved from {where} to {display_path(target_path)}."))
 
-        try:
-            if os.path.exists(source_folder_path):
-                shutil.move(source_folder_path, target_folder_path)
-                results.append(f"✅ Folder '{folder_name}' moved from {source_location} to {target_location}.")
-            else:
-                results.append(f"❌ Folder '{folder_name}' not found at {source_location}.")
-        except Exception as e:
-            results.append(f"❌ Failed to move folder '{folder_name}': {e}")
-
-    return results
\ No newline at end of file
+    return run_batch(operations, atomic=all_or_nothing)
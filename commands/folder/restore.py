@@ -0,0 +1,58 @@
+import os
+import time
+from google.genai import types
+from commands.manifest import restore_folders_schema_dict
+from commands.folder.batch import FolderOperation, run_batch, RESTORE
+from commands.folder import trash
+from core.locations import resolve_location, display_path, unknown_location_message
+
+restore_folders_tool_schema = types.FunctionDeclaration(**restore_folders_schema_dict)
+
+MAX_LISTED = 10  # trash entries named when a folder isn't found
+
+
+def _describe(entry: dict) -> str:
+    days = (time.time() - entry["trashed_at"]) / 86400
+    age = "today" if days < 1 else f"{days:.0f} day{'s' if days >= 1.5 else ''} ago"
+    return f"'{entry['name']}' (from {display_path(os.path.dirname(entry['original_path']))}, {age})"
+
+
+# Brings folders deleted by delete_folders back from the trash (runs as one batch, see commands.folder.batch)
+def restore_folders(folders_to_restore: list, all_or_nothing: bool = False) -> dict:
+    operations = []
+
+    for folder_info in folders_to_restore:
+        folder_name = folder_info.get("folder_name")
+        location = folder_info.get("location")
+
+        if not folder_name:
+            operations.append(FolderOperation(RESTORE, str(folder_name), invalid=f"⚠️ Incomplete folder information: {folder_info}"))
+            continue
+
+        within = resolve_location(location) if location else None
+        if location and within is None:
+            operations.append(FolderOperation(RESTORE, folder_name, invalid=unknown_location_message(location)))
+            continue
+
+        # "work/reports": a reports folder that was deleted from a work folder
+        parts = [part for part in folder_name.replace("\\", "/").split("/") if part]
+        suffix = (os.sep + os.path.join(*parts)).lower() if parts else ""
+        found = [entry for entry in trash.entries(parts[-1] if parts else folder_name, within)
+                 if entry["original_path"].lower().endswith(suffix)]
+        if not found:
+            in_trash = trash.entries()
+            listing = ", ".join(_describe(entry) for entry in in_trash[:MAX_LISTED])
+            if len(in_trash) > MAX_LISTED:
+                listing += f" and {len(in_trash) - MAX_LISTED} more"
+            contents = f"The trash holds {listing}." if in_trash else "The trash is empty."
+            where = f" deleted from {location}" if location else ""
+            operations.append(FolderOperation(RESTORE, folder_name, invalid=f"❌ No folder '{folder_name}'{where} in the trash. {contents}"))
+            continue
+
+        entry = found[0]  # the most recent delete
+        where = display_path(os.path.dirname(entry["original_path"]))
+        operations.append(FolderOperation(
+            RESTORE, entry["name"], source=entry["trash_path"], target=entry["original_path"], where=where,
+            entry_id=entry["id"], done_message=f"✅ Folder '{entry['name']}' restored to {where}."))
+
+    return run_batch(operations, atomic=all_or_nothing)
@@ -0,0 +1,177 @@
+# commands/folder/transfer.py
+# Moving a folder. On the same filesystem that is one os.rename: atomic and instant
+# however big the folder is. Across filesystems (another drive, a USB stick, a network
+# share) shutil.move would copy file by file and then delete, silently, for as long as
+# it takes. move_tree instead:
+#   - copies files in parallel on a bounded pool (ALPHA_COPY_WORKERS), in the kernel
+#     where it can (copy_file_range, then sendfile on Linux) and through a buffer elsewhere
+#   - fsyncs every copy and checks it against the source with a BLAKE2 checksum
+#     (ALPHA_COPY_VERIFY=0 skips the check)
+#   - builds the copy under a hidden name next to the target and renames it into place
+#     only when everything matched; the source is deleted last. A failure removes the
+#     partial copy and leaves the source untouched.
+#   - reports bytes and files through core.events while it runs
+
+import errno
+import hashlib
+import os
+import shutil
+import sys
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from core.events import ProgressReporter
+
+COPY_WORKERS = int(os.getenv("ALPHA_COPY_WORKERS", "4"))  # files copied at once
+COPY_VERIFY = os.getenv("ALPHA_COPY_VERIFY", "1") != "0"
+COPY_CHUNK = 8 * 1024 * 1024  # bytes per copy_file_range/sendfile call
+BUFFER_SIZE = 1024 * 1024  # bytes per read when copying or hashing through userspace
+
+# errnos meaning "this kernel/filesystem can't do zero-copy here", not "the copy failed"
+_ZERO_COPY_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+_copy_executor = ThreadPoolExecutor(max_workers=COPY_WORKERS, thread_name_prefix="alpha-copy")
+
+
+def same_device(source: str, target: str) -> bool:
+    """Whether target (which may not exist yet) is on the same filesystem as source."""
+    try:
+        return os.stat(source).st_dev == os.stat(os.path.dirname(os.path.abspath(target))).st_dev
+    except OSError:
+        return False
+
+
+def _zero_copy(fd_in: int, fd_out: int, size: int, progress) -> bool:
+    """Copies in the kernel; False when neither call is supported for these files."""
+    for method in ("copy_file_range", "sendfile"):
+        if not hasattr(os, method) or (method == "sendfile" and not sys.platform.startswith("linux")):
+            continue  # sendfile only writes to sockets outside Linux
+        offset = 0
+        try:
+            while offset < size:
+                count = min(COPY_CHUNK, size - offset)
+                if method == "copy_file_range":
+                    sent = os.copy_file_range(fd_in, fd_out, count)
+                else:
+                    sent = os.sendfile(fd_out, fd_in, offset, count)
+                if sent == 0:
+                    break
+                offset += sent
+                progress.advance(bytes_done=sent)
+            return True
+        except OSError as e:
+            if offset or e.errno not in _ZERO_COPY_UNSUPPORTED:
+                raise
+    return False
+
+
+def _buffered_copy(f_in, f_out, progress) -> str:
+    """Copies through a buffer, hashing as it reads; returns the source digest."""
+    digest = hashlib.blake2b()
+    while True:
+        block = f_in.read(BUFFER_SIZE)
+        if not block:
+            return digest.hexdigest()
+        digest.update(block)
+        f_out.write(block)
+        progress.advance(bytes_done=len(block))
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.blake2b()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BUFFER_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _copy_file(source: str, target: str, progress, failed: threading.Event):
+    if failed.is_set():
+        return  # another file failed; the whole copy is being thrown away
+    with open(source, "rb") as f_in, open(target, "wb") as f_out:
+        size = os.fstat(f_in.fileno()).st_size
+        source_digest = None
+        if not _zero_copy(f_in.fileno(), f_out.fileno(), size, progress):
+            source_digest = _buffered_copy(f_in, f_out, progress)
+        f_out.flush()
+        os.fsync(f_out.fileno())  # the source is deleted afterwards: the copy must be on disk
+    shutil.copystat(source, target)
+    if COPY_VERIFY:
+        if source_digest is None:
+            source_digest = _file_digest(source)
+        if _file_digest(target) != source_digest:
+            raise OSError(errno.EIO, f"Checksum mismatch after copying '{source}'")
+    progress.advance(files_done=1)
+
+
+def _raise(error: OSError):
+    raise error
+
+
+def copy_tree(source: str, target: str, progress: ProgressReporter):
+    """Copies the folder source to target (which must not exist) with verified, parallel file copies."""
+    directories, files, links = [], [], []
+    total_bytes = 0
+    # An unreadable subfolder must fail the move, not be left behind when the source is deleted
+    for root, dir_names, file_names in os.walk(source, onerror=_raise):
+        relative = os.path.relpath(root, source)
+        directories.append(relative)
+        for name in dir_names:
+            path = os.path.join(root, name)
+            if os.path.islink(path):
+                links.append(os.path.normpath(os.path.join(relative, name)))  # os.walk does not descend into it
+        for name in file_names:
+            path = os.path.join(root, name)
+            if os.path.islink(path):
+                links.append(os.path.normpath(os.path.join(relative, name)))
+            else:
+                files.append(os.path.normpath(os.path.join(relative, name)))
+                total_bytes += os.path.getsize(path)
+
+    progress.start("copying", bytes_total=total_bytes, files_total=len(files))
+    for relative in directories:
+        os.makedirs(os.path.join(target, relative), exist_ok=True)
+    for relative in links:
+        os.symlink(os.readlink(os.path.join(source, relative)), os.path.join(target, relative))
+
+    failed = threading.Event()
+    futures = [_copy_executor.submit(_copy_file, os.path.join(source, relative), os.path.join(target, relative),
+                                     progress, failed) for relative in files]
+    error = None
+    for future in futures:
+        try:
+            future.result()
+        except OSError as e:
+            failed.set()  # files not started yet are skipped
+            error = error or e
+    if error is not None:
+        raise error
+
+    # Directory times last: copying files into them updated their mtimes
+    for relative in reversed(directories):
+        shutil.copystat(os.path.join(source, relative), os.path.join(target, relative))
+
+
+def move_tree(source: str, target: str, tool: str = "move_folders", name: str = None) -> str:
+    """Moves the folder source to target (which must not exist). Returns "renamed" or "copied"."""
+    if same_device(source, target):
+        try:
+            os.rename(source, target)
+            return "renamed"
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+    progress = ProgressReporter(tool, name or os.path.basename(source))
+    staging = os.path.join(os.path.dirname(os.path.abspath(target)),
+                           f".{os.path.basename(target)}.alpha-partial-{uuid.uuid4().hex[:8]}")
+    try:
+        copy_tree(source, staging, progress)
+        os.rename(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    shutil.rmtree(source)
+    progress.finish()
+    return "copied"
@@ -0,0 +1,243 @@
+# commands/folder/trash.py
+# Deleting a folder moves it to a trash area on the same volume: one os.rename, so it
+# returns at once whatever the folder's size, and it can be restored (restore_folders)
+# for TRASH_RETENTION_DAYS. A background reaper purges expired folders later, a few
+# files at a time, so a huge purge doesn't starve the disk.
+#
+# Trash areas: ~/.alpha/trash for the volume holding ALPHA_CACHE_DIR, <mount point>/
+# .alpha-trash for other volumes, or .alpha-trash next to the folder when the mount
+# point isn't writable. Each trashed folder sits there under its entry id.
+#
+# The index (trash.db in ALPHA_CACHE_DIR, SQLite like the HTTP cache) records every entry
+# ({"id", "name", "original_path", "trash_path", "trashed_at"}) and every trash area.
+# A row is written before its folder is moved in and removed before its folder is purged,
+# so anything in a trash area without a row is a leftover of an interrupted purge and
+# the reaper removes it. The reaper starts with the first use of the trash in a process.
+
+import os
+import sqlite3
+import stat
+import threading
+import time
+import uuid
+
+from core.paths import CACHE_DIR
+
+TRASH_RETENTION_DAYS = float(os.getenv("ALPHA_TRASH_RETENTION_DAYS", "7"))
+TRASH_REAP_SECONDS = float(os.getenv("ALPHA_TRASH_REAP_SECONDS", "600"))  # between reaper passes
+TRASH_PURGE_FILES_PER_SECOND = int(os.getenv("ALPHA_TRASH_PURGE_FILES_PER_SECOND", "1000"))  # 0: unthrottled
+PURGE_SLICE = 100  # files removed between throttle pauses
+
+_PURGING = ".purge-"  # prefix of trash area entries being purged
+
+_lock = threading.Lock()  # index access and every rename into or out of a trash area
+_conn = None
+_reaper_started = False
+
+
+def _db():
+    global _conn
+    if _conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _conn = sqlite3.connect(os.path.join(CACHE_DIR, "trash.db"), check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " id TEXT PRIMARY KEY,"
+            " name TEXT NOT NULL,"
+            " original_path TEXT NOT NULL,"
+            " trash_path TEXT NOT NULL,"
+            " trashed_at REAL NOT NULL)"
+        )
+        _conn.execute("CREATE INDEX IF NOT EXISTS entries_name ON entries (name)")
+        _conn.execute("CREATE TABLE IF NOT EXISTS areas (path TEXT PRIMARY KEY)")
+        _conn.commit()
+    return _conn
+
+
+def _entry(row) -> dict:
+    entry_id, name, original_path, trash_path, trashed_at = row
+    return {"id": entry_id, "name": name, "original_path": original_path, "trash_path": trash_path,
+            "trashed_at": trashed_at}
+
+
+def _mount_point(path: str) -> str:
+    path = os.path.abspath(path)
+    device = os.stat(path).st_dev
+    while True:
+        parent = os.path.dirname(path)
+        if parent == path or os.stat(parent).st_dev != device:
+            return path
+        path = parent
+
+
+def _trash_area(folder: str) -> str:
+    """A writable trash area on the same volume as folder (created if needed)."""
+    device = os.stat(folder).st_dev
+    home_area = os.path.join(CACHE_DIR, "trash")
+    os.makedirs(home_area, exist_ok=True)
+    if os.stat(home_area).st_dev == device:
+        return home_area
+    for area in (os.path.join(_mount_point(folder), ".alpha-trash"),
+                 os.path.join(os.path.dirname(os.path.abspath(folder)), ".alpha-trash")):
+        try:
+            os.makedirs(area, exist_ok=True)
+            if os.stat(area).st_dev == device:
+                return area
+        except OSError:
+            continue
+    raise OSError(f"No writable trash area on the volume of '{folder}'")
+
+
+def trash_folder(path: str, name: str = None) -> dict:
+    """Moves the folder at path to the trash; returns its index entry."""
+    ensure_reaper()
+    path = os.path.abspath(path)
+    area = _trash_area(path)
+    entry = {"id": uuid.uuid4().hex, "name": name or os.path.basename(path), "original_path": path,
+             "trashed_at": time.time()}
+    entry["trash_path"] = os.path.join(area, entry["id"])
+    with _lock:
+        db = _db()
+        db.execute("INSERT OR IGNORE INTO areas (path) VALUES (?)", (area,))
+        db.execute("INSERT INTO entries (id, name, original_path, trash_path, trashed_at) VALUES (?, ?, ?, ?, ?)",
+                   (entry["id"], entry["name"], entry["original_path"], entry["trash_path"], entry["trashed_at"]))
+        db.commit()
+        try:
+            os.rename(path, entry["trash_path"])
+        except OSError:
+            db.execute("DELETE FROM entries WHERE id = ?", (entry["id"],))
+            db.commit()
+            raise
+    return entry
+
+
+def restore(entry_id: str, target: str = None) -> str:
+    """Moves a trashed folder back (to its original path by default); returns where it went."""
+    ensure_reaper()
+    with _lock:
+        db = _db()
+        row = db.execute("SELECT id, name, original_path, trash_path, trashed_at FROM entries WHERE id = ?",
+                         (entry_id,)).fetchone()
+        if row is None:
+            raise OSError("it is no longer in the trash")
+        entry = _entry(row)
+        if not os.path.isdir(entry["trash_path"]):
+            db.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+            db.commit()
+            raise OSError("it is no longer in the trash")
+        target = target or entry["original_path"]
+        if os.path.exists(target):
+            raise OSError(f"'{os.path.basename(target)}' already exists there")
+        os.rename(entry["trash_path"], target)
+        db.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+        db.commit()
+    return target
+
+
+def entries(name: str = None, within: str = None) -> list:
+    """Index entries, newest first; optionally only those named name, deleted from within (or below it)."""
+    query = "SELECT id, name, original_path, trash_path, trashed_at FROM entries"
+    clauses, params = [], []
+    if name is not None:
+        clauses.append("name = ? COLLATE NOCASE")
+        params.append(name)
+    with _lock:
+        rows = _db().execute(query + (" WHERE " + " AND ".join(clauses) if clauses else "")
+                             + " ORDER BY trashed_at DESC", params).fetchall()
+    found = [_entry(row) for row in rows]
+    if within is not None:
+        prefix = os.path.normcase(os.path.join(os.path.abspath(within), ""))
+        found = [entry for entry in found if os.path.normcase(entry["original_path"]).startswith(prefix)]
+    return found
+
+
+# --- Reaper ---
+def _purge(path: str):
+    """rmtree, throttled to TRASH_PURGE_FILES_PER_SECOND."""
+    removed = 0
+    slice_start = time.monotonic()
+
+    def remove(remover, target):
+        try:
+            remover(target)
+        except PermissionError:
+            os.chmod(target, stat.S_IWRITE)  # read-only files can't be deleted on Windows
+            remover(target)
+
+    if os.path.isdir(path) and not os.path.islink(path):
+        for root, dir_names, file_names in os.walk(path, topdown=False):
+            for file_name in file_names:
+                remove(os.remove, os.path.join(root, file_name))
+                removed += 1
+                if TRASH_PURGE_FILES_PER_SECOND and removed % PURGE_SLICE == 0:
+                    pause = PURGE_SLICE / TRASH_PURGE_FILES_PER_SECOND - (time.monotonic() - slice_start)
+                    if pause > 0:
+                        time.sleep(pause)
+                    slice_start = time.monotonic()
+            for dir_name in dir_names:
+                target = os.path.join(root, dir_name)
+                remove(os.remove if os.path.islink(target) else os.rmdir, target)
+        remove(os.rmdir, path)
+    elif os.path.lexists(path):
+        remove(os.remove, path)
+
+
+def reap(now: float = None) -> int:
+    """Purges expired entries and leftovers from every trash area; returns how many were purged."""
+    cutoff = (now or time.time()) - TRASH_RETENTION_DAYS * 86400
+    doomed = []
+    with _lock:
+        db = _db()
+        expired = db.execute("SELECT trash_path FROM entries WHERE trashed_at < ?", (cutoff,)).fetchall()
+        db.execute("DELETE FROM entries WHERE trashed_at < ?", (cutoff,))
+        db.commit()
+        kept = {trash_path for (trash_path,) in db.execute("SELECT trash_path FROM entries")}
+        areas = [area for (area,) in db.execute("SELECT path FROM areas")]
+        # Claim everything that goes: renamed under the lock so restore() can't race the purge
+        for area in areas:
+            try:
+                names = os.listdir(area)
+            except OSError:
+                continue
+            for name in names:
+                path = os.path.join(area, name)
+                if name.startswith(_PURGING):
+                    doomed.append(path)  # an interrupted purge
+                elif path not in kept:
+                    if db.execute("SELECT 1 FROM entries WHERE trash_path = ?", (path,)).fetchone():
+                        continue  # trashed by another process since kept was read
+                    claimed = os.path.join(area, _PURGING + name)
+                    try:
+                        os.rename(path, claimed)
+                        doomed.append(claimed)
+                    except OSError as e:
+                        print(f"[Trash] Could not claim {path}: {e}")
+    purged = 0
+    for path in doomed:
+        try:
+            _purge(path)
+            purged += 1
+        except OSError as e:
+            print(f"[Trash] Could not purge {path}: {e}")  # retried on the next pass
+    if expired or purged:
+        print(f"[Trash] Purged {purged} folder{'s' if purged != 1 else ''} from the trash")
+    return purged
+
+
+def ensure_reaper():
+    """Starts the background reaper once per process."""
+    global _reaper_started
+    with _lock:
+        if _reaper_started:
+            return
+        _reaper_started = True
+
+    def run():
+        while True:
+            try:
+                reap()
+            except Exception as e:
+                print(f"[Trash] Reaper pass failed: {e}")
+            time.sleep(TRASH_REAP_SECONDS)
+
+    threading.Thread(target=run, name="alpha-trash-reaper", daemon=True).start()
@@ -0,0 +1,390 @@
+# commands/manifest.py
+# Lightweight command manifest: every tool's schema plus where its implementation lives.
+# This module must stay free of third-party imports so the registry can build the
+# tool declarations without pulling in selenium, bs4, requests or google.genai.
+
+# --- Folder Commands ---
+create_folder_schema_dict = {
+    "name": "create_folder",
+    "description": "Creates one or more folders inside a known user directory like Desktop or Documents.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "location": {
+                "type": "string",
+                "description": "Target location under the user directory (e.g., 'Desktop', 'Documents', or a subfolder such as 'Documents/work')."
+            },
+            "folder_names": {
+                "type": "array",
+                "items": {
+                    "type": "string",
+                    "description": "Name of a folder to create."
+                },
+                "description": "An array of folder names to create."
+            },
+            "all_or_nothing": {
+                "type": "boolean",
+                "description": "If true (the default), either every folder is created or none are."
+            }
+        },
+        "required": ["location", "folder_names"]
+    }
+}
+
+delete_folders_schema_dict = {
+    "name": "delete_folders",
+    "description": "Deletes one or more existing folders in known user directories.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "folders_to_delete": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "folder_name": {
+                            "type": "string",
+                            "description": "Name of the folder to delete. It can be nested anywhere below the location; use 'parent/name' when several folders share the name."
+                        },
+                        "location": {
+                            "type": "string",
+                            "description": "Location where the folder is (e.g., 'Desktop', 'Documents', or a subfolder such as 'Documents/work')."
+                        }
+                    },
+                    "required": ["folder_name", "location"]
+                },
+                "description": "An array of folder objects to delete, each with 'folder_name' and 'location'."
+            },
+            "all_or_nothing": {
+                "type": "boolean",
+                "description": "If true, either every folder is deleted or none are (default false: delete what can be deleted)."
+            }
+        },
+        "required": ["folders_to_delete"]
+    }
+}
+
+move_folders_schema_dict = {
+    "name": "move_folders",
+    "description": "Moves one or more folders from their source locations to a single target location within known user directories.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "folders_to_move": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "folder_name": {
+                            "type": "string",
+                            "description": "Name of the folder to move. It can be nested anywhere below the source location; use 'parent/name' when several folders share the name."
+                        },
+                        "source_location": {
+                            "type": "string",
+                            "description": "Current location where the folder is (e.g., 'Desktop', 'Documents', or a subfolder such as 'Documents/work')."
+                        }
+                    },
+                    "required": ["folder_name", "source_location"]
+                },
+                "description": "An array of folder objects to move, each with 'folder_name' and 'source_location'."
+            },
+            "target_location": {
+                "type": "string",
+                "description": "Destination location for all specified folders (e.g., 'Desktop', 'Documents', or a subfolder such as 'Documents/work')."
+            },
+            "all_or_nothing": {
+                "type": "boolean",
+                "description": "If true, either every folder is moved or none are (default false: move what can be moved)."
+            }
+        },
+        "required": ["folders_to_move", "target_location"]
+    }
+}
+
+rename_folders_schema_dict = {
+    "name": "rename_folders",
+    "description": "Renames one or more existing folders in known user directories.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "folders_to_rename": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "old_folder_name": {
+                            "type": "string",
+                            "description": "Current name of the folder. It can be nested anywhere below the location; use 'parent/name' when several folders share the name."
+                        },
+                        "new_folder_name": {
+                            "type": "string",
+                            "description": "New name for the folder."
+                        },
+                        "location": {
+                            "type": "string",
+                            "description": "Location where the folder is (e.g., 'Desktop', 'Documents', or a subfolder such as 'Documents/work')."
+                        }
+                    },
+                    "required": ["old_folder_name", "new_folder_name", "location"]
+                },
+                "description": "An array of folder objects to rename, each with 'old_folder_name', 'new_folder_name', and 'location'."
+            },
+            "all_or_nothing": {
+                "type": "boolean",
+                "description": "If true, either every folder is renamed or none are (default false: rename what can be renamed)."
+            }
+        },
+        "required": ["folders_to_rename"]
+    }
+}
+
+restore_folders_schema_dict = {
+    "name": "restore_folders",
+    "description": "Restores one or more deleted folders from the trash to where they were deleted from. Deleted folders stay in the trash for a limited number of days.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "folders_to_restore": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "folder_name": {
+                            "type": "string",
+                            "description": "Name of the deleted folder."
+                        },
+                        "location": {
+                            "type": "string",
+                            "description": "Optional location the folder was deleted from (e.g., 'Desktop', 'Documents', or a subfolder such as 'Documents/work'). If omitted, the most recently deleted folder with that name is restored."
+                        }
+                    },
+                    "required": ["folder_name"]
+                },
+                "description": "An array of folder objects to restore, each with 'folder_name' and optionally 'location'."
+            },
+            "all_or_nothing": {
+                "type": "boolean",
+                "description": "If true, either every folder is restored or none are (default false: restore what can be restored)."
+            }
+        },
+        "required": ["folders_to_restore"]
+    }
+}
+
+# --- File Commands ---
+create_python_file_schema_dict = {
+    "name": "create_python_file",
+    "description": "Generates Python code based on a prompt and creates a Python file with the generated code.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "filename": {
+                "type": "string",
+                "description": "Name of the Python file to create (without the .py extension)."
+            },
+            "code_prompt": {
+                "type": "string",
+                "description": "The prompt describing the Python code to generate."
+            },
+            "location": {
+                "type": "string",
+                "description": "Location where the file should be created (e.g., 'Desktop', 'Documents', or a subfolder such as 'Documents/work')."
+            }
+        },
+        "required": ["filename", "code_prompt", "location"]
+    }
+}
+
+find_files_schema_dict = {
+    "name": "find_files",
+    "description": "Finds files and folders by name anywhere in the user's locations (Desktop, Documents, Downloads, ...), using a background index. Use it whenever the user doesn't say exactly where something is. Each match has a 'location' that the folder commands accept.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Part of the name (e.g., 'invoice'), a glob pattern (e.g., '*.pdf', 'report_202?.xlsx') or an approximate name."
+            },
+            "location": {
+                "type": "string",
+                "description": "Optional location to search in (e.g., 'Documents' or 'Documents/work'); everywhere if omitted."
+            },
+            "kind": {
+                "type": "string",
+                "enum": ["any", "file", "folder"],
+                "description": "Only files, only folders, or both (default)."
+            },
+            "match": {
+                "type": "string",
+                "enum": ["auto", "substring", "glob", "fuzzy"],
+                "description": "How to match the query. 'auto' (default) treats patterns with * ? [ as globs and otherwise looks for names containing the query, then for similar names."
+            },
+            "limit": {
+                "type": "integer",
+                "description": "Maximum number of matches to return (default 20, at most 100)."
+            }
+        },
+        "required": ["query"]
+    }
+}
+
+# --- Website Commands ---
+create_website_schema_dict = {
+    "name": "create_website",
+    "description": "Creates a new folder and an index.html file inside it for a website in the default 'Websites' folder in your user directory, and automatically opens it.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "website_name": {
+                "type": "string",
+                "description": "The desired name for the website folder (e.g., 'my_new_blog', 'company_landing_page')."
+            },
+            "content": {
+                "type": "string",
+                "description": "Optional HTML content for the index.html file. If not provided, a default template will be used. This parameter is typically filled by model's generation based on user's prompt."
+            }
+        },
+        "required": ["website_name"]
+    }
+}
+
+open_website_schema_dict = {
+    "name": "open_website",
+    "description": "Opens the specified index.html file in the default web browser.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "index_html_path": {
+                "type": "string",
+                "description": "The absolute path to the index.html file to open."
+            }
+        },
+        "required": ["index_html_path"]
+    }
+}
+
+# --- Web Automation Commands ---
+open_youtube_trending_schema_dict = {
+    "name": "open_youtube_trending",
+    "description": "Opens the default web browser to YouTube and attempts to play the top trending video.",
+    "parameters": {
+        "type": "object",
+        "properties": {},  # No parameters needed
+        "required": []
+    }
+}
+
+scrape_website_content_schema_dict = {
+    "name": "scrape_website_content",
+    "description": "Scrapes the main textual content from a given website URL and returns it for summarization or analysis. It handles basic URL validation and extracts visible text.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "url": {
+                "type": "string",
+                "description": "The full URL of the website to scrape (e.g., 'https://www.example.com/article')."
+            }
+        },
+        "required": ["url"]
+    }
+}
+
+scrape_websites_content_schema_dict = {
+    "name": "scrape_websites_content",
+    "description": "Scrapes the main textual content from several website URLs at once and returns one result per URL. Use this instead of repeated scrape_website_content calls when the user asks about more than one page.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "urls": {
+                "type": "array",
+                "items": {
+                    "type": "string",
+                    "description": "The full URL of a website to scrape."
+                },
+                "description": "An array of website URLs to scrape (e.g., ['https://www.example.com/a', 'https://www.example.org/b'])."
+            }
+        },
+        "required": ["urls"]
+    }
+}
+
+open_gehu_btech_notice_and_return_content_schema_dict = {
+    "name": "open_gehu_btech_notice_and_return_content",
+    "description": "Directly navigates to 'http://btechcsegehu.in/', identifies the latest notice, scrapes its content, and returns the notice's title and full content for summarization.",
+    "parameters": {
+        "type": "object",
+        "properties": {},  # No parameters
+        "required": []
+    }
+}
+
+# --- Manifest ---
+# command name -> implementation module, function name and schema.
+# The module is only imported the first time the command is dispatched.
+COMMAND_MANIFEST = {
+    "create_folder": {
+        "module": "commands.folder.create",
+        "function": "create_folder",
+        "schema": create_folder_schema_dict,
+    },
+    "delete_folders": {
+        "module": "commands.folder.delete",
+        "function": "delete_folders",
+        "schema": delete_folders_schema_dict,
+    },
+    "move_folders": {
+        "module": "commands.folder.move",
+        "function": "move_folders",
+        "schema": move_folders_schema_dict,
+    },
+    "rename_folders": {
+        "module": "commands.folder.rename",
+        "function": "rename_folders",
+        "schema": rename_folders_schema_dict,
+    },
+    "restore_folders": {
+        "module": "commands.folder.restore",
+        "function": "restore_folders",
+        "schema": restore_folders_schema_dict,
+    },
+    "create_python_file": {
+        "module": "commands.files.create_python_file",
+        "function": "create_python_file",
+        "schema": create_python_file_schema_dict,
+    },
+    "find_files": {
+        "module": "commands.files.find_files",
+        "function": "find_files",
+        "schema": find_files_schema_dict,
+    },
+    "create_website": {
+        "module": "commands.website.create_website",
+        "function": "create_website",
+        "schema": create_website_schema_dict,
+    },
+    "open_website": {
+        "module": "commands.website.open_website",
+        "function": "open_website",
+        "schema": open_website_schema_dict,
+    },
+    "open_youtube_trending": {
+        "module": "commands.webautomation.youtube_Automation",
+        "function": "open_youtube_trending",
+        "schema": open_youtube_trending_schema_dict,
+    },
+    "scrape_website_content": {
+        "module": "commands.webautomation.web_scrapper",
+        "function": "scrape_website_content",
+        "schema": scrape_website_content_schema_dict,
+    },
+    "scrape_websites_content": {
+        "module": "commands.webautomation.web_scrapper",
+        "function": "scrape_websites_content",
+        "schema": scrape_websites_content_schema_dict,
+    },
+    "open_gehu_btech_notice_and_return_content": {
+        "module": "commands.webautomation.gehu_Automation",
+        "function": "open_gehu_btech_notice_and_return_content",
+        "schema": open_gehu_btech_notice_and_return_content_schema_dict,
+    },
+}
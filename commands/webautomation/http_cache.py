@@ -0,0 +1,149 @@
+# commands/webautomation/http_cache.py
+# Persistent cache of scraped page text, keyed by normalized URL.
+# Fresh entries (younger than the TTL) are served without touching the network;
+# stale ones are revalidated with If-None-Match / If-Modified-Since, so an unchanged
+# page costs a 304 instead of a full download and re-parse. The cache is bounded in
+# size and evicts least-recently-used entries first.
+
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from core.paths import CACHE_DIR
+
+# --- Configuration (overridable through environment variables) ---
+CACHE_TTL_SECONDS = float(os.getenv("ALPHA_HTTP_CACHE_TTL", "600"))
+CACHE_MAX_BYTES = int(os.getenv("ALPHA_HTTP_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used as the cache key: lowercase scheme/host, no default port or fragment, sorted query."""
+    if "://" not in url:
+        url = "http://" + url
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+class ResponseCache:
+    def __init__(self, path: str, ttl_seconds: float = CACHE_TTL_SECONDS, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "evictions": 0}
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " url TEXT PRIMARY KEY,"
+            " content TEXT NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " fetched_at REAL NOT NULL,"
+            " last_access REAL NOT NULL,"
+            " size INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self._conn.commit()
+
+    def get(self, url: str):
+        """
+        Returns the cached entry for url as a dict (content, etag, last_modified, fresh),
+        or None. Counts a hit for fresh entries, stale/miss otherwise.
+        """
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, etag, last_modified, fetched_at FROM entries WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            content, etag, last_modified, fetched_at = row
+            fresh = now - fetched_at < self.ttl_seconds
+            self._counters["hits" if fresh else "stale"] += 1
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE url = ?", (now, key))
+            self._conn.commit()
+        return {"content": content, "etag": etag, "last_modified": last_modified, "fresh": fresh}
+
+    @staticmethod
+    def conditional_headers(entry) -> dict:
+        """Request headers that let the server answer 304 Not Modified for a stale entry."""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def mark_revalidated(self, url: str):
+        """The server confirmed (304) that the cached copy is still current: restart its TTL."""
+        now = time.time()
+        with self._lock:
+            self._counters["revalidated"] += 1
+            self._conn.execute(
+                "UPDATE entries SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, normalize_url(url))
+            )
+            self._conn.commit()
+
+    def put(self, url: str, content: str, etag: str = None, last_modified: str = None):
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (url, content, etag, last_modified, fetched_at, last_access, size)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), content, etag, last_modified, now, now, size),
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._conn.execute("SELECT url, size FROM entries ORDER BY last_access ASC").fetchall():
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._counters["evictions"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            return {**self._counters, "entries": entries, "bytes": total}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+
+# --- Process-wide Cache ---
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(os.path.join(CACHE_DIR, "http_cache.sqlite3"))
+    return _cache
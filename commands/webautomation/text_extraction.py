@@ -0,0 +1,341 @@
+# commands/webautomation/text_extraction.py
+# Shared text extraction engine for every scraper (web_scrapper and gehu_Automation).
+# HTML is fed in chunks (e.g. straight from a streamed HTTP response), script/style/nav
+# subtrees are skipped without being materialized, text blocks are emitted as soon as
+# their element closes, and the caller can stop reading once the character budget is met.
+#
+# Backends: "html.parser" (stdlib, always available), "lxml" and "selectolax" (when
+# installed). By default the fastest available backend is picked at runtime with a
+# one-off timing run; set ALPHA_EXTRACT_BACKEND to force one.
+
+import os
+import time
+from html.parser import HTMLParser
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+
+def _tags_from_env(name: str, default: list) -> frozenset:
+    value = os.getenv(name)
+    if not value:
+        return frozenset(default)
+    return frozenset(tag.strip().lower() for tag in value.split(",") if tag.strip())
+
+
+# --- Extraction Defaults (tag lists overridable through environment variables) ---
+MAX_CONTENT_CHARS = 10000
+TRUNCATION_NOTE = "\n\n[... content truncated for length ...]"
+# Subtrees dropped entirely
+SKIP_TAGS = _tags_from_env("ALPHA_EXTRACT_SKIP_TAGS",
+                           ["script", "style", "header", "footer", "nav", "aside", "form", "svg"])
+# Allowlist of elements whose text is kept
+BLOCK_TAGS = _tags_from_env("ALPHA_EXTRACT_BLOCK_TAGS",
+                            ["p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "title"])
+EXTRACT_BACKEND = os.getenv("ALPHA_EXTRACT_BACKEND", "auto")
+# Strings (e.g. driver.page_source) are fed in slices so the budget can cut parsing short
+STRING_CHUNK_CHARS = 16 * 1024
+_LIST_TAGS = frozenset(["ul", "ol"])
+# Block-level start tags that implicitly close an open <p> (HTML allows omitting </p>)
+_P_CLOSERS = frozenset([
+    "address", "article", "aside", "blockquote", "div", "dl", "fieldset", "figure", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main", "nav", "ol", "p", "pre", "section",
+    "table", "ul",
+])
+
+
+def _normalize_space(parts, separator: str = " ") -> str:
+    return " ".join(separator.join(parts).split())
+
+
+class _OrderedBlocks:
+    """
+    Blocks finish inner-first (a <p> inside an <li> closes before the <li>), but are emitted
+    in document order: each block reserves a slot when it opens and is released once every
+    earlier slot is filled. Flat pages stream out immediately.
+    """
+
+    def __init__(self):
+        self._slots = []
+        self._released = 0
+
+    def reserve(self) -> int:
+        self._slots.append(None)
+        return len(self._slots) - 1
+
+    def fill(self, slot: int, text: str):
+        self._slots[slot] = text
+
+    def drain(self) -> list:
+        ready = []
+        while self._released < len(self._slots) and self._slots[self._released] is not None:
+            if self._slots[self._released]:
+                ready.append(self._slots[self._released])
+            self._slots[self._released] = ""  # Release the text, keep the index stable
+            self._released += 1
+        return ready
+
+
+# --- html.parser Backend (stdlib, fully streaming) ---
+class _StreamingTextParser(HTMLParser):
+    """
+    Collects the text of every block element. Each block owns the text directly inside it;
+    text of nested blocks is emitted separately. Finished blocks are returned by drain().
+    """
+
+    def __init__(self, skip_tags, block_tags):
+        super().__init__(convert_charrefs=True)
+        self.skip_tags = skip_tags
+        self.block_tags = block_tags
+        self._blocks = _OrderedBlocks()
+        self._skip_stack = []
+        self._block_stack = []  # [(tag, list_depth, text_parts, slot)]
+        self._list_depth = 0
+
+    def _close_block(self):
+        _, _, parts, slot = self._block_stack.pop()
+        self._blocks.fill(slot, _normalize_space(parts, separator=""))
+
+    def drain(self) -> list:
+        return self._blocks.drain()
+
+    def _close_until(self, tag):
+        if any(entry[0] == tag for entry in self._block_stack):
+            while self._block_stack:
+                open_tag = self._block_stack[-1][0]
+                self._close_block()
+                if open_tag == tag:
+                    break
+
+    def _tag_boundary(self):
+        # Element boundaries separate words, like get_text(separator=' ') does
+        if self._block_stack:
+            self._block_stack[-1][2].append(" ")
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_stack:
+            if tag in self.skip_tags:
+                self._skip_stack.append(tag)
+            return
+        if tag in _P_CLOSERS and self._block_stack and self._block_stack[-1][0] == "p":
+            self._close_block()
+        self._tag_boundary()
+        if tag in self.skip_tags:
+            self._skip_stack.append(tag)
+            return
+        if tag in _LIST_TAGS:
+            self._list_depth += 1
+        elif tag in self.block_tags:
+            # </p> and </li> are optional in HTML: a new sibling implicitly closes the open one
+            if self._block_stack:
+                top_tag, top_depth = self._block_stack[-1][:2]
+                if top_tag == tag and tag in ("p", "li") and top_depth == self._list_depth:
+                    self._close_block()
+            self._block_stack.append((tag, self._list_depth, [], self._blocks.reserve()))
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags (<br/>, <img/>) never open a block or a skipped subtree
+        if not self._skip_stack:
+            self._tag_boundary()
+
+    def handle_endtag(self, tag):
+        if self._skip_stack:
+            if tag in self._skip_stack:
+                while self._skip_stack.pop() != tag:
+                    pass
+                if not self._skip_stack:
+                    self._tag_boundary()
+            return
+        self._tag_boundary()
+        if tag in _LIST_TAGS:
+            # Close list items left open inside the list that just ended
+            while self._block_stack and self._block_stack[-1][0] == "li" and self._block_stack[-1][1] == self._list_depth:
+                self._close_block()
+            self._list_depth = max(0, self._list_depth - 1)
+        elif tag in self.block_tags:
+            self._close_until(tag)
+
+    def handle_data(self, data):
+        if not self._skip_stack and self._block_stack:
+            self._block_stack[-1][2].append(data)
+
+    def flush(self):
+        self.close()
+        while self._block_stack:
+            self._close_block()
+
+
+def _iter_blocks_html_parser(chunks, skip_tags, block_tags):
+    parser = _StreamingTextParser(skip_tags, block_tags)
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("utf-8", errors="replace")
+        parser.feed(chunk)
+        yield from parser.drain()
+    parser.flush()
+    yield from parser.drain()
+
+
+# --- lxml Backend (used when lxml is installed) ---
+def _own_text(element, skip_tags, block_tags) -> list:
+    """Text directly inside element, descending into inline children but not into nested blocks or skipped tags."""
+    parts = [element.text] if element.text else []
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in block_tags and child.tag not in skip_tags:
+            parts.extend(_own_text(child, skip_tags, block_tags))
+        if child.tail:
+            parts.append(child.tail)
+    return parts
+
+
+def _iter_blocks_lxml(chunks, skip_tags, block_tags):
+    parser = lxml_etree.HTMLPullParser(events=("start", "end"))
+    blocks = _OrderedBlocks()
+    open_slots = []  # lxml builds a well-formed tree, so block slots nest like a stack
+    skip_depth = 0
+
+    def drain():
+        nonlocal skip_depth
+        for event, element in parser.read_events():
+            tag = element.tag if isinstance(element.tag, str) else ""
+            if event == "start":
+                if tag in skip_tags:
+                    skip_depth += 1
+                elif tag in block_tags and not skip_depth:
+                    open_slots.append(blocks.reserve())
+                continue
+
+            if tag in skip_tags:
+                skip_depth -= 1
+                element.clear(keep_tail=True)  # Drop the skipped subtree right away
+            elif tag in block_tags and not skip_depth:
+                blocks.fill(open_slots.pop(), _normalize_space(_own_text(element, skip_tags, block_tags)))
+                element.clear(keep_tail=True)
+                yield from blocks.drain()
+            elif not open_slots and not skip_depth:
+                # Nothing above this element still needs its text: free it and its earlier siblings
+                element.clear(keep_tail=True)
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+# --- selectolax Backend (used when selectolax is installed; parses the whole document) ---
+def _own_text_selectolax(node, skip_tags, block_tags) -> list:
+    parts = []
+    for child in node.iter(include_text=True):
+        if child.tag == "-text":
+            parts.append(child.text(deep=False))
+        elif child.tag not in block_tags and child.tag not in skip_tags:
+            parts.extend(_own_text_selectolax(child, skip_tags, block_tags))
+    return parts
+
+
+def _iter_blocks_selectolax(chunks, skip_tags, block_tags):
+    html = "".join(chunk.decode("utf-8", errors="replace") if isinstance(chunk, bytes) else chunk
+                   for chunk in chunks)
+    tree = SelectolaxParser(html)
+    tree.strip_tags(list(skip_tags))  # Removes the skipped subtrees
+    for node in tree.css(", ".join(sorted(block_tags))):
+        text = _normalize_space(_own_text_selectolax(node, skip_tags, block_tags))
+        if text:
+            yield text
+
+
+# --- Backend Selection ---
+EXTRACTION_BACKENDS = {"html.parser": _iter_blocks_html_parser}
+if lxml_etree is not None:
+    EXTRACTION_BACKENDS["lxml"] = _iter_blocks_lxml
+if SelectolaxParser is not None:
+    EXTRACTION_BACKENDS["selectolax"] = _iter_blocks_selectolax
+
+_fastest_backend = None
+
+
+def _calibration_page() -> str:
+    row = "<div><p>Calibration paragraph with <a href='#'>a link</a> and some <b>bold</b> text.</p></div>"
+    return ("<html><head><title>Calibration</title><script>var a = 1;</script></head><body>"
+            + "<nav><ul><li>Home</li><li>About</li></ul></nav>" + row * 2000 + "</body></html>")
+
+
+def select_fastest_backend() -> str:
+    """Times every available backend once on a sample page and remembers the fastest."""
+    global _fastest_backend
+    if _fastest_backend is None:
+        if len(EXTRACTION_BACKENDS) == 1:
+            _fastest_backend = "html.parser"
+        else:
+            sample = _calibration_page()
+            timings = {}
+            for name, iter_blocks in EXTRACTION_BACKENDS.items():
+                start = time.perf_counter()
+                for _ in iter_blocks(_iter_string_chunks(sample), SKIP_TAGS, BLOCK_TAGS):
+                    pass
+                timings[name] = time.perf_counter() - start
+            _fastest_backend = min(timings, key=timings.get)
+    return _fastest_backend
+
+
+def _resolve_backend(backend):
+    if backend in (None, "auto"):
+        backend = EXTRACT_BACKEND
+    if backend == "auto":
+        return select_fastest_backend()
+    if backend not in ("html.parser", "lxml", "selectolax"):
+        raise ValueError(f"Unknown extraction backend: {backend}")
+    if backend not in EXTRACTION_BACKENDS:
+        raise ImportError(f"The '{backend}' extraction backend is not installed (pip install {backend}).")
+    return backend
+
+
+def _iter_string_chunks(text):
+    for start in range(0, len(text), STRING_CHUNK_CHARS):
+        yield text[start:start + STRING_CHUNK_CHARS]
+
+
+# --- Public API ---
+def iter_text_blocks(chunks, skip_tags=SKIP_TAGS, block_tags=BLOCK_TAGS, backend=None):
+    """Yields cleaned text blocks as soon as each block element closes. chunks is a str/bytes or an iterable of them."""
+    if isinstance(chunks, bytes):
+        chunks = chunks.decode("utf-8", errors="replace")
+    if isinstance(chunks, str):
+        chunks = _iter_string_chunks(chunks)
+    return EXTRACTION_BACKENDS[_resolve_backend(backend)](chunks, frozenset(skip_tags), frozenset(block_tags))
+
+
+def extract_text(chunks, max_chars: int = MAX_CONTENT_CHARS, skip_tags=SKIP_TAGS, block_tags=BLOCK_TAGS,
+                 backend=None, truncation_note: str = TRUNCATION_NOTE) -> str:
+    """
+    Joins text blocks with blank lines and stops consuming chunks as soon as more than
+    max_chars characters are available, truncating with truncation_note.
+    """
+    blocks = []
+    length = 0
+    truncated = False
+    block_iter = iter_text_blocks(chunks, skip_tags=skip_tags, block_tags=block_tags, backend=backend)
+    try:
+        for block in block_iter:
+            length += len(block) + (2 if blocks else 0)
+            blocks.append(block)
+            if length > max_chars:
+                truncated = True
+                break
+    finally:
+        block_iter.close()  # Stop pulling from the underlying stream
+
+    full_text = "\n\n".join(blocks)
+    if truncated:
+        full_text = full_text[:max_chars] + truncation_note
+    return full_text
@@ -1,12 +1,54 @@
 # commands/web_automation/web_scraper.py
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urljoin
-from google.genai import types
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlparse
+from commands.manifest import scrape_website_content_schema_dict, scrape_websites_content_schema_dict
+from commands.webautomation.http_cache import get_response_cache
+from commands.webautomation.text_extraction import extract_text, MAX_CONTENT_CHARS
 
+# --- Shared HTTP Session ---
+# One pooled Session for every scrape, so repeated requests to a host reuse the
+# TCP/TLS connection instead of paying a new handshake each time.
+HTTP_POOL_CONNECTIONS = 16  # Number of hosts with a kept-alive pool
+HTTP_POOL_MAXSIZE = 8  # Connections kept per host
+HTTP_CHUNK_SIZE = 16 * 1024  # Bytes read from the response body per parse step
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36'
+}
 
-def scrape_website_content(url: str) -> dict:
+# --- Batch Scraping Configuration ---
+MAX_CONCURRENT_FETCHES = 8
+PER_HOST_CONCURRENCY = 2
+BATCH_DEADLINE_SECONDS = 30
+
+_session = None
+_session_lock = threading.Lock()
+_fetch_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES, thread_name_prefix="alpha-scrape")
+
+
+def get_http_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                retries = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                                allowed_methods=["GET", "HEAD"])
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE,
+                                      max_retries=retries)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+
+def scrape_website_content(url: str, timeout: float = 10) -> dict:
     """
     Scrapes the main textual content from a given website URL.
     This function focuses on extracting visible text from paragraphs, headings, and lists.
@@ -18,41 +60,40 @@ def scrape_website_content(url: str) -> dict:
 
     print(f"Attempting to scrape content from: {url}")
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Remove script and style elements to clean up text
-        for script_or_style in soup(["script", "style", "header", "footer", "nav", "aside", "form"]):
-            script_or_style.extract()
-
-        # Get all text from paragraphs, headings, and list items
-        # Consider using a more sophisticated text extraction library for complex sites if needed
-        text_elements = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'title'])
-
-        extracted_text = []
-        for element in text_elements:
-            # Clean up whitespace and ensure text is not empty
-            cleaned_text = element.get_text(separator=' ', strip=True)
-            if cleaned_text:
-                extracted_text.append(cleaned_text)
-
-        # Join the text with double newlines for better readability
-        full_text = "\n\n".join(extracted_text)
-
-        # Limit the text length to avoid hitting Gemini's context window limits
-        # (Approx 100,000 characters for Gemini 1.5 Pro, 32,000 for 1.0 Pro, 8,000 for Flash)
-        # We'll truncate to a reasonable amount, like 10,000 characters for safety
-        if len(full_text) > 10000:
-            full_text = full_text[:10000] + "\n\n[... content truncated for length ...]"
+        # Serve fresh cached text without touching the network
+        cache = get_response_cache()
+        cached = cache.get(url)
+        if cached and cached["fresh"]:
+            print(f"Cache hit for {url}. Length: {len(cached['content'])} characters.")
+            return {"success": True, "content": cached["content"], "from_cache": True}
+
+        # Stale entries are revalidated: an unchanged page answers 304 with no body
+        response = get_http_session().get(url, timeout=timeout, stream=True,
+                                          headers=cache.conditional_headers(cached))
+        try:
+            if response.status_code == 304 and cached:
+                cache.mark_revalidated(url)
+                print(f"Cached content for {url} is still current (304 Not Modified).")
+                return {"success": True, "content": cached["content"], "from_cache": True}
+            response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
+
+            # Parse the body incrementally while it downloads and stop reading once we have
+            # enough text. The limit avoids hitting Gemini's context window limits
+            # (Approx 100,000 characters for Gemini 1.5 Pro, 32,000 for 1.0 Pro, 8,000 for Flash)
+            # so we keep a reasonable amount, like 10,000 characters for safety.
+            if response.encoding is None:
+                response.encoding = "utf-8"
+            full_text = extract_text(response.iter_content(chunk_size=HTTP_CHUNK_SIZE, decode_unicode=True),
+                                     max_chars=MAX_CONTENT_CHARS)
+        finally:
+            response.close()  # Releases the connection; drops any unread remainder of the body
 
         if not full_text.strip():
             return {"success": False, "message": "Could not extract significant text content from the page."}
 
+        cache.put(url, full_text, etag=response.headers.get("ETag"),
+                  last_modified=response.headers.get("Last-Modified"))
+
         print(f"Successfully scraped content from {url}. Length: {len(full_text)} characters.")
         return {"success": True, "content": full_text}
 
@@ -67,18 +108,58 @@ def scrape_website_content(url: str) -> dict:
         return {"success": False, "message": f"An unexpected error occurred during scraping {url}: {e}"}
 
 
-# --- Function Declaration (Schema) for Gemini ---
-scrape_website_content_schema_dict = types.FunctionDeclaration(
-    name="scrape_website_content",
-    description="Scrapes the main textual content from a given website URL and returns it for summarization or analysis. It handles basic URL validation and extracts visible text.",
-    parameters=types.Schema(
-        type=types.Type.OBJECT,
-        properties={
-            "url": types.Schema(
-                type=types.Type.STRING,
-                description="The full URL of the website to scrape (e.g., 'https://www.example.com/article')."
-            )
-        },
-        required=["url"]
-    )
-)
\ No newline at end of file
+def scrape_websites_content(urls: list, deadline_seconds: float = BATCH_DEADLINE_SECONDS,
+                            per_host_limit: int = PER_HOST_CONCURRENCY) -> dict:
+    """
+    Scrapes several URLs concurrently over the shared session.
+    At most per_host_limit requests hit the same host at once, and the whole batch
+    stops after deadline_seconds; URLs not finished by then are reported as timed out.
+    Returns one result per URL, in the order given.
+    """
+    start = time.monotonic()
+    deadline = start + deadline_seconds
+    host_slots = {}
+    for url in urls:
+        host = urlparse(url if urlparse(url).scheme else "http://" + url).netloc.lower()
+        host_slots.setdefault(host, threading.BoundedSemaphore(per_host_limit))
+
+    def fetch(url):
+        fetch_start = time.monotonic()
+        host = urlparse(url if urlparse(url).scheme else "http://" + url).netloc.lower()
+        slot = host_slots[host]
+        if not slot.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            result = {"success": False, "message": f"Deadline exceeded while waiting to fetch {url}."}
+        else:
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    result = {"success": False, "message": f"Deadline exceeded before fetching {url}."}
+                else:
+                    result = scrape_website_content(url, timeout=min(10, remaining))
+            finally:
+                slot.release()
+        result = {"url": url, **result}
+        result["elapsed_ms"] = round((time.monotonic() - fetch_start) * 1000, 1)
+        return result
+
+    futures = [_fetch_executor.submit(fetch, url) for url in urls]
+    wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+
+    results = []
+    for url, future in zip(urls, futures):
+        if future.done():
+            results.append(future.result())
+        else:
+            future.cancel()
+            results.append({"url": url, "success": False,
+                            "message": f"Deadline of {deadline_seconds}s exceeded while scraping {url}."})
+
+    succeeded = sum(1 for result in results if result.get("success"))
+    cache_stats = get_response_cache().stats()
+    print(f"Batch scrape finished: {succeeded}/{len(urls)} URLs succeeded. "
+          f"Cache hits: {cache_stats['hits']}, misses: {cache_stats['misses']}, revalidated: {cache_stats['revalidated']}.")
+    return {
+        "success": succeeded > 0,
+        "results": results,
+        "elapsed_ms": round((time.monotonic() - start) * 1000, 1),
+    }
@@ -0,0 +1,250 @@
+# commands/webautomation/webdriver_pool.py
+# Process-wide pool of Chrome WebDrivers shared by every Selenium-based command.
+# Drivers are launched on demand, reused warm between calls, health-checked before
+# being handed out, evicted after sitting idle, and quit() on shutdown - except detached
+# pools, whose browsers the user is watching and which stay open after the process exits.
+
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+# --- Configuration (overridable through environment variables) ---
+WEBDRIVER_POOL_SIZE = int(os.getenv("ALPHA_WEBDRIVER_POOL_SIZE", "2"))
+WEBDRIVER_HEADLESS = os.getenv("ALPHA_WEBDRIVER_HEADLESS", "1") != "0"
+WEBDRIVER_IDLE_TIMEOUT = float(os.getenv("ALPHA_WEBDRIVER_IDLE_SECONDS", "300"))
+WEBDRIVER_ACQUIRE_TIMEOUT = float(os.getenv("ALPHA_WEBDRIVER_ACQUIRE_SECONDS", "60"))
+
+
+def _quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class WebDriverPool:
+    def __init__(self, size: int = WEBDRIVER_POOL_SIZE, headless: bool = WEBDRIVER_HEADLESS,
+                 idle_timeout: float = WEBDRIVER_IDLE_TIMEOUT, detach: bool = False):
+        self.size = max(1, size)
+        self.headless = headless
+        self.idle_timeout = idle_timeout  # None or <= 0 disables idle eviction
+        self.detach = detach  # Chrome outlives the driver: shutdown() leaves it open
+        self._idle = []  # [(driver, last_used)] - most recently used at the end
+        self._in_use = set()
+        self._launching = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._reaper = None
+
+    # --- Driver lifecycle ---
+    def _launch(self):
+        options = ChromeOptions()
+        options.add_argument("--incognito")
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1920,1080")
+            options.add_argument("--disable-gpu")
+        if self.detach:
+            options.add_experimental_option("detach", True)  # Keep the browser open after the process exits
+
+        # Selenium Manager will automatically find and manage the ChromeDriver.
+        service = ChromeService()
+        try:
+            driver = webdriver.Chrome(service=service, options=options)
+            if not self.headless:
+                driver.maximize_window()
+            print(f"WebDriver pool launched a new {'headless ' if self.headless else ''}Chrome instance.")
+            return driver
+        except WebDriverException as e:
+            print(f"Failed to launch new Chrome instance: {e}")
+            print("Please ensure:")
+            print("1. Your Chrome browser is installed and up-to-date.")
+            print("2. Your 'selenium' library is updated (pip install --upgrade selenium).")
+            raise
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            driver.current_url  # Round-trip to the browser; fails if Chrome crashed or was closed
+            return True
+        except Exception:
+            return False
+
+    def _start_reaper(self):
+        if self._reaper is not None or not self.idle_timeout or self.idle_timeout <= 0:
+            return
+        self._reaper = threading.Thread(target=self._reap_idle, name="webdriver-pool-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap_idle(self):
+        interval = min(30.0, self.idle_timeout)
+        while True:
+            time.sleep(interval)
+            expired = []
+            with self._cond:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                still_idle = []
+                for driver, last_used in self._idle:
+                    if now - last_used > self.idle_timeout:
+                        expired.append(driver)
+                    else:
+                        still_idle.append((driver, last_used))
+                self._idle = still_idle
+                if expired:
+                    self._cond.notify_all()
+            for driver in expired:
+                print("WebDriver pool: quitting idle Chrome instance.")
+                _quit_quietly(driver)
+
+    # --- Public API ---
+    def acquire(self, timeout: float = WEBDRIVER_ACQUIRE_TIMEOUT):
+        """Returns a healthy driver, reusing a warm one when available. Blocks while the pool is exhausted."""
+        deadline = time.monotonic() + timeout
+        while True:
+            driver = None
+            launch = False
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise WebDriverException("WebDriver pool has been shut down.")
+                    if self._idle:
+                        driver, _ = self._idle.pop()
+                        self._in_use.add(driver)
+                        break
+                    if len(self._in_use) + self._launching < self.size:
+                        self._launching += 1
+                        launch = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise WebDriverException(f"Timed out after {timeout}s waiting for a free WebDriver.")
+                    self._cond.wait(remaining)
+
+            if launch:
+                try:
+                    driver = self._launch()
+                except Exception:
+                    with self._cond:
+                        self._launching -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._launching -= 1
+                    self._in_use.add(driver)
+                    self._start_reaper()
+                return driver
+
+            if self._is_healthy(driver):
+                return driver
+
+            # Stale driver (crashed or closed by the user): drop it and try again
+            print("WebDriver pool: discarding unhealthy Chrome instance.")
+            with self._cond:
+                self._in_use.discard(driver)
+                self._cond.notify()
+            _quit_quietly(driver)
+
+    def release(self, driver, discard: bool = False):
+        """Returns a driver to the pool. Discarded drivers (or, unless detached, any after shutdown) are quit."""
+        with self._cond:
+            self._in_use.discard(driver)
+            keep = not discard and not self._closed
+            if keep:
+                self._idle.append((driver, time.monotonic()))
+            self._cond.notify()
+        if discard or (not keep and not self.detach):
+            _quit_quietly(driver)
+
+    @contextmanager
+    def lease(self, timeout: float = WEBDRIVER_ACQUIRE_TIMEOUT):
+        """with pool.lease() as driver: ... - the driver goes back to the pool afterwards."""
+        driver = self.acquire(timeout)
+        discard = False
+        try:
+            yield driver
+        except WebDriverException:
+            discard = not self._is_healthy(driver)
+            raise
+        finally:
+            self.release(driver, discard=discard)
+
+    def prewarm(self, count: int = 1):
+        """Launches drivers ahead of time so the next acquire() doesn't pay Chrome's cold start."""
+        for _ in range(count):
+            with self._cond:
+                total = len(self._idle) + len(self._in_use) + self._launching
+                if self._closed or len(self._idle) >= count or total >= self.size:
+                    return
+                self._launching += 1
+            try:
+                driver = self._launch()
+            except Exception:
+                with self._cond:
+                    self._launching -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._launching -= 1
+                self._idle.insert(0, (driver, time.monotonic()))
+                self._start_reaper()
+                self._cond.notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"idle": len(self._idle), "in_use": len(self._in_use), "size": self.size, "headless": self.headless}
+
+    def shutdown(self):
+        """
+        Quits every driver owned by the pool; drivers still leased are quit when released.
+        A detached pool only lets go of its drivers, leaving their browsers open.
+        """
+        with self._cond:
+            self._closed = True
+            idle = [driver for driver, _ in self._idle]
+            self._idle = []
+            self._cond.notify_all()
+        if self.detach:
+            return
+        for driver in idle:
+            _quit_quietly(driver)
+
+
+# --- Process-wide Pools ---
+# Scraping runs headless by default; commands the user watches (e.g. YouTube) use a single
+# visible browser that is kept warm and never evicted for idleness while the process runs,
+# and is detached, so it stays open for the user when the assistant exits.
+POOL_CONFIGS = {
+    "scraping": {"size": WEBDRIVER_POOL_SIZE, "headless": WEBDRIVER_HEADLESS, "idle_timeout": WEBDRIVER_IDLE_TIMEOUT},
+    "interactive": {"size": 1, "headless": False, "idle_timeout": None, "detach": True},
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_webdriver_pool(name: str = "scraping") -> WebDriverPool:
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = WebDriverPool(**POOL_CONFIGS[name])
+            _pools[name] = pool
+        return pool
+
+
+def shutdown_webdriver_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_webdriver_pools)
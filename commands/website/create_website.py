@@ -3,11 +3,11 @@ import os
 import json
 import webbrowser
 from commands.website.open_website import open_website
-from google.genai import types
+from commands.manifest import create_website_schema_dict
 
 # --- Configuration ---
 BASE_WEBSITE_DIR = os.path.join(os.path.expanduser("~"), "Websites")
-os.makedirs(BASE_WEBSITE_DIR, exist_ok=True) # Ensure base directory exists
+# Created on first use by create_website, not at import time.
 
 # --- MODIFIED FUNCTION: folder_path parameter removed ---
 def create_website(website_name: str = None, content: str = None) -> dict:
@@ -84,23 +84,3 @@ def create_website(website_name: str = None, content: str = None) -> dict:
         "website_opening": open_result
     }
     return combined_result
-
-# --- MODIFIED SCHEMA: folder_path parameter removed ---
-create_website_schema_dict = types.FunctionDeclaration(
-    name="create_website",
-    description="Creates a new folder and an index.html file inside it for a website in the default 'Websites' folder in your user directory, and automatically opens it.",
-    parameters=types.Schema(
-        type=types.Type.OBJECT,
-        properties={
-            "website_name": types.Schema(
-                type=types.Type.STRING,
-                description="The desired name for the website folder (e.g., 'my_new_blog', 'company_landing_page')."
-            ),
-            "content": types.Schema(
-                type=types.Type.STRING,
-                description="Optional HTML content for the index.html file. If not provided, a default template will be used. This parameter is typically filled by model's generation based on user's prompt."
-            )
-        },
-        required=["website_name"]
-    )
-)
\ No newline at end of file
@@ -1,7 +1,7 @@
 # commands/website/open_website.py
 import os
 import webbrowser
-from google.genai import types
+from commands.manifest import open_website_schema_dict
 
 def open_website(index_html_path: str = None) -> dict:
 
@@ -17,18 +17,3 @@ def open_website(index_html_path: str = None) -> dict:
         return {"success": True, "message": f"Website opened successfully in your default browser: {index_html_path}", "path": index_html_path}
     except Exception as e:
         return {"success": False, "message": f"Error opening website: {e}", "path": None}
-
-open_website_schema_dict = types.FunctionDeclaration(
-    name="open_website",
-    description="Opens the specified index.html file in the default web browser.",
-    parameters=types.Schema(
-        type=types.Type.OBJECT,
-        properties={
-            "index_html_path": types.Schema(
-                type=types.Type.STRING,
-                description="The absolute path to the index.html file to open."
-            )
-        },
-        required=["index_html_path"]
-    )
-)
\ No newline at end of file
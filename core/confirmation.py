@@ -0,0 +1,140 @@
+import os
+from core.locations import display_path
+
+# --- Local Tool Confirmations ---
+# After a tool runs, the model used to be called a second time just to turn its result
+# into "Done, I created the folder." Most commands already return a structured result
+# that says exactly that, so the message is rendered here instead. Only results that
+# need real summarizing (scraped pages, notices) go back to the model.
+
+LOCAL = "local"  # always render the confirmation locally
+MODEL = "model"  # always ask the model to write the reply
+MODEL_ON_SUCCESS = "model_on_success"  # model summarizes successful results; failures are rendered locally
+
+CONFIRMATION_POLICY = {
+    "create_folder": LOCAL,
+    "delete_folders": LOCAL,
+    "move_folders": LOCAL,
+    "rename_folders": LOCAL,
+    "restore_folders": LOCAL,
+    "create_python_file": LOCAL,
+    "create_website": LOCAL,
+    "open_website": LOCAL,
+    "open_youtube_trending": LOCAL,
+    "scrape_website_content": MODEL_ON_SUCCESS,
+    "scrape_websites_content": MODEL_ON_SUCCESS,
+    "open_gehu_btech_notice_and_return_content": MODEL_ON_SUCCESS,
+    "find_files": MODEL_ON_SUCCESS,
+}
+DEFAULT_POLICY = MODEL  # unknown tools: let the model explain the result
+
+# Set ALPHA_LOCAL_CONFIRMATIONS=0 to send every result to the model as before.
+LOCAL_CONFIRMATIONS_ENABLED = os.getenv("ALPHA_LOCAL_CONFIRMATIONS", "1") != "0"
+
+
+def _succeeded(result) -> bool:
+    if isinstance(result, dict):
+        if "success" in result:
+            return bool(result["success"])
+        if "results" in result:  # batch scrape: worth summarizing if any page came back
+            return any(item.get("success") for item in result["results"] if isinstance(item, dict))
+    if isinstance(result, str):
+        return not result.lstrip().startswith(("❌", "Error"))
+    return True
+
+
+def needs_model(function_result: dict) -> bool:
+    """Whether one {"name", "result"} entry from route_function_calls should go to the model."""
+    if not LOCAL_CONFIRMATIONS_ENABLED:
+        return True
+    policy = CONFIRMATION_POLICY.get(function_result["name"], DEFAULT_POLICY)
+    if policy == MODEL_ON_SUCCESS:
+        return _succeeded(function_result["result"])
+    return policy == MODEL
+
+
+def split_function_results(function_results: list):
+    """Returns (rendered locally, needs the model), each in the original order."""
+    local, model = [], []
+    for function_result in function_results:
+        (model if needs_model(function_result) else local).append(function_result)
+    return local, model
+
+
+# --- Renderers ---
+def _render_message(result) -> str:
+    prefix = "✅" if result.get("success") else "❌"
+    return f"{prefix} {result.get('message', 'Done.' if result.get('success') else 'Failed.')}"
+
+
+def _render_folder_batch(result) -> str:
+    """One line per operation of a commands.folder.batch result."""
+    if not isinstance(result, dict) or "results" not in result:
+        return _render(result)
+    lines = [item["message"] for item in result["results"]]
+    if result.get("rolled_back") or (not result.get("success") and not any(
+            item["status"] == "done" for item in result["results"])):
+        lines.append("Nothing was changed.")
+    return "\n".join(lines) or "Done."
+
+
+def _render_created_folders(result) -> str:
+    if not isinstance(result, dict):
+        return str(result)
+    if not result.get("success", True):
+        return _render_folder_batch(result)
+    created = result.get("created", [])
+    if not created:
+        return "⚠️ No folders were created."
+    by_parent = {}  # each folder under the location it is actually in, in creation order
+    for path in created:
+        by_parent.setdefault(display_path(os.path.dirname(path)), []).append(os.path.basename(path))
+    lines = []
+    for location, names in by_parent.items():
+        listed = ", ".join(f"'{name}'" for name in names)
+        lines.append(f"✅ Created {len(names)} folder{'s' if len(names) != 1 else ''} ({listed}) in {location}.")
+    return "\n".join(lines)
+
+
+def _render_website(result) -> str:
+    if not isinstance(result, dict) or "website_creation" not in result:
+        return _render(result)
+    lines = [_render_message(result["website_creation"])]
+    if result.get("website_opening"):
+        lines.append(_render_message(result["website_opening"]))
+    return "\n".join(lines)
+
+
+def _render_scrape_failure(result) -> str:
+    if isinstance(result, dict) and "results" in result:
+        return "\n".join(f"❌ {item.get('url', '')}: {item.get('message', 'Failed.')}" for item in result["results"])
+    return _render(result)
+
+
+def _render(result) -> str:
+    """Fallback for the shapes commands return: message dicts, ✅/❌ line lists and plain strings."""
+    if isinstance(result, dict) and "message" in result:
+        return _render_message(result)
+    if isinstance(result, (list, tuple)):
+        return "\n".join(str(line) for line in result) or "Done."
+    if result is None:
+        return "Done."
+    return str(result)
+
+
+RENDERERS = {
+    "create_folder": _render_created_folders,
+    "delete_folders": _render_folder_batch,
+    "move_folders": _render_folder_batch,
+    "rename_folders": _render_folder_batch,
+    "restore_folders": _render_folder_batch,
+    "create_website": _render_website,
+    "scrape_website_content": _render_scrape_failure,
+    "scrape_websites_content": _render_scrape_failure,
+}
+
+
+def render_confirmation(function_results: list) -> str:
+    """The user-facing message for results that don't need the model."""
+    return "\n".join(RENDERERS.get(item["name"], _render)(item["result"]) for item in function_results)
+
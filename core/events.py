@@ -0,0 +1,110 @@
+# core/events.py
+# Progress events from tools that take a while (a large move across drives), for
+# whatever is showing the turn: the CLI prints them, the GUIs put them under the
+# spinner. Tools run on worker threads and emit() calls every listener on the emitting
+# thread, so a GUI listener has to hand the event over to its own thread (a Qt signal
+# does that).
+#
+# An event is a dict with a "type". Progress events look like:
+#   {"type": "progress", "tool": "move_folders", "item": "photos",
+#    "phase": "copying" | "done", "bytes_done": 1048576, "bytes_total": 5242880,
+#    "files_done": 3, "files_total": 12}
+
+import threading
+import time
+
+PROGRESS_INTERVAL = 0.25  # seconds between progress events for the same item
+
+_listeners = []
+_lock = threading.Lock()
+
+
+def subscribe(listener):
+    """Calls listener(event) for every event; returns a function that unsubscribes it."""
+    with _lock:
+        _listeners.append(listener)
+
+    def unsubscribe():
+        with _lock:
+            if listener in _listeners:
+                _listeners.remove(listener)
+
+    return unsubscribe
+
+
+def emit(event_type: str, **data):
+    event = {"type": event_type, **data}
+    with _lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        try:
+            listener(event)
+        except Exception as e:
+            # A broken display must never fail the tool that reported progress
+            print(f"[Events] Listener failed: {e}")
+
+
+def _size(count: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if count < 1024 or unit == "GB":
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+
+
+def format_progress(event: dict) -> str:
+    """One line for a progress event, e.g. "Moving 'photos': 1.2 GB of 3.4 GB (35%), 120/400 files"."""
+    verb = {"copying": "Moving", "done": "Moved"}.get(event.get("phase"), "Working on")
+    line = f"{verb} '{event.get('item', '')}'"
+    total = event.get("bytes_total") or 0
+    if total:
+        done = event.get("bytes_done", 0)
+        line += f": {_size(done)} of {_size(total)} ({done * 100 // total}%)"
+    if event.get("files_total"):
+        line += f", {event.get('files_done', 0)}/{event['files_total']} files"
+    return line
+
+
+class ProgressReporter:
+    """
+    Accumulates progress for one item from any number of threads and emits at most one
+    event per PROGRESS_INTERVAL; phase changes are always emitted.
+    """
+
+    def __init__(self, tool: str, item: str):
+        self.tool = tool
+        self.item = item
+        self.phase = None
+        self.bytes_done = self.bytes_total = 0
+        self.files_done = self.files_total = 0
+        self._last_emit = 0.0
+        self._lock = threading.Lock()
+
+    def start(self, phase: str, bytes_total: int = 0, files_total: int = 0):
+        with self._lock:
+            self.phase = phase
+            self.bytes_done, self.bytes_total = 0, bytes_total
+            self.files_done, self.files_total = 0, files_total
+        self._emit(force=True)
+
+    def advance(self, bytes_done: int = 0, files_done: int = 0):
+        with self._lock:
+            self.bytes_done += bytes_done
+            self.files_done += files_done
+        self._emit()
+
+    def finish(self):
+        with self._lock:
+            self.phase = "done"
+            self.bytes_done, self.files_done = self.bytes_total, self.files_total
+        self._emit(force=True)
+
+    def _emit(self, force: bool = False):
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_emit < PROGRESS_INTERVAL:
+                return
+            self._last_emit = now
+            event = {"tool": self.tool, "item": self.item, "phase": self.phase,
+                     "bytes_done": self.bytes_done, "bytes_total": self.bytes_total,
+                     "files_done": self.files_done, "files_total": self.files_total}
+        emit("progress", **event)
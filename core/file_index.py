@@ -0,0 +1,422 @@
+# core/file_index.py
+# A persistent index of every file and folder below the user's locations (the same
+# roots as core.locations), for the find_files command and for the folder commands'
+# "the folder named X somewhere in Documents" (find_folders, used by
+# core.locations.locate_folder): names, sizes and mtimes in SQLite, with an FTS5 trigram
+# index over the names so substring, glob and fuzzy lookups don't scan the table.
+#
+# Building is incremental and happens on a background thread: a folder is re-listed only
+# when its mtime changed (an entry was added, removed or renamed in it), so refreshing an
+# unchanged tree costs one stat per folder. Writes are committed every COMMIT_EVERY
+# changes, so lookups see a first build filling in. Sizes and mtimes of files edited in
+# place can lag until their folder changes; lookups stat what they return, so results
+# always show the current values.
+#
+# Lookups:
+#   substring  names containing the text, ignoring case (the trigram index; one- and
+#              two-letter texts fall back to a LIKE scan)
+#   glob       shell patterns on the name (*.pdf, report_202?.xlsx), ignoring case
+#   fuzzy      names like the text: candidates sharing two of the query's rarest
+#              trigrams (document counts from an fts5vocab table), ranked by difflib
+# Candidates are capped (CANDIDATES) and ranked in Python: exact names first, then
+# prefixes, shorter names and recently modified ones.
+
+import difflib
+import fnmatch
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from core.locations import index_roots, SKIPPED_FOLDERS
+from core.paths import CACHE_DIR
+
+FILE_INDEX_REFRESH_SECONDS = float(os.getenv("ALPHA_FILE_INDEX_REFRESH_SECONDS", "60"))
+FILE_INDEX_MAX_DEPTH = int(os.getenv("ALPHA_FILE_INDEX_MAX_DEPTH", "20"))  # levels below a location
+FILE_INDEX_MAX_ENTRIES = int(os.getenv("ALPHA_FILE_INDEX_MAX_ENTRIES", "2000000"))
+COMMIT_EVERY = 5000  # changed rows per write transaction
+CANDIDATES = 2000  # rows fetched per lookup before ranking
+FUZZY_CANDIDATES = 500
+FUZZY_TRIGRAMS = 4  # rarest query trigrams used to find fuzzy candidates
+FUZZY_RANKED = 5000  # bm25-order fuzzy candidates only when at most this many can match
+FUZZY_CUTOFF = 0.6
+READY_TIMEOUT = 5.0  # seconds find_folders waits for the first build
+
+SUBSTRING, GLOB, FUZZY = "substring", "glob", "fuzzy"
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+def _squash(name: str) -> str:
+    return re.sub(r"[\W_]+", "", name.lower())
+
+
+def _fuzzy_score(matcher: difflib.SequenceMatcher, name: str) -> float:
+    """
+    How well a squashed name matches the squashed query set as matcher's seq2: the better of
+    their similarity and how much of the query appears, in order, in the name (when some
+    of it appears as a run of three characters or more), so "invocie" still finds
+    "Invoice_March.pdf".
+    """
+    matcher.set_seq1(name)
+    blocks = matcher.get_matching_blocks()
+    if max(block.size for block in blocks) < 3:
+        return matcher.ratio()
+    return max(matcher.ratio(), 0.9 * sum(block.size for block in blocks) / len(matcher.b))
+
+
+def _phrase(text: str) -> str:
+    """An FTS5 string literal: with the trigram tokenizer it matches text as a substring."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _glob_to_like(pattern: str) -> str:
+    """A LIKE pattern matching at least what the glob matches (checked with fnmatch afterwards)."""
+    like = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "*":
+            like.append("%")
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                like.append("_")  # a lone "[" is a literal to fnmatch; "_" covers it
+            else:
+                like.append("_")
+                i = end
+        elif char in "?%_":
+            like.append("_")  # LIKE's own wildcards can't be escaped inside FTS5; "_" covers them
+        else:
+            like.append(char)
+        i += 1
+    return "".join(like)
+
+
+def _indexed(entry) -> bool:
+    return not entry.name.startswith(".") and entry.name not in SKIPPED_FOLDERS
+
+
+def _range(path: str):
+    """(path, lower, upper): path itself and everything below it, as an index range on paths."""
+    prefix = path.rstrip(os.sep) + os.sep
+    return path, prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+class FileIndex:
+    """Files and folders below roots in the SQLite database at path (see the header)."""
+
+    def __init__(self, roots: list, path: str):
+        self.roots = roots
+        self.path = path
+        self._read_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._reader = None
+        self._capped = False
+        self._ready = threading.Event()  # set once a build has finished, in this process or an earlier one
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS dirs ("
+                " id INTEGER PRIMARY KEY,"
+                " path TEXT NOT NULL UNIQUE,"
+                " mtime_ns INTEGER NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " id INTEGER PRIMARY KEY,"
+                " dir_id INTEGER NOT NULL,"
+                " name TEXT NOT NULL,"
+                " is_dir INTEGER NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " mtime REAL NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS entries_dir ON entries (dir_id);"
+                "CREATE INDEX IF NOT EXISTS entries_name ON entries (name COLLATE NOCASE);"
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+                "CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5("
+                " name, content='entries', content_rowid='id', tokenize='trigram');"
+                "CREATE VIRTUAL TABLE IF NOT EXISTS names_vocab USING fts5vocab(names, 'row');"
+                # Names never change in place (a rename is a delete and an insert)
+                "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN"
+                " INSERT INTO names (rowid, name) VALUES (new.id, new.name); END;"
+                "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN"
+                " INSERT INTO names (names, rowid, name) VALUES ('delete', old.id, old.name); END;"
+            )
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'complete'").fetchone():
+                self._ready.set()
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")  # lookups read while the indexer writes
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # --- Indexing ---
+    @staticmethod
+    def _forget(conn, path: str):
+        """Drops the folder at path and everything indexed below it."""
+        conn.execute("DELETE FROM entries WHERE dir_id IN (SELECT id FROM dirs WHERE path = ? OR (path >= ? AND path < ?))",
+                     _range(path))
+        conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", _range(path))
+
+    @staticmethod
+    def _scan(path: str) -> dict:
+        """name -> (is_dir, size, mtime) for the indexed entries of the folder at path."""
+        found = {}
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not _indexed(entry):
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    info = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                found[entry.name] = (int(is_dir), 0 if is_dir else info.st_size, info.st_mtime)
+        return found
+
+    def refresh(self) -> int:
+        """Brings the index up to date; returns the number of rows changed."""
+        with self._refresh_lock:
+            conn = self._connect()
+            try:
+                changed = self._refresh(conn)
+            finally:
+                conn.close()
+        self._ready.set()
+        return changed
+
+    def _refresh(self, conn) -> int:
+        known = {path: (dir_id, mtime_ns) for dir_id, path, mtime_ns in conn.execute("SELECT id, path, mtime_ns FROM dirs")}
+        subfolders = {}  # known folder -> names of the folders in it, as indexed
+        for path, name in conn.execute("SELECT d.path, e.name FROM entries e JOIN dirs d ON d.id = e.dir_id"
+                                       " WHERE e.is_dir = 1"):
+            subfolders.setdefault(path, []).append(name)
+        total = conn.execute("SELECT count(*) FROM entries").fetchone()[0]
+
+        for path in known:
+            if path not in self.roots and os.path.dirname(path) not in known:
+                self._forget(conn, path)  # a root that is no longer configured
+        changed = pending = 0
+        stack = [(root, 0) for root in self.roots]
+        while stack:
+            path, depth = stack.pop()
+            row = known.get(path)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                if row:
+                    self._forget(conn, path)
+                continue
+            if row and row[1] == mtime_ns:
+                names = subfolders.get(path, [])
+            else:
+                try:
+                    found = self._scan(path)
+                except OSError:
+                    continue
+                if row:
+                    dir_id = row[0]
+                    conn.execute("UPDATE dirs SET mtime_ns = ? WHERE id = ?", (mtime_ns, dir_id))
+                else:
+                    dir_id = conn.execute("INSERT INTO dirs (path, mtime_ns) VALUES (?, ?)", (path, mtime_ns)).lastrowid
+                indexed = {name: (entry_id, is_dir, size, mtime) for entry_id, name, is_dir, size, mtime in conn.execute(
+                    "SELECT id, name, is_dir, size, mtime FROM entries WHERE dir_id = ?", (dir_id,))}
+                for name, (entry_id, is_dir, size, mtime) in indexed.items():
+                    current = found.get(name)
+                    if current is None or current[0] != is_dir:
+                        conn.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+                        if is_dir:
+                            self._forget(conn, os.path.join(path, name))
+                        total -= 1
+                        changed += 1
+                    elif current != (is_dir, size, mtime):
+                        conn.execute("UPDATE entries SET size = ?, mtime = ? WHERE id = ?", (current[1], current[2], entry_id))
+                        changed += 1
+                new = [(dir_id, name, *info) for name, info in found.items()
+                       if name not in indexed or indexed[name][1] != info[0]]
+                if total + len(new) > FILE_INDEX_MAX_ENTRIES:
+                    new = new[:max(0, FILE_INDEX_MAX_ENTRIES - total)]
+                    if not self._capped:
+                        self._capped = True
+                        print(f"[Index] Stopped at {FILE_INDEX_MAX_ENTRIES} files (ALPHA_FILE_INDEX_MAX_ENTRIES)")
+                conn.executemany("INSERT INTO entries (dir_id, name, is_dir, size, mtime) VALUES (?, ?, ?, ?, ?)", new)
+                total += len(new)
+                changed += len(new)
+                names = [name for name, info in found.items() if info[0]]
+                pending += len(found) + 1
+                if pending >= COMMIT_EVERY:
+                    conn.commit()
+                    pending = 0
+            if depth < FILE_INDEX_MAX_DEPTH:
+                stack.extend((os.path.join(path, name), depth + 1) for name in names)
+        conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                         [("complete", str(time.time())), ("entries", str(total))])
+        conn.commit()
+        return changed
+
+    def start(self, interval: float = FILE_INDEX_REFRESH_SECONDS):
+        def run():
+            while True:
+                start = time.perf_counter()
+                try:
+                    changed = self.refresh()
+                    if changed:
+                        print(f"[Index] {changed} file index changes in {time.perf_counter() - start:.1f}s")
+                except Exception as e:
+                    print(f"[Index] File index refresh failed: {e}")
+                time.sleep(interval)
+        threading.Thread(target=run, name="alpha-file-index", daemon=True).start()
+
+    # --- Lookups ---
+    @property
+    def ready(self) -> bool:
+        """True once the index holds a finished build (possibly stale)."""
+        return self._ready.is_set()
+
+    def stats(self) -> dict:
+        """{"entries", "complete"} as of the last finished refresh; complete is False until the first one."""
+        with self._read_lock:
+            meta = dict(self._reader_conn().execute("SELECT key, value FROM meta"))
+        return {"entries": int(meta.get("entries", 0)), "complete": "complete" in meta}
+
+    def _reader_conn(self):
+        if self._reader is None:
+            self._reader = self._connect()
+        return self._reader
+
+    def _select(self, source: str, where: list, params: list, kind: str, within: str, order: str, limit: int) -> list:
+        sql = ("SELECT e.id, d.path, e.name, e.is_dir, e.size, e.mtime" + source +
+               " JOIN dirs d ON d.id = e.dir_id WHERE " + " AND ".join(where or ["1"]))
+        if kind in ("file", "folder"):
+            sql += " AND e.is_dir = ?"
+            params = params + [int(kind == "folder")]
+        if within:
+            sql += " AND (d.path = ? OR (d.path >= ? AND d.path < ?))"
+            params = params + list(_range(within))
+        sql += (f" ORDER BY {order}" if order else "") + " LIMIT ?"
+        with self._read_lock:
+            return self._reader_conn().execute(sql, params + [limit]).fetchall()
+
+    def search(self, query: str, mode: str = None, kind: str = "any", within: str = None, limit: int = 20):
+        """
+        Returns (mode, rows, capped): rows of (path, name, is_dir, size, mtime), best first.
+        mode is SUBSTRING, GLOB or FUZZY; None picks GLOB for patterns with wildcards and
+        SUBSTRING otherwise, falling back to FUZZY when nothing contains the text.
+        capped means there were more candidates than were ranked.
+        """
+        query = query.strip()
+        if not query:
+            return mode or SUBSTRING, [], False
+        if mode is None:
+            if _GLOB_CHARS.search(query):
+                mode = GLOB
+            else:
+                mode, rows, capped = self.search(query, SUBSTRING, kind, within, limit)
+                return (mode, rows, capped) if rows else self.search(query, FUZZY, kind, within, limit)
+
+        lowered = query.lower()
+        fts = " FROM names JOIN entries e ON e.id = names.rowid"
+        plain = " FROM entries e"
+        if mode == GLOB:
+            like = _glob_to_like(lowered)
+            if len(re.sub(r"[%_]", "", like)) >= 3:
+                candidates = self._select(fts, ["names.name LIKE ?"], [like], kind, within, None, CANDIDATES)
+            else:  # no three literal characters for the trigram index to use
+                candidates = self._select(plain, ["e.name LIKE ?"], [like], kind, within, None, CANDIDATES)
+            candidates = [row for row in candidates if fnmatch.fnmatchcase(row[2].lower(), lowered)]
+            rank = lambda row: (-row[5], len(row[2]))
+        elif mode == FUZZY:
+            # Trigrams within words: the indexed names separate them with "_", "-", "." or spaces
+            grams = sorted({word[i:i + 3] for word in re.findall(r"[^\W_]+", lowered) for i in range(len(word) - 2)})
+            if not grams:
+                return mode, [], False
+            with self._read_lock:
+                counts = dict(self._reader_conn().execute(
+                    f"SELECT term, doc FROM names_vocab WHERE term IN ({', '.join('?' * len(grams))})", grams))
+            # Ones that occur nowhere are the typos. Requiring two of the rarest keeps common
+            # trigrams from pulling in a large part of the index; ranking by bm25 costs time
+            # per match, so it is skipped when the pairs can match many names.
+            rare = sorted((gram for gram in grams if counts.get(gram)), key=counts.get)[:FUZZY_TRIGRAMS]
+            if not rare:
+                return mode, [], False
+            pairs = [(a, b) for i, a in enumerate(rare) for b in rare[i + 1:]] or [(rare[0], rare[0])]
+            match = " OR ".join(f"({_phrase(a)} AND {_phrase(b)})" for a, b in pairs)
+            bound = sum(min(counts[a], counts[b]) for a, b in pairs)
+            candidates = self._select(fts, ["names MATCH ?"], [match], kind, within,
+                                      "names.rank" if bound <= FUZZY_RANKED else None, FUZZY_CANDIDATES)
+            matcher = difflib.SequenceMatcher(None, b=_squash(query), autojunk=False)
+            scores = {row[0]: _fuzzy_score(matcher, _squash(row[2])) for row in candidates}
+            candidates = [row for row in candidates if scores[row[0]] >= FUZZY_CUTOFF]
+            rank = lambda row: (-scores[row[0]], len(row[2]), -row[5])
+            capped = False
+        else:
+            # Exact names come from the name index, so they are never lost to the candidate cap
+            exact = self._select(plain, ["e.name = ? COLLATE NOCASE"], [query], kind, within, None, limit)
+            if len(lowered) >= 3:
+                candidates = self._select(fts, ["names MATCH ?"], [_phrase(query)], kind, within, None, CANDIDATES)
+            else:
+                candidates = self._select(plain, ["e.name LIKE ?"], [f"%{lowered}%"], kind, within, None, CANDIDATES)
+            seen = {row[0] for row in exact}
+            candidates = exact + [row for row in candidates if row[0] not in seen]
+            rank = lambda row: (row[2].lower() != lowered, not row[2].lower().startswith(lowered), len(row[2]), -row[5])
+        if mode != FUZZY:
+            capped = len(candidates) >= CANDIDATES
+        candidates.sort(key=rank)
+
+        rows = []
+        for _, folder, name, is_dir, size, mtime in candidates:
+            path = os.path.join(folder, name)
+            try:
+                info = os.stat(path)  # current values; skips what was deleted since the last refresh
+            except OSError:
+                continue
+            rows.append((path, name, bool(is_dir), 0 if is_dir else info.st_size, info.st_mtime))
+            if len(rows) >= limit:
+                break
+        return mode, rows, capped
+
+    def find_folders(self, name: str, within: str = None, limit: int = 5) -> list:
+        """
+        [(score, folder)] for the folders whose name best matches name, best first. Folders
+        with the same name (ignoring case) score 1.0 and, when there are any, are all that is
+        returned; otherwise the closest names are, scored below 1.0. name may carry parent
+        folders ("work/reports"). Only folders below within, if given, and only folders that
+        still exist. Waits up to READY_TIMEOUT for the first build.
+        """
+        self._ready.wait(READY_TIMEOUT)
+        parts = [part for part in re.split(r"[\\/]+", name.strip().lower()) if part]
+        if not parts:
+            return []
+        leaf, suffix = parts[-1], os.sep + os.sep.join(parts)
+
+        def wanted(path):
+            # "work/reports" only matches reports folders inside a work folder
+            return len(parts) == 1 or path.lower().endswith(suffix)
+
+        exact = self._select(" FROM entries e", ["e.name = ? COLLATE NOCASE"], [leaf], "folder", within, None, CANDIDATES)
+        paths = sorted((os.path.join(folder, folder_name) for _, folder, folder_name, *_ in exact),
+                       key=lambda path: (path.count(os.sep), path))
+        found = [(1.0, path) for path in paths if wanted(path) and os.path.isdir(path)]
+        if found:
+            return found[:limit]
+        matcher = difflib.SequenceMatcher(None, b=_squash(leaf), autojunk=False)
+        _, rows, _ = self.search(leaf, FUZZY, "folder", within, FUZZY_CANDIDATES if len(parts) > 1 else limit)
+        return [(min(0.99, _fuzzy_score(matcher, _squash(folder_name))), path)
+                for path, folder_name, *_ in rows if wanted(path)][:limit]
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_file_index() -> FileIndex:
+    """The process-wide file index; its background refresh starts with the first call."""
+    global _index
+    roots = index_roots() if _index is None else None
+    with _lock:
+        if _index is None:
+            _index = FileIndex(roots, os.path.join(CACHE_DIR, "file_index.db"))
+            _index.start()
+        return _index
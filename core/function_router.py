@@ -1,3 +1,6 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 try:
     from commands.command_registry import executable_functions
 except ImportError:
@@ -6,6 +9,30 @@ except ImportError:
 
     executable_functions = {}
 
+# --- Batched Dispatch Configuration ---
+# Upper bound on how many tool calls run at the same time. The pool is process-wide, so
+# in server mode every session's tools share it.
+MAX_PARALLEL_TOOL_CALLS = int(os.getenv("ALPHA_TOOL_WORKERS", "4"))
+
+# Commands that touch the same resource are not independent: the model may ask to
+# create a folder and then move it in the same turn. Calls sharing a group run one
+# after another in the order the model emitted them; everything else runs in parallel.
+SERIAL_GROUPS = {
+    "create_folder": "filesystem",
+    "delete_folders": "filesystem",
+    "move_folders": "filesystem",
+    "rename_folders": "filesystem",
+    "restore_folders": "filesystem",
+    "create_python_file": "filesystem",
+    "find_files": "filesystem",
+    "create_website": "filesystem",
+    "open_youtube_trending": "browser",
+    "open_gehu_btech_notice_and_return_content": "browser",
+}
+
+_tool_executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_TOOL_CALLS, thread_name_prefix="alpha-tool")
+
+
 def route_function_call(function_call):
     func_name = function_call.name
 
@@ -30,4 +57,63 @@ def route_function_call(function_call):
             return f"❌ Error during execution of function '{func_name}': {e}"
     else:
         print(f"❌ Error: Model requested unknown function: {func_name}")
-        return f"❌ Error: Unknown function requested by model: {func_name}"
\ No newline at end of file
+        return f"❌ Error: Unknown function requested by model: {func_name}"
+
+
+def _routed_result(function_call) -> dict:
+    return {"name": function_call.name, "result": route_function_call(function_call)}
+
+
+def _cancelled_result(function_call) -> dict:
+    return {"name": function_call.name, "result": f"❌ Cancelled before '{function_call.name}' started."}
+
+
+def _run_serial(function_calls, cancelled=None) -> list:
+    results = []
+    for function_call in function_calls:
+        if cancelled is not None and cancelled.is_set():
+            results.append(_cancelled_result(function_call))
+        else:
+            results.append(_routed_result(function_call))
+    return results
+
+
+def route_function_calls(function_calls, cancelled=None) -> list:
+    """
+    Executes every function call the model produced in one turn.
+    Independent calls run concurrently on a bounded thread pool; calls that share a
+    SERIAL_GROUPS entry run in model order. Returns one dict per call, in the same
+    order as the input, with the call's name and result.
+    cancelled is an optional threading.Event: once it is set, calls that have not
+    started yet are skipped (a running command is never interrupted).
+    """
+    function_calls = list(function_calls)
+    if not function_calls:
+        return []
+    if len(function_calls) == 1:
+        # Still on the pool: with several sessions in one process it bounds how many tools run at once
+        return _tool_executor.submit(_run_serial, function_calls, cancelled).result()
+
+    # Bucket calls: each serial group becomes one ordered batch, every other call its own batch.
+    batches = []
+    group_batches = {}
+    for index, function_call in enumerate(function_calls):
+        group = SERIAL_GROUPS.get(function_call.name)
+        if group is None:
+            batches.append([(index, function_call)])
+        elif group in group_batches:
+            group_batches[group].append((index, function_call))
+        else:
+            group_batches[group] = [(index, function_call)]
+            batches.append(group_batches[group])
+
+    futures = [
+        (batch, _tool_executor.submit(_run_serial, [function_call for _, function_call in batch], cancelled))
+        for batch in batches
+    ]
+
+    results = [None] * len(function_calls)
+    for batch, future in futures:
+        for (index, _), call_result in zip(batch, future.result()):
+            results[index] = call_result
+    return results
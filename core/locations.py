@@ -0,0 +1,225 @@
+# core/locations.py
+# Where "Desktop", "Documents", ... are on this machine, and how the folder commands find
+# "the folder named X somewhere in Documents" without walking the disk.
+#
+# Locations: the usual ~/Desktop, ~/Documents, ... layout, overridden by the platform's
+# own settings (the User Shell Folders registry key on Windows, which follows OneDrive
+# redirection; XDG user-dirs on Linux) and by ALPHA_LOCATIONS ("Name=path" pairs
+# separated by os.pathsep). Only folders that exist count. "Home" is the home folder.
+# The folder commands never delete, move or rename a location itself, a hidden folder or
+# ALPHA_CACHE_DIR (protected_folder), so "Home" can't reach ~/Desktop, ~/.ssh or ~/.alpha.
+#
+# Folders nested below a location are looked up in the one background index of the
+# locations, core.file_index (every location but Home, which holds the others; hidden
+# folders and tool caches like node_modules are not indexed). A lookup that finds nothing
+# refreshes the index once before giving up.
+
+import os
+import re
+import sys
+import threading
+
+from core.paths import CACHE_DIR
+
+LOCATION_NAMES = ("Desktop", "Documents", "Downloads", "Pictures", "Music", "Videos")
+SKIPPED_FOLDERS = {"node_modules", "__pycache__", "site-packages", "venv", "$RECYCLE.BIN", "System Volume Information"}
+
+# What people call the locations, lowercased
+_ALIASES = {
+    "docs": "documents", "document": "documents", "my documents": "documents",
+    "download": "downloads", "my downloads": "downloads",
+    "picture": "pictures", "photos": "pictures", "my pictures": "pictures",
+    "video": "videos", "movies": "videos", "my videos": "videos",
+    "~": "home", "home folder": "home", "user folder": "home",
+}
+
+_XDG_KEYS = {"DESKTOP": "Desktop", "DOCUMENTS": "Documents", "DOWNLOAD": "Downloads", "PICTURES": "Pictures",
+             "MUSIC": "Music", "VIDEOS": "Videos"}
+_WINDOWS_KEYS = {"Desktop": "Desktop", "Personal": "Documents", "{374DE290-123F-4565-9164-39C4925E467B}": "Downloads",
+                 "My Pictures": "Pictures", "My Music": "Music", "My Video": "Videos"}
+
+_user_dirs = None
+_lock = threading.Lock()
+
+
+# --- Locations ---
+def _xdg_dirs(home: str) -> dict:
+    found = {}
+    config = os.path.join(os.getenv("XDG_CONFIG_HOME") or os.path.join(home, ".config"), "user-dirs.dirs")
+    try:
+        with open(config, encoding="utf-8") as f:
+            for line in f:
+                match = re.match(r'\s*XDG_(\w+)_DIR\s*=\s*"(.*)"\s*$', line)
+                if match and match.group(1) in _XDG_KEYS:
+                    found[_XDG_KEYS[match.group(1)]] = match.group(2).replace("$HOME", home)
+    except OSError:
+        pass
+    for key, name in _XDG_KEYS.items():
+        if os.getenv(f"XDG_{key}_DIR"):
+            found[name] = os.getenv(f"XDG_{key}_DIR")
+    # user-dirs.dirs disables a folder by pointing it at $HOME
+    return {name: os.path.normpath(path) for name, path in found.items()
+            if os.path.normpath(path) != os.path.normpath(home)}
+
+
+def _windows_dirs() -> dict:
+    try:
+        import winreg
+    except ImportError:
+        return {}
+    found = {}
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER,
+                            r"Software\Microsoft\Windows\CurrentVersion\Explorer\User Shell Folders") as key:
+            for value, name in _WINDOWS_KEYS.items():
+                try:
+                    found[name] = os.path.expandvars(winreg.QueryValueEx(key, value)[0])
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return found
+
+
+def _configured_dirs() -> dict:
+    found = {}
+    for pair in os.getenv("ALPHA_LOCATIONS", "").split(os.pathsep):
+        name, _, path = pair.partition("=")
+        if name.strip() and path.strip():
+            found[name.strip()] = os.path.expanduser(path.strip())
+    return found
+
+
+def user_dirs() -> dict:
+    """Location name -> folder, for the locations that exist on this machine."""
+    global _user_dirs
+    with _lock:
+        if _user_dirs is None:
+            home = os.path.expanduser("~")
+            dirs = {name: os.path.join(home, name) for name in LOCATION_NAMES}
+            if sys.platform == "win32":
+                dirs.update(_windows_dirs())
+            elif sys.platform != "darwin":
+                dirs.update(_xdg_dirs(home))
+            dirs.update(_configured_dirs())
+            _user_dirs = {"Home": home, **{name: os.path.abspath(path) for name, path in dirs.items()
+                                           if os.path.isdir(path)}}
+        return dict(_user_dirs)
+
+
+def location_names() -> list:
+    return list(user_dirs())
+
+
+def _within(path: str, root: str) -> bool:
+    path, root = os.path.normcase(path), os.path.normcase(root)
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def resolve_location(location: str):
+    """
+    The folder a location refers to, or None: a location name or alias ("Documents",
+    "docs"), optionally with a subfolder ("Documents/work"), or an absolute path inside
+    one of the locations.
+    """
+    if not location or not location.strip():
+        return None
+    dirs = user_dirs()
+    text = os.path.expanduser(location.strip())
+    if os.path.isabs(text):
+        path = os.path.normpath(text)
+        return path if os.path.isdir(path) and any(_within(path, root) for root in dirs.values()) else None
+    first, _, rest = text.replace("\\", "/").partition("/")
+    key = first.strip().lower()
+    root = {name.lower(): path for name, path in dirs.items()}.get(_ALIASES.get(key, key))
+    if root is None:
+        return None
+    path = os.path.normpath(os.path.join(root, rest)) if rest.strip("/") else root
+    return path if os.path.isdir(path) and _within(path, root) else None  # no escaping through ".."
+
+
+def display_path(path: str) -> str:
+    """path relative to the innermost location holding it ("Documents/work"), for messages."""
+    best = None
+    for name, root in user_dirs().items():
+        if _within(path, root) and (best is None or len(root) > len(best[1])):
+            best = (name, root)
+    if best is None:
+        return path
+    relative = os.path.relpath(path, best[1])
+    return best[0] if relative == "." else os.path.join(best[0], relative)
+
+
+def unknown_location_message(location: str) -> str:
+    return f"❌ Invalid location '{location}'. Choose from: {', '.join(location_names())}"
+
+
+def protected_folder(path: str, locations_allowed: bool = False):
+    """
+    Why folder commands must not delete, move or rename path, or None. Refused: the
+    locations themselves and folders holding one (unless locations_allowed, for a move's
+    destination), hidden folders and anything inside them, and ALPHA_CACHE_DIR.
+    """
+    path = os.path.abspath(path)
+    cache_dir = os.path.abspath(CACHE_DIR)
+    roots = list(user_dirs().values())
+    if not locations_allowed and any(_within(root, path) for root in roots):
+        return "it is one of the locations (or holds one)"
+    if _within(path, cache_dir) or _within(cache_dir, path):
+        return "it holds the assistant's own files"
+    containing = [root for root in roots if _within(path, root)]
+    if containing:
+        relative = os.path.relpath(path, max(containing, key=len))
+        if any(part.startswith(".") and part not in (".", "..") for part in relative.split(os.sep)):
+            return "it is a hidden folder"
+    return None
+
+
+def locate_folder(folder_name: str, location: str):
+    """
+    Finds the existing folder folder_name in location: directly inside it or, through the
+    index, nested anywhere below it when exactly one folder there has that name.
+    Returns (path, None), or (None, message) naming the candidates or the closest names.
+    Only folders the folder commands may change are returned (see protected_folder).
+    """
+    root = resolve_location(location)
+    if root is None:
+        return None, unknown_location_message(location)
+    direct = os.path.normpath(os.path.join(root, folder_name))
+    if not _within(direct, root) or os.path.normcase(direct) == os.path.normcase(root):
+        return None, f"❌ Invalid folder name '{folder_name}'."
+    if os.path.isdir(direct):
+        reason = protected_folder(direct)
+        if reason:
+            return None, f"❌ '{display_path(direct)}' can't be changed: {reason}."
+        return direct, None
+
+    from core.file_index import get_file_index  # imports this module for index_roots()
+    index = get_file_index()
+    matches = index.find_folders(folder_name, within=root)
+    if (not matches or matches[0][0] < 1.0) and index.ready:
+        index.refresh()  # created since the last refresh?
+        matches = index.find_folders(folder_name, within=root)
+    exact = [path for score, path in matches if score >= 1.0]
+    if len(exact) == 1:
+        reason = protected_folder(exact[0])
+        if reason:
+            return None, f"❌ '{display_path(exact[0])}' can't be changed: {reason}."
+        return exact[0], None
+    if exact:
+        listed = ", ".join(f"'{display_path(path)}'" for path in exact)
+        return None, f"❌ There are {len(exact)} folders named '{folder_name}' in {location}: {listed}. Say which one."
+    suggestion = ""
+    if matches:
+        suggestion = " Did you mean " + " or ".join(f"'{display_path(path)}'" for _, path in matches[:3]) + "?"
+    return None, f"❌ Folder '{folder_name}' not found in {location}.{suggestion}"
+
+
+def index_roots() -> list:
+    """The locations to index: all but Home, leaving out any inside another."""
+    roots = sorted({path for name, path in user_dirs().items() if name != "Home"}, key=len)
+    kept = []
+    for root in roots:
+        if not any(_within(root, outer) for outer in kept):
+            kept.append(root)
+    return kept
@@ -0,0 +1,7 @@
+# core/paths.py
+# Where Alpha keeps its own files: the file index, the HTTP and TTS caches and the trash
+# index all live in ALPHA_CACHE_DIR (default ~/.alpha).
+
+import os
+
+CACHE_DIR = os.getenv("ALPHA_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".alpha"))
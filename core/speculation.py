@@ -0,0 +1,231 @@
+import ipaddress
+import os
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# --- Speculative Warmup ---
+# A turn used to pay every cold start on the critical path: Chrome launched only when a
+# Selenium tool ran, DNS and the TLS handshake happened only when a scrape started. The
+# speculator watches early signals (a partial transcript, a function_call part arriving
+# in the model stream) and starts the matching warmup in the background. When the turn's
+# real tool calls are known, warmups they need are kept and the rest are cancelled. Each
+# turn reports how much cold-start time the kept warmups took off the critical path.
+SPECULATION_ENABLED = os.getenv("ALPHA_SPECULATION", "1") != "0"
+MAX_SPECULATIVE_WARMUPS = 2
+HTTP_WARMUP_TIMEOUT = 5
+
+# Warmup kinds driven by tool calls; resolve() cancels these when the real calls don't need them.
+# Other kinds (e.g. TTS) are marked needed by the front end and only settled in end_turn().
+TOOL_WARMUP_KINDS = ("webdriver", "http")
+
+# Tool -> warmups it benefits from, as (kind, target) pairs derived from the call's args.
+# open_youtube_trending is left out: its "interactive" pool is a visible browser that is
+# never reaped, so a wrong guess would leave a stray Chrome window on the user's screen.
+TOOL_WARMUPS = {
+    "open_gehu_btech_notice_and_return_content": lambda args: [("webdriver", "scraping")],
+    "scrape_website_content": lambda args: [("http", args.get("url", ""))],
+    "scrape_websites_content": lambda args: [("http", url) for url in args.get("urls", [])],
+}
+
+# Transcript patterns that predict a tool call before the model has seen the request.
+# URLs in the text are deliberately not among them: connections are only warmed for URLs
+# the model passes to a scrape tool, so nothing the user types reaches a host on a guess.
+TEXT_HINTS = [
+    (re.compile(r"\bgehu\b|\bgraphic era\b|btechcsegehu", re.IGNORECASE), "open_gehu_btech_notice_and_return_content"),
+]
+
+
+def _is_public(address: str) -> bool:
+    try:
+        return ipaddress.ip_address(address.split("%", 1)[0]).is_global
+    except ValueError:
+        return False
+
+
+def _origin(url: str):
+    """https://host[:port] of an https URL on a public host; None for anything else (http, localhost, private IPs)."""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").rstrip(".").lower()
+    if parts.scheme != "https" or not host or host == "localhost" or host.endswith(".localhost"):
+        return None
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return f"https://{parts.netloc}"  # a name; its addresses are checked once resolved
+    return f"https://{parts.netloc}" if _is_public(host) else None
+
+
+def _warm_webdriver(pool_name: str, cancelled: threading.Event):
+    # A Chrome launch can't be interrupted; if the turn turns out not to need it, the
+    # pool's idle reaper quits the spare driver. Pools without one (or whose browser the
+    # user would see, e.g. with ALPHA_WEBDRIVER_HEADLESS=0) are never warmed on a guess.
+    from commands.webautomation.webdriver_pool import get_webdriver_pool
+    pool = get_webdriver_pool(pool_name)
+    if not pool.headless or not pool.idle_timeout or pool.idle_timeout <= 0:
+        return
+    if not cancelled.is_set():
+        pool.prewarm(1)
+
+
+def _warm_http(origin: str, cancelled: threading.Event):
+    parts = urlsplit(origin)
+    addresses = socket.getaddrinfo(parts.hostname, parts.port or 443)
+    # Never open a connection to a name that resolves into the local network (or to metadata
+    # endpoints like 169.254.169.254); the scrape itself still goes wherever the tool sends it
+    if cancelled.is_set() or not all(_is_public(info[4][0]) for info in addresses):
+        return
+    # A HEAD on the pooled session leaves a connected, TLS-established socket for the scrape to reuse
+    from commands.webautomation.web_scrapper import get_http_session
+    get_http_session().head(origin, timeout=HTTP_WARMUP_TIMEOUT, allow_redirects=False).close()
+
+
+class _Warmup:
+    def __init__(self, key):
+        self.key = key
+        self.cancelled = threading.Event()
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+        self.needed_at = None
+        self.error = None
+        self.future = None
+
+
+class Speculator:
+    """
+    Starts warmups from early hints and accounts for them per turn.
+
+    Warmups are registered per kind as warm(target, cancelled_event) and optionally
+    cancel(target); webdriver and http are built in, others (e.g. TTS) are registered by
+    the front end. Hints within a turn are deduplicated by (kind, target).
+    """
+
+    def __init__(self, enabled: bool = SPECULATION_ENABLED, max_workers: int = MAX_SPECULATIVE_WARMUPS):
+        self.enabled = enabled
+        self._warmers = {"webdriver": (_warm_webdriver, None), "http": (_warm_http, None)}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="alpha-speculate")
+        self._lock = threading.Lock()
+        self._turn = {}  # (kind, target) -> _Warmup
+        self.totals = {"turns": 0, "speculated": 0, "used": 0, "cancelled": 0, "saved_ms": 0.0}
+
+    def close(self):
+        """Cancels this turn's warmups and releases the worker threads."""
+        self.end_turn()
+        self._executor.shutdown(wait=False)
+
+    def register_warmup(self, kind: str, warm, cancel=None):
+        self._warmers[kind] = (warm, cancel)
+
+    @staticmethod
+    def _normalize(kind: str, target: str):
+        if kind == "http":
+            return _origin(target)
+        return target
+
+    # --- Hints ---
+    def speculate(self, kind: str, target: str = ""):
+        """Starts the warmup for (kind, target) unless it is already running this turn."""
+        if not self.enabled or kind not in self._warmers:
+            return
+        target = self._normalize(kind, target)
+        if target is None:
+            return
+        key = (kind, target)
+        with self._lock:
+            if key in self._turn:
+                return
+            warmup = self._turn[key] = _Warmup(key)
+        warmup.future = self._executor.submit(self._run, warmup)
+
+    def _run(self, warmup):
+        kind, target = warmup.key
+        try:
+            if not warmup.cancelled.is_set():
+                self._warmers[kind][0](target, warmup.cancelled)
+        except Exception as e:
+            warmup.error = e
+        finally:
+            warmup.finished_at = time.perf_counter()
+
+    def observe_text(self, text: str):
+        """Hint from a (partial) transcript or typed prompt."""
+        if not self.enabled or not text:
+            return
+        for pattern, tool_name in TEXT_HINTS:
+            if pattern.search(text):
+                self.observe_tool_call(tool_name, {})
+
+    def observe_tool_call(self, name: str, args=None):
+        """Hint from a function_call part as soon as it appears in the model stream."""
+        if not self.enabled or name not in TOOL_WARMUPS:
+            return
+        for kind, target in TOOL_WARMUPS[name](dict(args or {})):
+            self.speculate(kind, target)
+
+    # --- Resolution ---
+    def mark_needed(self, kind: str, target: str = ""):
+        """The turn has reached the point where (kind, target) is actually needed."""
+        target = self._normalize(kind, target)
+        with self._lock:
+            warmup = self._turn.get((kind, target))
+            if warmup is not None and warmup.needed_at is None:
+                warmup.needed_at = time.perf_counter()
+
+    def resolve(self, function_calls):
+        """Called with the turn's real tool calls right before they run: keeps matching warmups, cancels the rest."""
+        needed = set()
+        for function_call in function_calls:
+            factory = TOOL_WARMUPS.get(function_call.name)
+            if factory:
+                needed.update((kind, self._normalize(kind, target)) for kind, target in factory(dict(function_call.args or {})))
+        for key in needed:
+            self.mark_needed(*key)
+        with self._lock:
+            unused = [w for key, w in self._turn.items() if key not in needed and key[0] in TOOL_WARMUP_KINDS]
+        for warmup in unused:
+            self._cancel(warmup)
+
+    def _cancel(self, warmup):
+        if warmup.cancelled.is_set():
+            return
+        warmup.cancelled.set()
+        if warmup.future is not None:
+            warmup.future.cancel()
+        cancel = self._warmers[warmup.key[0]][1]
+        if cancel is not None:
+            try:
+                cancel(warmup.key[1])
+            except Exception as e:
+                print(f"[Speculation] Cancelling {warmup.key[0]} warmup failed: {e}")
+
+    def end_turn(self) -> dict:
+        """Cancels warmups the turn never needed and returns (and prints) what speculation saved."""
+        with self._lock:
+            warmups, self._turn = list(self._turn.values()), {}
+        report = {"speculated": len(warmups), "used": [], "cancelled": [], "saved_ms": 0.0}
+        for warmup in warmups:
+            label = f"{warmup.key[0]}:{warmup.key[1]}" if warmup.key[1] else warmup.key[0]
+            if warmup.needed_at is None or warmup.error is not None:
+                self._cancel(warmup)
+                report["cancelled"].append(label)
+                continue
+            # Work finished before the tool needed it is latency the tool no longer pays;
+            # a warmup still running at that point saved the part it had already done.
+            done_at = min(warmup.finished_at or warmup.needed_at, warmup.needed_at)
+            saved_ms = max(0.0, (done_at - warmup.started_at) * 1000)
+            report["used"].append(label)
+            report["saved_ms"] += saved_ms
+        report["saved_ms"] = round(report["saved_ms"], 1)
+
+        self.totals["turns"] += 1
+        self.totals["speculated"] += report["speculated"]
+        self.totals["used"] += len(report["used"])
+        self.totals["cancelled"] += len(report["cancelled"])
+        self.totals["saved_ms"] = round(self.totals["saved_ms"] + report["saved_ms"], 1)
+        if warmups:
+            print(f"[Speculation] saved ~{report['saved_ms']:.0f} ms this turn "
+                  f"(used: {', '.join(report['used']) or 'none'}; cancelled: {', '.join(report['cancelled']) or 'none'})")
+        return report
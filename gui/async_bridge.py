@@ -0,0 +1,191 @@
+# gui/async_bridge.py
+# Runs AsyncGeminiAssistant turns for the Qt front ends.
+# With qasync installed, asyncio runs on Qt's own event loop: coroutines and widgets
+# share the GUI thread. Without it, one background thread runs an asyncio loop for the
+# lifetime of the app. Either way a message is a task (not a QThread per request), so a
+# new message or closing the window cancels the one in flight: the model stream,
+# queued tools and speech all stop.
+
+import asyncio
+import threading
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from core import events
+
+try:
+    import qasync
+except ImportError:
+    qasync = None
+
+SHUTDOWN_TIMEOUT = 2  # seconds to let cancelled turns unwind when the app exits
+
+
+class AsyncLoop:
+    """The asyncio loop the GUI submits coroutines to."""
+
+    def __init__(self, app):
+        self.app = app
+        if qasync is not None:
+            self.loop = qasync.QEventLoop(app)
+            asyncio.set_event_loop(self.loop)
+            self._thread = None
+        else:
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run, name="alpha-asyncio", daemon=True)
+            self._thread.start()
+
+    @property
+    def integrated(self) -> bool:
+        """True when asyncio runs on the Qt event loop (qasync)."""
+        return self._thread is None
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine):
+        """Schedules coroutine from the GUI thread. The returned handle has cancel() and done()."""
+        if self.integrated:
+            return self.loop.create_task(coroutine)
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    async def _cancel_all(self):
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=SHUTDOWN_TIMEOUT)
+
+    def exec(self) -> int:
+        """Runs the Qt application until it quits, then cancels whatever is still running."""
+        if self.integrated:
+            with self.loop:
+                self.loop.run_forever()
+            return 0
+        exit_code = self.app.exec_()
+        try:
+            asyncio.run_coroutine_threadsafe(self._cancel_all(), self.loop).result(SHUTDOWN_TIMEOUT + 1)
+        except Exception as e:
+            print(f"[Async] Shutdown did not finish cleanly: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(SHUTDOWN_TIMEOUT)
+        return exit_code
+
+
+_async_loop = None
+
+
+def get_async_loop(app=None) -> AsyncLoop:
+    """The process-wide AsyncLoop; the first call must pass the QApplication."""
+    global _async_loop
+    if _async_loop is None:
+        if app is None:
+            raise RuntimeError("get_async_loop() needs the QApplication the first time it is called.")
+        _async_loop = AsyncLoop(app)
+    return _async_loop
+
+
+class AssistantRunner(QObject):
+    """
+    Drives one AsyncGeminiAssistant turn at a time and reports it through Qt signals.
+    submit() cancels a turn still in flight; cancel() stops it (and its speech) at once.
+    Signals from a turn that has been replaced are dropped, so a late chunk from a
+    cancelled turn never lands in the next reply's bubble.
+    """
+    response_chunk = pyqtSignal(str)  # each piece of text as the model streams it
+    response_complete = pyqtSignal(str)  # the full reply
+    error_occurred = pyqtSignal(str)  # the turn failed; no response_complete follows
+    thinking_status = pyqtSignal(bool)  # show/hide the spinner
+    cancelled = pyqtSignal()  # the turn was stopped by submit() or cancel()
+    tool_progress = pyqtSignal(str)  # a line about a long-running tool (core.events), while it runs
+
+    _event = pyqtSignal(int, str, object)  # (turn, signal name, payload) from the loop, dispatched on the GUI thread
+
+    def __init__(self, assistant, async_loop: AsyncLoop = None, parent=None):
+        super().__init__(parent)
+        self.assistant = assistant
+        self.async_loop = async_loop or get_async_loop()
+        self._turn = 0
+        self._handle = None
+        self._tts_pipeline = None
+        self._event.connect(self._dispatch)
+
+    @property
+    def busy(self) -> bool:
+        return self._handle is not None and not self._handle.done()
+
+    def submit(self, prompt: str, tts_pipeline=None):
+        """Starts a turn; tts_pipeline (optional) speaks the reply as it streams."""
+        self.cancel()
+        self._turn += 1
+        self._tts_pipeline = tts_pipeline
+        self._handle = self.async_loop.submit(self._run(self._turn, prompt, tts_pipeline))
+
+    def cancel(self):
+        """Stops the turn in flight: the request, queued tools and any speech."""
+        if not self.busy:
+            return
+        self._turn += 1  # anything the old turn still emits is dropped
+        self._handle.cancel()
+        if self._tts_pipeline is not None:
+            self._tts_pipeline.cancel()  # right away, not when the task gets to unwind
+        self._handle = None
+        self._tts_pipeline = None
+        self.thinking_status.emit(False)
+        self.cancelled.emit()
+
+    def _dispatch(self, turn, name, payload):
+        if turn != self._turn:
+            return
+        getattr(self, name).emit(payload)
+
+    async def _run(self, turn, prompt, tts_pipeline):
+        emit = lambda name, payload: self._event.emit(turn, name, payload)
+        emit("thinking_status", True)
+        full_response_text = ""
+        error = None
+
+        def on_event(event):
+            # Called on a tool's worker thread; _event queues the line over to the GUI thread
+            if event["type"] == "progress":
+                emit("tool_progress", events.format_progress(event))
+
+        unsubscribe = events.subscribe(on_event)
+        try:
+            async for response_type, content in self.assistant.send_prompt(prompt):
+                if response_type == "text_chunk":
+                    emit("response_chunk", content)
+                    if tts_pipeline:
+                        self.assistant.speculator.mark_needed("tts")
+                        tts_pipeline.feed(content)
+                elif response_type == "final_text":
+                    full_response_text = content
+                elif response_type == "error":
+                    error = content
+
+            if tts_pipeline:
+                if error:
+                    tts_pipeline.feed(f" {error}")
+                tts_pipeline.finish()
+                # Returns once the last sentence has played; cancelling the task abandons the wait
+                await asyncio.get_running_loop().run_in_executor(None, tts_pipeline.wait)
+                if tts_pipeline.errors:
+                    # The text is already on screen; carry on without speech
+                    print(f"[TTS]: Speech failed: {tts_pipeline.errors[0]}")
+
+            if error:
+                emit("error_occurred", error)
+            else:
+                emit("response_complete", full_response_text or "No valid response generated by the assistant.")
+        except asyncio.CancelledError:
+            if tts_pipeline:
+                tts_pipeline.cancel()
+            raise
+        except Exception as e:
+            if tts_pipeline:
+                tts_pipeline.cancel()
+            emit("error_occurred", f"An unexpected error occurred: {e}")
+        finally:
+            unsubscribe()
+            emit("thinking_status", False)
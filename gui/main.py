@@ -4,9 +4,11 @@ from PyQt5.QtWidgets import (
     QLabel, QPushButton, QMessageBox, QLineEdit,
     QTextBrowser, QStackedWidget
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QThread # QTimer is not strictly needed for non-streaming, but kept for general utility
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QColor, QPalette, QMovie
-from backend.assistant_core import GeminiAssistant
+from backend.async_assistant import AsyncGeminiAssistant
+from gui.async_bridge import AssistantRunner, get_async_loop
+from gui.streaming_bubble import StreamingBubble
 
 def _create_dark_palette():
     palette = QPalette()
@@ -111,36 +113,21 @@ class WelcomeScreen(QWidget):
         enter_button.clicked.connect(self.enter_clicked.emit)
         layout.addWidget(enter_button, alignment=Qt.AlignCenter)
 
-# --- QThread for API Calls (Non-Streaming) ---
-class AssistantThread(QThread):
-    response_complete = pyqtSignal(str) # Emits the final text response or error
-    assistant_thinking = pyqtSignal(bool) # To show/hide spinner
-
-    def __init__(self, assistant_instance, user_query):
-        super().__init__()
-        self.assistant = assistant_instance
-        self.user_query = user_query
-
-    def run(self):
-        self.assistant_thinking.emit(True) # Show spinner
-        try:
-            # The send_prompt now yields a single (type, content) tuple
-            for response_type, content in self.assistant.send_prompt(self.user_query):
-                if response_type == "final_text":
-                    self.response_complete.emit(content)
-                elif response_type == "error":
-                    self.response_complete.emit(f"Error: {content}") # Send error message through the same signal
-        except Exception as e:
-            self.response_complete.emit(f"An unexpected error occurred: {e}")
-        finally:
-            self.assistant_thinking.emit(False) # Hide spinner
-
-
 class ChatbotScreen(QWidget):
     def __init__(self, parent=None):
-        self.assistant = GeminiAssistant() # Initialize the assistant here
         super().__init__(parent)
+        self.assistant = AsyncGeminiAssistant() # Initialize the assistant here
+        # Turns run as cancellable tasks on the shared asyncio loop; a new message stops the one in flight
+        self.assistant_runner = AssistantRunner(self.assistant, parent=self)
+        self.assistant_runner.response_chunk.connect(self._handle_bot_chunk)
+        self.assistant_runner.response_complete.connect(self._handle_bot_response)
+        self.assistant_runner.error_occurred.connect(self._handle_bot_error)
+        self.assistant_runner.cancelled.connect(self._handle_bot_cancelled)
+        self.assistant_runner.thinking_status.connect(self._toggle_spinner)
+        self.assistant_runner.tool_progress.connect(self._show_tool_progress)
+        self.assistant_runner.thinking_status.connect(self._clear_tool_progress)
         self.initUI()
+        self.reply_bubble = StreamingBubble(self.chat_history_display, self.add_message)
 
     def initUI(self):
         self.setPalette(_create_dark_palette())
@@ -181,8 +168,14 @@ class ChatbotScreen(QWidget):
             self.spinner_label.setText("Thinking...")
             self.spinner_label.setStyleSheet("color: #FFA500; font-style: italic; padding-left: 10px; margin-bottom: 8px;")
 
+        # Progress of a long-running tool (e.g. moving a large folder to another drive)
+        self.progress_label = QLabel()
+        self.progress_label.setStyleSheet("color: #B0BEC5; font-style: italic; padding-left: 10px; margin-bottom: 8px;")
+        self.progress_label.hide()
+
         spinner_layout = QHBoxLayout()
         spinner_layout.addWidget(self.spinner_label)
+        spinner_layout.addWidget(self.progress_label)
         spinner_layout.addStretch()
         main_layout.addLayout(spinner_layout)
 
@@ -221,7 +214,7 @@ class ChatbotScreen(QWidget):
 
         main_layout.addLayout(input_layout)
 
-    def add_message(self, sender, message):
+    def _format_message(self, sender, message):
         if sender == "User":
             color = "#90CAF9"
             align = Qt.AlignRight
@@ -231,41 +224,58 @@ class ChatbotScreen(QWidget):
             align = Qt.AlignLeft
             background = "#3A3A3A"
 
-        formatted_message = f'''
+        return f'''
         <div class="chat-message" style="background-color: {background}; border-radius: 10px; padding: 8px 12px; margin-bottom: 8px; max-width: 80%; float: {["left", "right"][align == Qt.AlignRight]}; clear: both;">
             <p style="color:{color}; font-size:11pt; margin: 0;"><b>{sender}:</b> {message}</p>
         </div>
         '''
-        self.chat_history_display.append(formatted_message)
+
+    def _scroll_to_bottom(self):
         self.chat_history_display.verticalScrollBar().setValue(self.chat_history_display.verticalScrollBar().maximum())
 
+    def add_message(self, sender, message):
+        self.chat_history_display.append(self._format_message(sender, message))
+        self._scroll_to_bottom()
+
     def _send_message(self):
         user_message = self.user_input_field.text().strip()
         if user_message:
+            # Input stays enabled: sending again cancels the reply in flight (see _handle_bot_cancelled)
+            self.assistant_runner.cancel()
             self.add_message("User", user_message)
             self.user_input_field.clear()
-
-            # Disable input and show spinner while waiting for response
-            self.user_input_field.setEnabled(False)
-            self.send_button.setEnabled(False)
-            self._toggle_spinner(True)
-
-            # Create and start the thread for API call
-            self.assistant_thread = AssistantThread(self.assistant, user_message)
-            self.assistant_thread.response_complete.connect(self._handle_bot_response)
-            self.assistant_thread.assistant_thinking.connect(self._toggle_spinner) # Connect to toggle spinner
-            self.assistant_thread.start()
+            self.reply_bubble.close()
+            self.assistant_runner.submit(user_message)
         else:
             QMessageBox.warning(self, "Empty Message", "Please type a message before sending.")
 
+    def _handle_bot_chunk(self, chunk):
+        # The first token replaces the spinner with the reply bubble, which then grows in place
+        if self.reply_bubble.append(chunk):
+            self._toggle_spinner(False)
+
+    def _handle_bot_cancelled(self):
+        # Keep whatever part of the reply had arrived, marked as cut off
+        self.reply_bubble.cut_off()
+
     def _handle_bot_response(self, bot_reply):
-        # Enable input and hide spinner
-        self.user_input_field.setEnabled(True)
-        self.send_button.setEnabled(True)
         self._toggle_spinner(False) # Ensure spinner is hidden
+        self.reply_bubble.finish(bot_reply)
+        self._scroll_to_bottom()
 
-        self.add_message("Bot", bot_reply)
-        self.chat_history_display.verticalScrollBar().setValue(self.chat_history_display.verticalScrollBar().maximum())
+    def _handle_bot_error(self, error_message):
+        self._toggle_spinner(False)
+        # The stream broke off: keep what arrived and show the error below it
+        self.reply_bubble.close()
+        self.add_message("Bot", f"Error: {error_message}")
+
+    def _show_tool_progress(self, text):
+        self.progress_label.setText(text)
+        self.progress_label.show()
+
+    def _clear_tool_progress(self, busy):
+        if not busy:
+            self.progress_label.hide()
 
     def _toggle_spinner(self, show):
         if show:
@@ -314,8 +324,14 @@ class MyPyQt5App(QWidget):
     def _show_chatbot_screen(self):
         self.stacked_widget.setCurrentWidget(self.chatbot_screen)
 
+    def closeEvent(self, event):
+        # Stop a reply still in flight (model request, queued tools) before the loop shuts down
+        self.chatbot_screen.assistant_runner.cancel()
+        event.accept()
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    async_loop = get_async_loop(app) # Before any window: the chat screen submits to it
     window = MyPyQt5App()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(async_loop.exec())
\ No newline at end of file
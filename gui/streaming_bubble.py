@@ -0,0 +1,61 @@
+# gui/streaming_bubble.py
+# The bot's reply bubble in a chat QTextBrowser, shared by gui/main.py and
+# voice_converter.py. The reply streams in chunk by chunk, so the bubble is re-rendered in
+# place (everything from where it starts to the end of the document) as text arrives.
+
+from PyQt5.QtGui import QTextCursor
+
+
+class StreamingBubble:
+    """
+    One streamed reply at a time in display. add_message(sender, html) is the screen's own
+    method for appending a formatted message, so the bubble looks like every other one.
+    """
+
+    def __init__(self, display, add_message):
+        self.display = display
+        self.add_message = add_message
+        self.text = ""  # what has streamed so far
+        self._start = None  # document position of the open bubble, None when no bubble is open
+
+    @property
+    def open(self) -> bool:
+        return self._start is not None
+
+    def append(self, chunk: str) -> bool:
+        """Grows the bubble by chunk. Returns True if this chunk opened it."""
+        opened = not self.open
+        if opened:
+            cursor = QTextCursor(self.display.document())
+            cursor.movePosition(QTextCursor.End)
+            self._start = cursor.position()
+            self.text = ""
+            self.add_message("Bot", "")
+        self.text += chunk
+        self._render(self.text)
+        return opened
+
+    def finish(self, text: str):
+        """Settles the bubble on the full reply, or adds it as a message if nothing streamed."""
+        if self.open:
+            self._render(text)
+        else:
+            self.add_message("Bot", text)
+        self._start = None
+
+    def cut_off(self):
+        """The reply was interrupted: keeps what had arrived, marked as cut off."""
+        if self.open:
+            self._render(self.text + " …")
+        self._start = None
+
+    def close(self):
+        """Leaves the bubble as it is; the next chunk opens a new one."""
+        self._start = None
+
+    def _render(self, text: str):
+        cursor = QTextCursor(self.display.document())
+        cursor.setPosition(self._start)
+        cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        self.add_message("Bot", text.replace("\n", "<br>"))
@@ -0,0 +1,216 @@
+# tests/test_server.py
+# The multi-session server over HTTP with the offline stub model, and SessionManager's
+# eviction with stand-in assistants.
+#
+#   python -m pytest tests/test_server.py
+
+import contextlib
+import http.client
+import io
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.model_provider import StubProvider
+from backend.server import create_server, assistant_factory, SessionManager, TokenBucket
+
+
+@pytest.fixture
+def serve():
+    """serve(provider) starts a server on a free port; returns (server, port)."""
+    servers = []
+
+    def start(provider):
+        server = create_server(assistant_factory(provider), port=0, token=None)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, server.server_address[1]
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def request(port, method, path, body=None):
+    """Returns (status, headers, payload); an NDJSON reply comes back as a list of events."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        connection.request(method, path, body=None if body is None else json.dumps(body),
+                           headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        data = response.read().decode("utf-8")
+        if response.getheader("Content-Type") == "application/x-ndjson":
+            payload = [json.loads(line) for line in data.splitlines() if line]
+        else:
+            payload = json.loads(data) if data else None
+        return response.status, response.headers, payload
+    finally:
+        connection.close()
+
+
+def new_session(port) -> str:
+    status, _, payload = request(port, "POST", "/sessions")
+    assert status == 201
+    return payload["session_id"]
+
+
+def quick_stub():
+    return StubProvider(first_chunk_delay=0, chunk_delay=0)
+
+
+def test_sessions_keep_separate_histories(serve):
+    server, port = serve(quick_stub())
+    first, second = new_session(port), new_session(port)
+
+    for session_id, prompt in ((first, "hello from the first user"), (second, "hello from the second user")):
+        status, _, events = request(port, "POST", f"/sessions/{session_id}/messages", {"prompt": prompt})
+        assert status == 200
+        assert events[-1] == {"type": "final_text", "text": f"Stub reply to: {prompt}"}
+
+    for session_id, prompt in ((first, "hello from the first user"), (second, "hello from the second user")):
+        texts = [part.text for content in server.sessions.get(session_id).assistant.history
+                 for part in content.parts if part.text]
+        assert texts == [prompt, f"Stub reply to: {prompt}"]
+        status, _, info = request(port, "GET", f"/sessions/{session_id}")
+        assert status == 200 and info["turns"] == 1
+
+
+def test_busy_session_answers_409(serve):
+    server, port = serve(StubProvider(first_chunk_delay=0, chunk_delay=0.1))
+    session_id = new_session(port)
+    first_reply = {}
+    first = threading.Thread(target=lambda: first_reply.update(
+        result=request(port, "POST", f"/sessions/{session_id}/messages", {"prompt": "a slow question"})))
+    first.start()
+    deadline = time.monotonic() + 5
+    while not server.sessions.get(session_id).busy:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    status, _, payload = request(port, "POST", f"/sessions/{session_id}/messages", {"prompt": "and another"})
+    assert status == 409
+    assert "previous message" in payload["error"]
+
+    first.join(10)
+    status, _, events = first_reply["result"]
+    assert status == 200 and events[-1]["type"] == "final_text"
+
+
+def test_busy_answers_do_not_use_up_tokens(serve):
+    server, port = serve(StubProvider(first_chunk_delay=0, chunk_delay=0.1))
+    session_id = new_session(port)
+    server.sessions.get(session_id).bucket = TokenBucket(rate_per_minute=6, burst=2)
+    first = threading.Thread(target=request, args=(port, "POST", f"/sessions/{session_id}/messages",
+                                                   {"prompt": "a slow question"}))
+    first.start()
+    deadline = time.monotonic() + 5
+    while not server.sessions.get(session_id).busy:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    for _ in range(3):
+        status, _, _ = request(port, "POST", f"/sessions/{session_id}/messages", {"prompt": "and another"})
+        assert status == 409
+    first.join(10)
+    status, _, _ = request(port, "POST", f"/sessions/{session_id}/messages", {"prompt": "the second turn"})
+    assert status == 200
+
+
+def test_rate_limit_answers_429_with_retry_after(serve):
+    server, port = serve(quick_stub())
+    session_id = new_session(port)
+    server.sessions.get(session_id).bucket = TokenBucket(rate_per_minute=6, burst=1)
+
+    status, _, _ = request(port, "POST", f"/sessions/{session_id}/messages", {"prompt": "first"})
+    assert status == 200
+    status, headers, payload = request(port, "POST", f"/sessions/{session_id}/messages", {"prompt": "second"})
+    assert status == 429
+    assert 1 <= int(headers["Retry-After"]) <= 10
+
+
+def test_token_bucket_refills_at_its_rate():
+    bucket = TokenBucket(rate_per_minute=60, burst=2)
+    assert bucket.take() == 0 and bucket.take() == 0
+    wait = bucket.take()
+    assert 0 < wait <= 1
+    bucket.updated -= 1  # a second later
+    assert bucket.take() == 0
+
+
+# --- SessionManager ---
+class FakeSpeculator:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAssistant:
+    def __init__(self):
+        self.speculator = FakeSpeculator()
+        self.history = []
+        self.turn_metrics = []
+
+
+def quiet_manager(**kwargs) -> SessionManager:
+    return SessionManager(FakeAssistant, **kwargs)
+
+
+def test_idle_sessions_are_evicted_and_closed():
+    sessions = quiet_manager(idle_seconds=60)
+    idle, active = sessions.create(), sessions.create()
+    idle.last_used -= 120
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert sessions.evict_idle() == 1
+    assert sessions.get(idle.id) is None and idle.assistant.speculator.closed
+    assert sessions.get(active.id) is active and not active.assistant.speculator.closed
+
+
+def test_leased_session_is_not_evicted_before_its_turn():
+    sessions = quiet_manager(idle_seconds=60)
+    session = sessions.create()
+    session.last_used -= 120
+    with sessions.lease(session.id) as leased:
+        # The request holds the session but has not taken its turn lock yet
+        assert leased is session and not session.busy
+        assert sessions.evict_idle() == 0
+        assert not session.assistant.speculator.closed
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert sessions.evict_idle() == 1
+    assert session.assistant.speculator.closed
+
+
+def test_full_server_evicts_the_least_recently_used_session():
+    sessions = quiet_manager(max_sessions=2)
+    oldest, newer = sessions.create(), sessions.create()
+    oldest.last_used -= 10
+    with contextlib.redirect_stdout(io.StringIO()):
+        third = sessions.create()
+    assert sessions.get(oldest.id) is None and oldest.assistant.speculator.closed
+    assert sessions.get(newer.id) is newer and sessions.get(third.id) is third
+
+    # Sessions in use are skipped; with every session in use there is no room
+    newer.last_used -= 10
+    with sessions.lease(newer.id), sessions.lease(third.id):
+        assert sessions.create() is None
+    with sessions.lease(newer.id), contextlib.redirect_stdout(io.StringIO()):
+        fourth = sessions.create()
+    assert sessions.get(third.id) is None and sessions.get(newer.id) is newer and fourth is not None
+
+
+def test_deleting_a_leased_session_closes_it_when_the_lease_ends():
+    sessions = quiet_manager()
+    session = sessions.create()
+    with sessions.lease(session.id):
+        assert sessions.delete(session.id)
+        assert sessions.get(session.id) is None
+        assert not session.assistant.speculator.closed
+    assert session.assistant.speculator.closed
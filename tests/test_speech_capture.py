@@ -0,0 +1,103 @@
+# tests/test_speech_capture.py
+# Drives SpeechCaptureEngine from generated WAV files through WavFileSource and a fake
+# STT backend that records the audio of every utterance it is given.
+#
+#   python -m pytest tests/test_speech_capture.py
+
+import array
+import math
+import os
+import sys
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice.speech_capture import SpeechCaptureEngine, WavFileSource, PRE_ROLL_SECONDS
+from voice.stt_backends import STTBackend
+
+RATE = 16000
+CHUNK = 1024
+AMPLITUDE = 8000
+
+
+class FakeBackend(STTBackend):
+    name = "fake"
+
+    def __init__(self):
+        self.utterances = []  # the audio of each finished utterance
+
+    def transcribe(self, frame_data: bytes, sample_rate: int, sample_width: int) -> str:
+        self.utterances.append(frame_data)
+        return f"utterance {len(self.utterances)}"
+
+
+def write_wav(path, segments):
+    """segments: (seconds, loud) pairs; loud ones are a 440 Hz tone, the rest digital silence."""
+    samples = array.array("h")
+    for seconds, loud in segments:
+        for i in range(int(seconds * RATE)):
+            samples.append(int(AMPLITUDE * math.sin(2 * math.pi * 440 * i / RATE)) if loud else 0)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(samples.tobytes())
+
+
+def capture(path, continuous: bool, arm: bool = False):
+    """Runs the engine over the whole file; returns (backend, texts, errors)."""
+    backend = FakeBackend()
+    texts, errors = [], []
+    engine = SpeechCaptureEngine(lambda: WavFileSource(str(path), chunk_size=CHUNK), backend,
+                                 on_text=texts.append, on_error=errors.append, continuous=continuous)
+    if arm:
+        engine.arm()
+    engine.run()  # returns at the end of the file
+    engine._recognition_thread.join(5)
+    return backend, texts, errors
+
+
+# Calibration reads the first half second, so every file starts with a second of silence
+TWO_PHRASES = [(1.0, False), (0.5, True), (1.5, False), (0.5, True), (1.5, False)]
+
+
+def test_continuous_mode_splits_utterances_at_pauses(tmp_path):
+    path = tmp_path / "two_phrases.wav"
+    write_wav(path, TWO_PHRASES)
+    backend, texts, errors = capture(path, continuous=True)
+    assert texts == ["utterance 1", "utterance 2"]
+    assert errors == []
+
+
+def test_armed_mode_takes_a_single_utterance(tmp_path):
+    path = tmp_path / "two_phrases.wav"
+    write_wav(path, TWO_PHRASES)
+    backend, texts, errors = capture(path, continuous=False, arm=True)
+    assert texts == ["utterance 1"]
+    assert errors == []
+
+
+def test_unarmed_speech_is_not_recognized(tmp_path):
+    path = tmp_path / "two_phrases.wav"
+    write_wav(path, TWO_PHRASES)
+    backend, texts, errors = capture(path, continuous=False)
+    assert backend.utterances == []
+    assert texts == []
+
+
+def test_ring_buffer_keeps_the_start_of_speech(tmp_path):
+    path = tmp_path / "one_phrase.wav"
+    tone_seconds = 0.5
+    write_wav(path, [(1.0, False), (tone_seconds, True), (1.5, False)])
+    backend, texts, errors = capture(path, continuous=True)
+    assert len(backend.utterances) == 1
+
+    samples = array.array("h")
+    samples.frombytes(backend.utterances[0])
+    first_sound = next(i for i, sample in enumerate(samples) if sample)
+    # Speech is detected a few frames into the tone; the pre-roll carries those frames and
+    # the silence before them, so the utterance starts quiet and holds the whole tone
+    assert first_sound >= CHUNK
+    assert first_sound <= PRE_ROLL_SECONDS * RATE
+    tone = samples[first_sound:first_sound + int(tone_seconds * RATE)]
+    assert sum(1 for sample in tone if sample) >= int(tone_seconds * RATE) * 0.99
@@ -0,0 +1,304 @@
+# voice/speech_capture.py
+# Continuous, interruptible speech capture.
+# One capture thread keeps the audio source open for the life of the app, calibrates
+# the noise floor once and keeps adapting it, and runs an energy-based voice activity
+# detector over incoming frames. A ring buffer holds the last few hundred milliseconds
+# so the start of a word is not clipped. Speech frames go onto a queue served by a
+# separate recognition worker, which streams them into an STT backend session while the
+# user is still talking, so capture never stalls on recognition, and every stage can be
+# cancelled between frames.
+
+import array
+import collections
+import math
+import os
+import queue
+import threading
+import time
+import wave
+
+# --- Configuration (overridable through environment variables) ---
+CALIBRATION_SECONDS = float(os.getenv("ALPHA_STT_CALIBRATION_SECONDS", "0.5"))
+ENERGY_RATIO = float(os.getenv("ALPHA_STT_ENERGY_RATIO", "2.5"))  # speech threshold = noise floor x ratio
+MIN_ENERGY_THRESHOLD = float(os.getenv("ALPHA_STT_MIN_ENERGY", "150"))
+PRE_ROLL_SECONDS = 0.3  # audio kept from before speech was detected
+SPEECH_START_SECONDS = 0.1  # loud audio needed before it counts as speech
+PAUSE_SECONDS = float(os.getenv("ALPHA_STT_PAUSE_SECONDS", "0.8"))  # silence that ends an utterance
+PHRASE_TIME_LIMIT = float(os.getenv("ALPHA_STT_PHRASE_LIMIT", "15"))
+LISTEN_TIMEOUT = float(os.getenv("ALPHA_STT_LISTEN_TIMEOUT", "5"))  # armed but silent -> "No speech detected."
+NOISE_ADAPT_RATE = 0.05  # weight of each silent frame in the running noise floor
+
+_SAMPLE_TYPECODES = {2: "h", 4: "i"}
+
+
+def frame_energy(frame: bytes, sample_width: int) -> float:
+    """Root-mean-square amplitude of a block of little-endian PCM samples."""
+    samples = array.array(_SAMPLE_TYPECODES[sample_width])
+    samples.frombytes(frame[:len(frame) - len(frame) % sample_width])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+
+class WavFileSource:
+    """
+    Audio source that plays a mono 16/32-bit PCM WAV file into the capture engine, with the
+    same shape as speech_recognition.Microphone (context manager, .stream.read(frames),
+    SAMPLE_RATE, SAMPLE_WIDTH, CHUNK). With realtime=True reads are paced like a live mic.
+    Returns b"" at the end of the file, which ends capture.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1024, realtime: bool = False, trailing_silence: float = 1.0):
+        self.path = path
+        self.CHUNK = chunk_size
+        self.realtime = realtime
+        self.trailing_silence = trailing_silence
+        self.stream = None
+        self._wave = None
+        self._silence_frames_left = 0
+
+    def __enter__(self):
+        self._wave = wave.open(self.path, "rb")
+        if self._wave.getnchannels() != 1 or self._wave.getsampwidth() not in _SAMPLE_TYPECODES:
+            self._wave.close()
+            raise ValueError(f"{self.path}: expected a mono 16-bit or 32-bit PCM WAV file.")
+        self.SAMPLE_RATE = self._wave.getframerate()
+        self.SAMPLE_WIDTH = self._wave.getsampwidth()
+        # Pad with silence so an utterance running to the end of the file still gets its closing pause
+        self._silence_frames_left = int(self.trailing_silence * self.SAMPLE_RATE)
+        self.stream = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._wave.close()
+        self.stream = None
+
+    @property
+    def duration(self) -> float:
+        """Length of the file's audio in seconds, excluding the trailing silence."""
+        return self._wave.getnframes() / self.SAMPLE_RATE
+
+    def read(self, frames: int) -> bytes:
+        data = self._wave.readframes(frames)
+        if not data and self._silence_frames_left > 0:
+            padding = min(frames, self._silence_frames_left)
+            self._silence_frames_left -= padding
+            data = bytes(padding * self.SAMPLE_WIDTH)
+        if self.realtime and data:
+            time.sleep(len(data) / self.SAMPLE_WIDTH / self.SAMPLE_RATE)
+        return data
+
+
+class SpeechCaptureEngine:
+    """
+    Keeps one audio source open and turns its frames into recognized text.
+
+    source_factory() returns a fresh audio source (e.g. speech_recognition.Microphone);
+    backend is a voice.stt_backends.STTBackend. Callbacks are invoked from the engine's
+    threads: on_text(text), on_partial(hypothesis), on_error(message), on_status(message).
+
+    The engine listens all the time but only hands utterances to recognition while armed:
+    arm() takes the next utterance (push-to-talk), continuous=True takes every utterance.
+    cancel() drops the utterance being captured, any queued ones, and the result of any
+    recognition still in flight.
+    """
+
+    def __init__(self, source_factory, backend, on_text=None, on_partial=None, on_error=None, on_status=None,
+                 continuous: bool = False, listen_timeout: float = LISTEN_TIMEOUT,
+                 pause_seconds: float = PAUSE_SECONDS, phrase_time_limit: float = PHRASE_TIME_LIMIT):
+        self.source_factory = source_factory
+        self.backend = backend
+        self.on_text = on_text or (lambda text: None)
+        self.on_partial = on_partial or (lambda hypothesis: None)
+        self.on_error = on_error or (lambda message: None)
+        self.on_status = on_status or (lambda message: None)
+        self.continuous = continuous
+        self.listen_timeout = listen_timeout
+        self.pause_seconds = pause_seconds
+        self.phrase_time_limit = phrase_time_limit
+        self.energy_threshold = None  # set by calibration, then follows the noise floor
+
+        self._frames = queue.Queue()  # ("start"|"audio"|"end", generation, payload) for the recognition worker
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._armed_at = None
+        self._generation = 0  # bumped by cancel(); stale utterances and results are dropped
+        self._capture_thread = None
+        self._recognition_thread = None
+
+    # --- Control ---
+    def start(self):
+        """Runs capture on a background thread (use run() to capture on the calling thread)."""
+        if self._capture_thread is None:
+            self._capture_thread = threading.Thread(target=self.run, name="speech-capture", daemon=True)
+            self._capture_thread.start()
+
+    def arm(self):
+        """Recognize the next utterance."""
+        with self._lock:
+            self._armed_at = time.monotonic()
+        self.on_status("Listening...")
+
+    def cancel(self):
+        """Drops the current utterance, anything queued, and any result still being recognized."""
+        with self._lock:
+            self._generation += 1
+            self._armed_at = None
+        ended = False
+        while True:
+            try:
+                ended = self._frames.get_nowait() is None or ended
+            except queue.Empty:
+                break
+        if ended:
+            self._frames.put(None)  # Keep the end-of-capture marker for the recognition worker
+        self.on_status("Ready.")
+
+    def stop(self, timeout: float = 2.0):
+        """Closes the audio source and ends both threads."""
+        self.cancel()
+        self._stop_event.set()
+        self._frames.put(None)
+        for thread in (self._capture_thread, self._recognition_thread):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout)
+
+    @property
+    def armed(self) -> bool:
+        return self.continuous or self._armed_at is not None
+
+    # --- Capture ---
+    def run(self):
+        """Capture loop: opens the source once and processes frames until stop() or end of input."""
+        self._recognition_thread = threading.Thread(target=self._recognition_worker, name="speech-recognition",
+                                                    daemon=True)
+        self._recognition_thread.start()
+        try:
+            with self.source_factory() as source:
+                self._capture(source)
+        except Exception as e:
+            self.on_error(f"Audio capture error: {e}")
+        finally:
+            self._frames.put(None)
+
+    def _read(self, source):
+        data = source.stream.read(source.CHUNK)
+        return data if not self._stop_event.is_set() else b""
+
+    def _capture(self, source):
+        rate, width, chunk = source.SAMPLE_RATE, source.SAMPLE_WIDTH, source.CHUNK
+        seconds_per_frame = chunk / rate
+
+        self.on_status("Adjusting for ambient noise...")
+        calibration = []
+        for _ in range(max(1, int(math.ceil(CALIBRATION_SECONDS / seconds_per_frame)))):
+            data = self._read(source)
+            if not data:
+                return
+            calibration.append(frame_energy(data, width))
+        noise_floor = sum(calibration) / len(calibration)
+        self.energy_threshold = max(MIN_ENERGY_THRESHOLD, noise_floor * ENERGY_RATIO)
+        self.on_status("Listening..." if self.armed else "Ready.")
+
+        ring = collections.deque(maxlen=max(1, int(PRE_ROLL_SECONDS / seconds_per_frame)))
+        start_frames = max(1, int(math.ceil(SPEECH_START_SECONDS / seconds_per_frame)))
+        pause_frames = max(1, int(math.ceil(self.pause_seconds / seconds_per_frame)))
+        limit_frames = max(1, int(self.phrase_time_limit / seconds_per_frame))
+
+        in_speech = streaming = False
+        speech_frames = loud_run = quiet_run = 0
+        generation = self._generation
+
+        while True:
+            data = self._read(source)
+            if not data:
+                break
+            energy = frame_energy(data, width)
+            loud = energy > self.energy_threshold
+
+            if generation != self._generation:
+                # cancel() was called: throw away whatever was being captured
+                generation = self._generation
+                in_speech = streaming = False
+                loud_run = quiet_run = 0
+                ring.clear()
+
+            if not in_speech:
+                ring.append(data)
+                loud_run = loud_run + 1 if loud else 0
+                if not loud:
+                    noise_floor += (energy - noise_floor) * NOISE_ADAPT_RATE
+                    self.energy_threshold = max(MIN_ENERGY_THRESHOLD, noise_floor * ENERGY_RATIO)
+                if loud_run >= start_frames:
+                    in_speech, speech_frames, quiet_run = True, len(ring), 0
+                    # Speech nobody asked for is tracked (to find its end) but not recognized
+                    streaming = self.armed
+                    if streaming:
+                        self._frames.put(("start", generation, (rate, width)))
+                        for frame in ring:
+                            self._frames.put(("audio", generation, frame))
+                else:
+                    self._check_listen_timeout()
+                continue
+
+            speech_frames += 1
+            quiet_run = 0 if loud else quiet_run + 1
+            if streaming:
+                self._frames.put(("audio", generation, data))
+            if quiet_run >= pause_frames or speech_frames >= limit_frames:
+                if streaming:
+                    self._end_utterance(generation)
+                in_speech = streaming = False
+                loud_run = quiet_run = 0
+                ring.clear()
+
+    def _check_listen_timeout(self):
+        with self._lock:
+            timed_out = (not self.continuous and self._armed_at is not None
+                         and time.monotonic() - self._armed_at > self.listen_timeout)
+            if timed_out:
+                self._armed_at = None
+        if timed_out:
+            self.on_error("No speech detected.")
+            self.on_status("Ready.")
+
+    def _end_utterance(self, generation):
+        with self._lock:
+            if not self.continuous:
+                self._armed_at = None
+        self.on_status("Processing speech...")
+        self._frames.put(("end", generation, time.monotonic()))
+
+    # --- Recognition ---
+    def _recognition_worker(self):
+        session = None
+        while True:
+            item = self._frames.get()
+            if item is None:
+                break
+            kind, generation, payload = item
+            if generation != self._generation:
+                session = None  # Cancelled utterance
+                continue
+            try:
+                if kind == "start":
+                    session = self.backend.begin(*payload)
+                elif session is None:
+                    continue  # The session failed to open; skip the rest of this utterance
+                elif kind == "audio":
+                    partial = session.feed(payload)
+                    if partial and generation == self._generation:
+                        self.on_partial(partial)
+                else:
+                    text, session = session.finish(), None
+                    if generation == self._generation:
+                        if text:
+                            self.on_text(text)
+                        else:
+                            self.on_error("Could not understand audio.")
+                    if not self.armed:
+                        self.on_status("Ready.")
+            except Exception as e:
+                session = None
+                if generation == self._generation:
+                    self.on_error(str(e) or type(e).__name__)
@@ -0,0 +1,147 @@
+# voice/stt_backends.py
+# Speech-to-text backends behind one interface.
+# A backend opens a RecognitionSession per utterance; the capture engine feeds it audio
+# while the user is still speaking. Streaming backends (Vosk) decode as frames arrive and
+# return partial hypotheses, so only the tail of the utterance is left to decode once the
+# user stops. Buffered backends (Google, PocketSphinx) collect the audio and transcribe it
+# in finish(). Optional engines are imported only when their backend is first used.
+
+import json
+import os
+import threading
+
+# --- Configuration (overridable through environment variables) ---
+STT_BACKEND = os.getenv("ALPHA_STT_BACKEND", "google")
+STT_LANGUAGE = os.getenv("ALPHA_STT_LANGUAGE", "en-US")
+VOSK_MODEL_PATH = os.getenv("ALPHA_VOSK_MODEL")  # unset: let vosk fetch its small English model
+
+
+class RecognitionSession:
+    """Collects an utterance's audio and transcribes it in one go when it ends."""
+
+    def __init__(self, backend, sample_rate: int, sample_width: int):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self._frames = []
+
+    def feed(self, frame_data: bytes):
+        """Adds audio; returns the current partial hypothesis, or None if there is none."""
+        self._frames.append(frame_data)
+        return None
+
+    def finish(self) -> str:
+        """Returns the final transcript ("" when nothing was understood)."""
+        return self.backend.transcribe(b"".join(self._frames), self.sample_rate, self.sample_width)
+
+
+class STTBackend:
+    name = None
+    streaming = False  # True if sessions return partial hypotheses while audio is fed
+
+    def begin(self, sample_rate: int, sample_width: int) -> RecognitionSession:
+        return RecognitionSession(self, sample_rate, sample_width)
+
+    def transcribe(self, frame_data: bytes, sample_rate: int, sample_width: int) -> str:
+        raise NotImplementedError
+
+
+class _SpeechRecognitionBackend(STTBackend):
+    """Shared plumbing for the recognizers bundled with the speech_recognition package."""
+
+    def __init__(self, recognizer=None, language: str = STT_LANGUAGE):
+        import speech_recognition as sr
+        self._sr = sr
+        self.recognizer = recognizer or sr.Recognizer()
+        self.language = language
+
+    def _recognize(self, audio):
+        raise NotImplementedError
+
+    def transcribe(self, frame_data: bytes, sample_rate: int, sample_width: int) -> str:
+        audio = self._sr.AudioData(frame_data, sample_rate, sample_width)
+        try:
+            return self._recognize(audio)
+        except self._sr.UnknownValueError:
+            return ""
+        except self._sr.RequestError as e:
+            raise RuntimeError(f"Speech service error: {e}")
+
+
+class GoogleBackend(_SpeechRecognitionBackend):
+    name = "google"
+
+    def _recognize(self, audio):
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+
+class SphinxBackend(_SpeechRecognitionBackend):
+    """Offline CMU PocketSphinx through speech_recognition (needs the pocketsphinx package)."""
+    name = "sphinx"
+
+    def _recognize(self, audio):
+        return self.recognizer.recognize_sphinx(audio, language=self.language)
+
+
+class _VoskSession(RecognitionSession):
+    def __init__(self, backend, sample_rate: int, sample_width: int):
+        super().__init__(backend, sample_rate, sample_width)
+        if sample_width != 2:
+            raise ValueError("Vosk needs 16-bit audio.")
+        self._recognizer = backend.vosk.KaldiRecognizer(backend.model, sample_rate)
+        self._segments = []  # text of segments vosk has already finalized
+
+    def feed(self, frame_data: bytes):
+        if self._recognizer.AcceptWaveform(frame_data):
+            self._segments.append(json.loads(self._recognizer.Result()).get("text", ""))
+            partial = ""
+        else:
+            partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        hypothesis = " ".join(part for part in self._segments + [partial] if part)
+        return hypothesis or None
+
+    def finish(self) -> str:
+        self._segments.append(json.loads(self._recognizer.FinalResult()).get("text", ""))
+        return " ".join(part for part in self._segments if part)
+
+
+class VoskBackend(STTBackend):
+    """Offline, streaming Kaldi recognizer. The model is loaded once per process and shared."""
+    name = "vosk"
+    streaming = True
+
+    _models = {}
+    _models_lock = threading.Lock()
+
+    def __init__(self, model_path: str = VOSK_MODEL_PATH):
+        import vosk
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        with self._models_lock:
+            if model_path not in self._models:
+                self._models[model_path] = vosk.Model(model_path) if model_path else vosk.Model(lang="en-us")
+            self.model = self._models[model_path]
+
+    def begin(self, sample_rate: int, sample_width: int) -> RecognitionSession:
+        return _VoskSession(self, sample_rate, sample_width)
+
+    def transcribe(self, frame_data: bytes, sample_rate: int, sample_width: int) -> str:
+        session = self.begin(sample_rate, sample_width)
+        session.feed(frame_data)
+        return session.finish()
+
+
+# --- Registry ---
+STT_BACKENDS = {
+    GoogleBackend.name: GoogleBackend,
+    SphinxBackend.name: SphinxBackend,
+    VoskBackend.name: VoskBackend,
+}
+
+
+def get_stt_backend(name: str = None, **kwargs) -> STTBackend:
+    """Builds the named backend (default: ALPHA_STT_BACKEND). Raises ImportError if its engine is missing."""
+    name = name or STT_BACKEND
+    if name not in STT_BACKENDS:
+        raise ValueError(f"Unknown STT backend '{name}'. Choose from: {', '.join(STT_BACKENDS)}.")
+    return STT_BACKENDS[name](**kwargs)
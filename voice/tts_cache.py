@@ -0,0 +1,213 @@
+# voice/tts_cache.py
+# Content-addressed disk cache of synthesized speech.
+# Audio is stored under a hash of the text and every setting that changes the sound
+# (voice, model, stability, similarity boost, output format), so phrases the assistant
+# repeats all the time ("Operation completed.", greetings, error messages) play from
+# local disk instead of costing an API round trip and quota. The cache is bounded in
+# size and evicts least-recently-played files first.
+
+import hashlib
+import json
+import os
+import threading
+
+from core.paths import CACHE_DIR
+from voice.tts_pipeline import SentenceChunker
+
+# --- Configuration (overridable through environment variables) ---
+TTS_CACHE_MAX_BYTES = int(os.getenv("ALPHA_TTS_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+
+DEFAULT_MODEL_ID = "eleven_multilingual_v2"
+DEFAULT_STABILITY = 0.7
+DEFAULT_SIMILARITY_BOOST = 0.75
+DEFAULT_OUTPUT_FORMAT = "mp3_44100_128"
+
+# Replies spoken word for word, worth having on disk before they are first needed: the
+# confirmation of a tool turn with nothing else to say, and the error spoken when the model
+# returns nothing (both from backend.assistant_core). Only spoken text belongs here; the
+# greeting, for one, is only shown.
+COMMON_PHRASES = [
+    "Operation completed.",
+    "No valid content (text or function_call) received from the model.",
+]
+
+
+def tts_cache_key(text: str, voice_id: str, model_id: str, stability: float, similarity_boost: float,
+                  output_format: str) -> str:
+    """Hex digest identifying one rendering of text; whitespace differences do not change it."""
+    normalized = " ".join(text.split())
+    material = json.dumps([normalized, voice_id, model_id, stability, similarity_boost, output_format])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    def __init__(self, directory: str, max_bytes: int = TTS_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".audio")
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def get(self, key: str):
+        """Returns the cached audio bytes for key, or None. A hit refreshes the entry's LRU position."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)  # mtime doubles as the last-played time for LRU eviction
+        except OSError:
+            with self._lock:
+                self._counters["misses"] += 1
+            return None
+        with self._lock:
+            self._counters["hits"] += 1
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        if not audio or len(audio) > self.max_bytes:
+            return
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(audio)
+        os.replace(temp_path, path)  # Readers never see a half-written file
+        with self._lock:
+            self._evict_locked()
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".audio"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def _evict_locked(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for _, size, name in sorted(entries):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            self._counters["evictions"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._entries()
+            return {**self._counters, "entries": len(entries), "bytes": sum(size for _, size, _ in entries)}
+
+    def clear(self):
+        with self._lock:
+            for _, _, name in self._entries():
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+class CachedSynthesizer:
+    """
+    Callable text -> iterable of audio byte chunks, for one fixed set of voice settings.
+
+    convert(text, voice_id, model_id, stability, similarity_boost, output_format) does the
+    real synthesis and may stream its result. A cache hit yields the stored audio as one
+    chunk; a miss streams through and stores the audio once it has been read to the end,
+    so an interrupted download is never cached.
+    """
+
+    def __init__(self, convert, voice_id: str, model_id: str = DEFAULT_MODEL_ID,
+                 stability: float = DEFAULT_STABILITY, similarity_boost: float = DEFAULT_SIMILARITY_BOOST,
+                 output_format: str = DEFAULT_OUTPUT_FORMAT, cache: TTSCache = None):
+        self.convert = convert
+        self.voice_id = voice_id
+        self.model_id = model_id
+        self.stability = stability
+        self.similarity_boost = similarity_boost
+        self.output_format = output_format
+        self.cache = cache or get_tts_cache()
+
+    def key(self, text: str) -> str:
+        return tts_cache_key(text, self.voice_id, self.model_id, self.stability, self.similarity_boost,
+                             self.output_format)
+
+    def __call__(self, text: str):
+        key = self.key(text)
+        audio = self.cache.get(key)
+        if audio is not None:
+            yield audio
+            return
+        parts = []
+        for data in self.convert(text, self.voice_id, self.model_id, self.stability, self.similarity_boost,
+                                 self.output_format):
+            parts.append(data)
+            yield data
+        self.cache.put(key, b"".join(parts))
+
+    def prewarm(self, phrases=COMMON_PHRASES) -> int:
+        """
+        Synthesizes any phrase that is not cached yet. Phrases are cut into the chunks
+        TTSPipeline would speak (its SentenceChunker), since those are what get looked up.
+        Returns how many chunks needed an API call.
+        """
+        chunks = []
+        for phrase in phrases:
+            chunker = SentenceChunker()
+            chunks.extend(chunk for chunk in chunker.feed(phrase) + chunker.flush() if chunk not in chunks)
+        synthesized = 0
+        for phrase in chunks:
+            if self.key(phrase) in self.cache:
+                continue
+            try:
+                for _ in self(phrase):
+                    pass
+                synthesized += 1
+            except Exception as e:
+                print(f"[TTS Cache]: Could not pre-warm {phrase[:40]!r}: {e}")
+        return synthesized
+
+
+def elevenlabs_convert(client):
+    """Adapts an ElevenLabs client to the convert() signature CachedSynthesizer expects."""
+    from elevenlabs import VoiceSettings
+
+    def convert(text, voice_id, model_id, stability, similarity_boost, output_format):
+        return client.text_to_speech.convert(
+            text=text,
+            voice_id=voice_id,
+            model_id=model_id,
+            voice_settings=VoiceSettings(stability=stability, similarity_boost=similarity_boost, style=0.0,
+                                         use_speaker_boost=True),
+            output_format=output_format
+        )
+
+    return convert
+
+
+# --- Process-wide Cache ---
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_tts_cache() -> TTSCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TTSCache(os.path.join(CACHE_DIR, "tts"))
+    return _cache
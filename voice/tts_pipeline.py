@@ -0,0 +1,212 @@
+# voice/tts_pipeline.py
+# Pipelined text-to-speech for streamed assistant replies.
+# Text is fed in as the model streams it and cut at sentence boundaries. Each chunk is
+# synthesized on a worker thread while the previous one is still playing, and the audio
+# bytes are written, as they download, into one long-lived ffplay process reading MP3
+# from stdin, so consecutive sentences play back without gaps or per-clip startup.
+
+import os
+import queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+# --- Configuration (overridable through environment variables) ---
+TTS_MIN_CHUNK_CHARS = int(os.getenv("ALPHA_TTS_MIN_CHUNK_CHARS", "20"))
+TTS_MAX_CHUNK_CHARS = int(os.getenv("ALPHA_TTS_MAX_CHUNK_CHARS", "240"))
+PLAYER_COMMAND = ["ffplay", "-autoexit", "-nodisp", "-loglevel", "quiet", "-i", "-"]
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) followed by whitespace, or a line break.
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+|\n+")
+_SOFT_BREAK = re.compile(r"[,;:]\s+|\s+")
+
+_STOP = object()
+
+
+class SentenceChunker:
+    """
+    Accumulates streamed text and hands back speakable chunks: whole sentences, with
+    very short ones merged into the next and overly long runs split at a comma or space.
+    """
+
+    def __init__(self, min_chars: int = TTS_MIN_CHUNK_CHARS, max_chars: int = TTS_MAX_CHUNK_CHARS):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> list:
+        self._buffer += text
+        chunks = []
+        while True:
+            cut = self._next_cut()
+            if cut is None:
+                break
+            chunk, self._buffer = self._buffer[:cut].strip(), self._buffer[cut:]
+            if chunk:
+                chunks.append(chunk)
+        return chunks
+
+    def flush(self) -> list:
+        chunk, self._buffer = self._buffer.strip(), ""
+        return [chunk] if chunk else []
+
+    def _next_cut(self):
+        for match in _SENTENCE_END.finditer(self._buffer):
+            if match.end() >= self.min_chars or "\n" in match.group():
+                if match.end() <= self.max_chars:
+                    return match.end()
+                break
+        if len(self._buffer) <= self.max_chars:
+            return None
+        # No usable sentence end within max_chars: split at the last soft break before it
+        soft_breaks = [m.end() for m in _SOFT_BREAK.finditer(self._buffer, 0, self.max_chars)]
+        return soft_breaks[-1] if soft_breaks else self.max_chars
+
+
+class _FfplaySink:
+    """One ffplay process for a whole reply; MP3 chunks written to it play back to back."""
+
+    def __init__(self, command):
+        self._process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    def write(self, data: bytes):
+        self._process.stdin.write(data)
+        self._process.stdin.flush()
+
+    def close(self, wait: bool = True):
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        if wait:
+            self._process.wait()
+        else:
+            self._process.kill()
+
+
+class TTSPipeline:
+    """
+    Streams one reply to the speakers.
+
+    synthesize(text) must return an iterable of MP3 byte chunks (the ElevenLabs
+    text_to_speech.convert call does). fallback_play(audio_bytes) is used per chunk
+    when ffplay is not on PATH; playback is then no longer gapless.
+    """
+
+    def __init__(self, synthesize, fallback_play=None, player_command=PLAYER_COMMAND, chunker=None):
+        self.synthesize = synthesize
+        self.fallback_play = fallback_play
+        self.player_command = player_command
+        self.chunker = chunker or SentenceChunker()
+        self.use_player = shutil.which(player_command[0]) is not None
+        self.first_token_at = None
+        self.first_audio_at = None
+        self.errors = []
+
+        self._text_queue = queue.Queue()
+        self._audio_queue = queue.Queue()
+        self._cancelled = threading.Event()
+        self._sink = None
+        self._sink_lock = threading.Lock()
+        self._synth_thread = threading.Thread(target=self._synth_worker, name="tts-synth", daemon=True)
+        self._play_thread = threading.Thread(target=self._play_worker, name="tts-play", daemon=True)
+        self._synth_thread.start()
+        self._play_thread.start()
+
+    # --- Producer side ---
+    def feed(self, text: str):
+        """Adds streamed reply text; complete sentences are queued for synthesis immediately."""
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+            # Start the player now so its startup overlaps with synthesis of the first sentence
+            self.warm()
+        for chunk in self.chunker.feed(text):
+            self._text_queue.put(chunk)
+
+    def warm(self):
+        """Starts the player ahead of the first text, e.g. while the user is still speaking."""
+        if self.use_player:
+            self._ensure_sink()
+
+    def finish(self):
+        """No more text is coming: queue whatever is left in the buffer."""
+        for chunk in self.chunker.flush():
+            self._text_queue.put(chunk)
+        self._text_queue.put(_STOP)
+
+    def wait(self, timeout: float = None):
+        """Blocks until everything queued has been played (or the pipeline was cancelled)."""
+        self._synth_thread.join(timeout)
+        self._play_thread.join(timeout)
+
+    def cancel(self):
+        """Stops speaking right away and drops any queued text and audio."""
+        self._cancelled.set()
+        self._text_queue.put(_STOP)
+        self._audio_queue.put(_STOP)
+        if self._sink is not None:
+            self._sink.close(wait=False)
+
+    @property
+    def first_audio_latency_ms(self):
+        if self.first_token_at is None or self.first_audio_at is None:
+            return None
+        return (self.first_audio_at - self.first_token_at) * 1000
+
+    # --- Workers ---
+    def _synth_worker(self):
+        while not self._cancelled.is_set():
+            chunk = self._text_queue.get()
+            if chunk is _STOP:
+                break
+            try:
+                audio = self.synthesize(chunk)
+                if not self.use_player and self.fallback_play is not None:
+                    # Without a streaming player each chunk has to be complete before playing
+                    audio = [b"".join(audio)]
+                for data in audio:
+                    if self._cancelled.is_set():
+                        break
+                    if data:
+                        self._audio_queue.put(data)
+            except Exception as e:
+                self.errors.append(e)
+                print(f"[TTS]: Synthesis failed for chunk {chunk[:40]!r}: {e}")
+        self._audio_queue.put(_STOP)
+
+    def _ensure_sink(self):
+        with self._sink_lock:
+            if self._sink is None and not self._cancelled.is_set():
+                self._sink = _FfplaySink(self.player_command)
+            return self._sink
+
+    def _play_worker(self):
+        if not self.use_player and self.fallback_play is None:
+            print(f"[TTS]: '{self.player_command[0]}' not found on PATH; reply will not be spoken.")
+        try:
+            while not self._cancelled.is_set():
+                data = self._audio_queue.get()
+                if data is _STOP:
+                    break
+                if self.first_audio_at is None:
+                    self.first_audio_at = time.perf_counter()
+                    if self.first_audio_latency_ms is not None:
+                        print(f"[TTS]: First audio {self.first_audio_latency_ms:.0f} ms after first token.")
+                if self.use_player:
+                    sink = self._ensure_sink()
+                    if sink is None:  # Cancelled while waiting for audio
+                        break
+                    sink.write(data)
+                elif self.fallback_play is not None:
+                    self.fallback_play(data)
+        except (BrokenPipeError, OSError) as e:
+            if not self._cancelled.is_set():
+                self.errors.append(e)
+                print(f"[TTS]: Playback stopped: {e}")
+        finally:
+            if self._sink is not None and not self._cancelled.is_set():
+                self._sink.close(wait=True)
@@ -6,7 +6,7 @@ import threading
 import time  # For simulating delay if needed, though less critical now
 from dotenv import load_dotenv
 from elevenlabs.client import ElevenLabs
-from elevenlabs import play, VoiceSettings # Removed GenerationOptions
+from elevenlabs import play
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QMessageBox, QLineEdit,
@@ -16,7 +16,13 @@ from PyQt5.QtCore import Qt, pyqtSignal, QThread
 from PyQt5.QtGui import QFont, QColor, QPalette, QMovie, QIcon
 
 # Import the corrected backend GeminiAssistant
-from backend.assistant_core import GeminiAssistant
+from backend.async_assistant import AsyncGeminiAssistant
+from gui.async_bridge import AssistantRunner, get_async_loop
+from gui.streaming_bubble import StreamingBubble
+from voice.tts_pipeline import TTSPipeline
+from voice.tts_cache import CachedSynthesizer, elevenlabs_convert
+from voice.speech_capture import SpeechCaptureEngine
+from voice.stt_backends import GoogleBackend, STT_BACKEND, get_stt_backend
 # Load environment variables from .env file (for ElevenLabs API Key)
 load_dotenv()
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
@@ -35,6 +41,9 @@ if ELEVENLABS_API_KEY:
         print(f"ERROR: Failed to initialize ElevenLabs client: {e}")
         elevenlabs_client = None
 
+# Synthesize the assistant's stock phrases ahead of time so they play from the disk cache.
+TTS_PREWARM = os.getenv("ALPHA_TTS_PREWARM", "1") != "0"
+
 
 # --- Utility Function for Dark Theme Palette ---
 def _create_dark_palette():
@@ -58,97 +67,50 @@ def _create_dark_palette():
 # --- Speech Recognition Worker Thread (STT) ---
 class SpeechRecognitionThread(QThread):
     recognized_text = pyqtSignal(str)
+    partial_text = pyqtSignal(str) # Running hypothesis from streaming backends
     error_occurred = pyqtSignal(str)
     listening_status = pyqtSignal(str)
 
-    def __init__(self, recognizer_instance, parent=None):
+    def __init__(self, recognizer_instance, source_factory=sr.Microphone, parent=None):
         super().__init__(parent)
         self.recognizer = recognizer_instance
-        self._is_running = True # Keep for potential future stop mechanism, though listen() blocks
+        self.backend = self._create_backend()
+        # The capture engine keeps the microphone open and calibrated between presses;
+        # this thread runs its capture loop, recognition happens on the engine's worker.
+        self.engine = SpeechCaptureEngine(
+            source_factory,
+            self.backend,
+            on_text=self.recognized_text.emit,
+            on_partial=self.partial_text.emit,
+            on_error=self.error_occurred.emit,
+            on_status=self.listening_status.emit,
+        )
 
-    def run(self):
-        with sr.Microphone() as source:
-            self.listening_status.emit("Adjusting for ambient noise...")
+    def _create_backend(self):
+        # ALPHA_STT_BACKEND picks the engine (google, vosk, sphinx); Google is the fallback
+        if STT_BACKEND != GoogleBackend.name:
             try:
-                # Add a local TTS feedback "Listening..." before blocking operation
-                # This needs to be done on a separate thread or use pyttsx3.say directly
-                # However, for simplicity here, we'll rely on the GUI status update.
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                self.listening_status.emit("Listening...")
-                audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=8)
-                self.listening_status.emit("Processing speech...")
-                text = self.recognizer.recognize_google(audio)
-                self.recognized_text.emit(text)
-            except sr.UnknownValueError:
-                self.error_occurred.emit("Could not understand audio.")
-            except sr.RequestError as e:
-                self.error_occurred.emit(f"Speech service error: {e}")
-            except sr.WaitTimeoutError:
-                self.error_occurred.emit("No speech detected.")
+                return get_stt_backend(STT_BACKEND)
             except Exception as e:
-                self.error_occurred.emit(f"STT unexpected error: {e}")
-        self.listening_status.emit("Ready.")
+                print(f"WARNING: STT backend '{STT_BACKEND}' unavailable ({e}); using Google.")
+        return GoogleBackend(self.recognizer)
 
-    def stop(self):
-        # Stopping sr.Recognizer.listen() is tricky as it's blocking.
-        # This method is primarily for conceptual completeness if you were to use
-        # a non-blocking audio input stream. For now, listen() will run to timeout/detection.
-        self._is_running = False
+    def run(self):
+        self.engine.run()
 
+    def listen(self):
+        """Recognizes the next thing the user says, opening the microphone on first use."""
+        self.engine.arm()
+        if not self.isRunning():
+            self.start()
 
-# --- Assistant Response Thread (Non-Streaming LLM + Non-Streaming TTS) ---
-class AssistantResponseThread(QThread):
-    response_complete = pyqtSignal(str) # Emits the final text response
-    error_occurred = pyqtSignal(str)
-    thinking_status = pyqtSignal(bool) # To show/hide spinner
+    def cancel(self):
+        """Abandons the current utterance and any recognition in flight; the mic stays open."""
+        self.engine.cancel()
 
-    def __init__(self, assistant_instance, user_query, elevenlabs_client_instance, voice_id, parent=None):
-        super().__init__(parent)
-        self.assistant = assistant_instance
-        self.user_query = user_query
-        self.elevenlabs_client = elevenlabs_client_instance
-        self.voice_id = voice_id
-
-    def run(self):
-        self.thinking_status.emit(True) # Show spinner
-        full_response_text = ""
-        try:
-            # Call the non-streaming send_prompt from GeminiAssistant
-            # This yields a (type, content) tuple from backend/assistant_core.py
-            # So, we iterate to get the single result.
-            response_generator = self.assistant.send_prompt(self.user_query)
-            for response_type, content in response_generator:
-                if response_type == "final_text":
-                    full_response_text = content
-                elif response_type == "error":
-                    self.error_occurred.emit(f"LLM processing error: {content}")
-                    full_response_text = f"LLM Error: {content}" # Use error as response text
-                break # Expecting only one (type, content) pair
-
-            if full_response_text and self.elevenlabs_client and self.voice_id:
-                try:
-                    # Use text_to_speech.convert() for non-streaming TTS
-                    audio = self.elevenlabs_client.text_to_speech.convert(
-                        text=full_response_text,
-                        voice_id=self.voice_id,
-                        model_id="eleven_multilingual_v2",
-                        voice_settings=VoiceSettings(stability=0.7, similarity_boost=0.75, style=0.0, use_speaker_boost=True),
-                        output_format="mp3_44100_128"
-                    )
-                    play(audio) # This will block until the full audio is played
-                except Exception as e:
-                    self.error_occurred.emit(f"ElevenLabs TTS error: {e}")
-                    # Continue with just text response if TTS fails
-            elif not full_response_text:
-                full_response_text = "No valid response generated by the assistant."
-
-            self.response_complete.emit(full_response_text)
-
-        except Exception as e:
-            self.error_occurred.emit(f"An unexpected error occurred in response thread: {e}")
-            self.response_complete.emit(f"An unexpected error occurred: {e}") # Ensure GUI gets a message
-        finally:
-            self.thinking_status.emit(False) # Hide spinner
+    def stop(self):
+        """Closes the microphone and ends capture."""
+        self.engine.stop()
 
 
 # --- Welcome Screen Widget ---
@@ -244,17 +206,27 @@ class ChatbotScreen(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.assistant = GeminiAssistant()  # The real GeminiAssistant now
+        self.assistant = AsyncGeminiAssistant()
         self.recognizer = sr.Recognizer()
         self.tts_engine_local = pyttsx3.init()
 
-        # Threads
+        # STT keeps its capture thread; replies run as cancellable tasks on the shared asyncio
+        # loop (streaming LLM + pipelined TTS), so a new message or closing stops the one in flight.
         self.stt_thread = SpeechRecognitionThread(self.recognizer)
-        self.assistant_response_thread = None # Now uses a simpler thread
+        self.assistant_runner = AssistantRunner(self.assistant, parent=self)
 
         self.initUI()
+        self.reply_bubble = StreamingBubble(self.chat_history_display, self.add_message)
         self._connect_threads()
 
+        if TTS_PREWARM and elevenlabs_client and DEFAULT_ELEVENLABS_VOICE_ID:
+            synthesizer = CachedSynthesizer(elevenlabs_convert(elevenlabs_client), DEFAULT_ELEVENLABS_VOICE_ID)
+            threading.Thread(target=synthesizer.prewarm, name="tts-prewarm", daemon=True).start()
+
+        # Speculation: a TTS pipeline whose player is started while the user is still talking
+        self._pending_tts_pipeline = None
+        self.assistant.speculator.register_warmup("tts", self._warm_tts, self._cancel_tts)
+
     def initUI(self):
         self.setPalette(_create_dark_palette())
         self.setAutoFillBackground(True)
@@ -309,8 +281,14 @@ class ChatbotScreen(QWidget):
             self.spinner_label.setStyleSheet(
                 "color: #FFA500; font-style: italic; padding-left: 10px; margin-bottom: 8px;")
 
+        # Progress of a long-running tool (e.g. moving a large folder to another drive)
+        self.progress_label = QLabel()
+        self.progress_label.setStyleSheet("color: #B0BEC5; font-style: italic; padding-left: 10px; margin-bottom: 8px;")
+        self.progress_label.hide()
+
         spinner_layout = QHBoxLayout()
         spinner_layout.addWidget(self.spinner_label)
+        spinner_layout.addWidget(self.progress_label)
         spinner_layout.addStretch()
         main_layout.addLayout(spinner_layout)
 
@@ -366,15 +344,50 @@ class ChatbotScreen(QWidget):
 
     def _connect_threads(self):
         self.stt_thread.recognized_text.connect(self._handle_stt_result)
+        self.stt_thread.partial_text.connect(self._handle_stt_partial)
         self.stt_thread.error_occurred.connect(self._handle_stt_error)
         self.stt_thread.listening_status.connect(self._update_stt_status_label) # Connect to renamed label
+        self.assistant_runner.response_chunk.connect(self._handle_bot_chunk)
+        self.assistant_runner.response_complete.connect(self._handle_bot_response_complete)
+        self.assistant_runner.error_occurred.connect(self._handle_assistant_error)
+        self.assistant_runner.cancelled.connect(self._handle_bot_cancelled)
+        self.assistant_runner.thinking_status.connect(self._toggle_spinner)
+        self.assistant_runner.tool_progress.connect(self._show_tool_progress)
+        self.assistant_runner.thinking_status.connect(self._clear_tool_progress)
+
+    def _create_tts_pipeline(self):
+        if not (elevenlabs_client and DEFAULT_ELEVENLABS_VOICE_ID):
+            return None
+        # Streams MP3 chunks from the API, or replays a cached rendering from disk; sentences
+        # are synthesized and played while the rest of the reply is still streaming
+        synthesizer = CachedSynthesizer(elevenlabs_convert(elevenlabs_client), DEFAULT_ELEVENLABS_VOICE_ID)
+        return TTSPipeline(synthesizer, fallback_play=play)
+
+    def _warm_tts(self, target, cancelled):
+        pipeline = self._pending_tts_pipeline
+        if pipeline is not None and not cancelled.is_set():
+            pipeline.warm()
+
+    def _cancel_tts(self, target=None):
+        pipeline, self._pending_tts_pipeline = self._pending_tts_pipeline, None
+        if pipeline is not None:
+            pipeline.cancel()
+
+    def _handle_stt_partial(self, partial_text):
+        """Shows the running hypothesis and starts warming whatever it points at."""
+        self._update_stt_status_label(partial_text)
+        if self._pending_tts_pipeline is None:
+            self._pending_tts_pipeline = self._create_tts_pipeline()
+        if self._pending_tts_pipeline is not None:
+            self.assistant.speculator.speculate("tts")
+        self.assistant.speculator.observe_text(partial_text)
 
     def _set_input_enabled(self, enabled):
         self.user_input_field.setEnabled(enabled)
         self.send_button.setEnabled(enabled)
         self.mic_button.setEnabled(enabled)
 
-    def add_message(self, sender, message):
+    def _format_message(self, sender, message):
         if sender == "User":
             color = "#90CAF9"
             align = Qt.AlignRight
@@ -386,21 +399,23 @@ class ChatbotScreen(QWidget):
             background = "#3A3A3A"
             float_style = "left"
 
-        formatted_message = f'''
+        return f'''
         <div style="background-color: {background}; border-radius: 10px; padding: 8px 12px; margin-bottom: 8px; max-width: 80%; float: {float_style}; clear: both;">
             <p style="color:{color}; font-size:11pt; margin: 0;"><b>{sender}:</b> {message}</p>
         </div>
         '''
-        self.chat_history_display.append(formatted_message)
+
+    def add_message(self, sender, message):
+        self.chat_history_display.append(self._format_message(sender, message))
         self.chat_history_display.verticalScrollBar().setValue(self.chat_history_display.verticalScrollBar().maximum())
 
     def _send_message(self):
         user_message = self.user_input_field.text().strip()
         if user_message:
+            # Input stays enabled: sending again cancels the reply (and speech) in flight
+            self.assistant_runner.cancel()
             self.add_message("User", user_message)
             self.user_input_field.clear()
-            self._set_input_enabled(False)  # Disable input while bot is thinking
-            self._toggle_spinner(True) # Show spinner
 
             # Hide STT status label and clear it, as we are now processing LLM response
             self.stt_status_label.hide()
@@ -409,33 +424,23 @@ class ChatbotScreen(QWidget):
             self.chat_history_display.verticalScrollBar().setValue(
                 self.chat_history_display.verticalScrollBar().maximum())
 
-            # Start the non-streaming LLM + TTS process
-            self.assistant_response_thread = AssistantResponseThread(
-                self.assistant,
-                user_message,
-                elevenlabs_client,
-                DEFAULT_ELEVENLABS_VOICE_ID
-            )
-            self.assistant_response_thread.response_complete.connect(self._handle_bot_response_complete)
-            self.assistant_response_thread.error_occurred.connect(self._handle_assistant_thread_error)
-            self.assistant_response_thread.thinking_status.connect(self._toggle_spinner)
-            self.assistant_response_thread.start()
+            # Start the streaming LLM + TTS turn; the pipeline may arrive already warmed by speculation
+            self.reply_bubble.close()
+            tts_pipeline, self._pending_tts_pipeline = self._pending_tts_pipeline, None
+            self.assistant_runner.submit(user_message, tts_pipeline=tts_pipeline or self._create_tts_pipeline())
         else:
             QMessageBox.warning(self, "Empty Message", "Please type a message before sending.")
 
     def _start_voice_input(self):
-        # Ensure previous STT thread is stopped if running (though listen() blocks)
-        if self.stt_thread.isRunning():
-            self.stt_thread.stop() # This signals to stop, but blocking listen() will still finish
-            self.stt_thread.wait(500) # Wait a bit for it to clean up if possible
-
+        self.assistant_runner.cancel()  # Barge-in: stop the current reply so the mic doesn't hear it
         self._set_input_enabled(False)
         self.user_input_field.setPlaceholderText("Listening for your voice...")
         self._toggle_spinner(True) # Show spinner for listening
         self.stt_status_label.show() # Show STT status label
-        self.stt_status_label.setText("Preparing microphone...")
+        if not self.stt_thread.isRunning():
+            self.stt_status_label.setText("Preparing microphone...")
         self.chat_history_display.verticalScrollBar().setValue(self.chat_history_display.verticalScrollBar().maximum())
-        self.stt_thread.start()
+        self.stt_thread.listen()
 
     def _handle_stt_result(self, text):
         self.user_input_field.setText(text)
@@ -446,6 +451,7 @@ class ChatbotScreen(QWidget):
         self._send_message()  # Automatically send recognized text
 
     def _handle_stt_error(self, error_message):
+        self.assistant.speculator.end_turn() # No turn will follow: drop anything warmed for it
         self.user_input_field.setPlaceholderText("Type your message here or click mic to speak...")
         self._toggle_spinner(False) # Hide spinner
         self.stt_status_label.hide() # Hide STT status label
@@ -459,21 +465,37 @@ class ChatbotScreen(QWidget):
         self.stt_status_label.show()
 
 
+    def _handle_bot_chunk(self, chunk):
+        """Grows the bot's reply bubble in place; the first chunk replaces the spinner."""
+        if self.reply_bubble.append(chunk):
+            self._toggle_spinner(False)
+
     def _handle_bot_response_complete(self, full_response_text):
         """Receives the complete bot response and updates the UI."""
         self._toggle_spinner(False) # Hide spinner
         self._set_input_enabled(True) # Re-enable input
-        self.add_message("Bot", full_response_text) # Add the full message to history
+        self.reply_bubble.finish(full_response_text) # Settle the streamed bubble on the final text
         self.chat_history_display.verticalScrollBar().setValue(self.chat_history_display.verticalScrollBar().maximum())
-        self.assistant_response_thread = None # Clear thread reference
 
-    def _handle_assistant_thread_error(self, error_message):
-        """Handles errors from the AssistantResponseThread."""
+    def _handle_bot_cancelled(self):
+        """The reply was interrupted: keep what had arrived, marked as cut off."""
+        self.reply_bubble.cut_off()
+
+    def _handle_assistant_error(self, error_message):
+        """Handles a failed turn reported by the AssistantRunner."""
         self._toggle_spinner(False) # Hide spinner
         self._set_input_enabled(True) # Re-enable input
+        self.reply_bubble.close()
         QMessageBox.critical(self, "Assistant Error", f"An error occurred: {error_message}")
         self.add_message("Bot", f"An internal error occurred: {error_message}")
-        self.assistant_response_thread = None # Clear thread reference
+
+    def _show_tool_progress(self, text):
+        self.progress_label.setText(text)
+        self.progress_label.show()
+
+    def _clear_tool_progress(self, busy):
+        if not busy:
+            self.progress_label.hide()
 
     def _toggle_spinner(self, show):
         """Controls visibility and animation of the spinner."""
@@ -527,16 +549,13 @@ class MyPyQt5App(QWidget):
     def closeEvent(self, event):
         # Ensure STT thread is properly stopped when closing
         if self.chatbot_screen.stt_thread and self.chatbot_screen.stt_thread.isRunning():
-            self.chatbot_screen.stt_thread.stop()
-            self.chatbot_screen.stt_thread.quit()
+            self.chatbot_screen.stt_thread.stop() # Closes the microphone; the capture loop exits within one frame
             self.chatbot_screen.stt_thread.wait(2000)
 
-        # Ensure assistant response thread is stopped
-        if self.chatbot_screen.assistant_response_thread and self.chatbot_screen.assistant_response_thread.isRunning():
-            # Since play() is blocking, we mainly ensure the thread is cleaned up.
-            # No explicit 'stop' for this thread, it should finish its task quickly.
-            self.chatbot_screen.assistant_response_thread.quit()
-            self.chatbot_screen.assistant_response_thread.wait(2000)
+        # Cancel the reply in flight: model request, queued tools and queued/playing speech
+        self.chatbot_screen.assistant_runner.cancel()
+
+        self.chatbot_screen._cancel_tts()
 
         # Stop pyttsx3 engine
         if self.chatbot_screen.tts_engine_local:
@@ -548,6 +567,7 @@ class MyPyQt5App(QWidget):
 # --- Main application entry point ---
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    async_loop = get_async_loop(app)  # Before any window: the chat screen submits to it
     window = MyPyQt5App()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(async_loop.exec())
\ No newline at end of file